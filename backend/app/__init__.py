@@ -5,6 +5,7 @@ import sys
 from logging.handlers import RotatingFileHandler
 from dotenv import load_dotenv
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 from app.extensions import db, migrate
 
 load_dotenv()
@@ -123,7 +124,64 @@ def create_app(config_name='development'):
     app.config['JWT_SECRET'] = os.getenv('JWT_SECRET', 'your-secret-key')
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'your-flask-secret-key')
     app.config['GROQ_API_KEY'] = os.getenv('GROQ_API_KEY', '')
+    # Keys the share code permutation; must never change once quizzes exist
+    app.config['SHARE_CODE_SECRET'] = os.getenv('SHARE_CODE_SECRET', app.config['SECRET_KEY'])
+    app.config['REDIS_URL'] = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+    # Answer write-behind: '' (off), 'memory' (single process only) or 'redis'
+    app.config['ANSWER_BUFFER'] = os.getenv('ANSWER_BUFFER', '')
+    app.config['ANSWER_FLUSH_INTERVAL_MS'] = int(os.getenv('ANSWER_FLUSH_INTERVAL_MS', '500'))
+    # Time limits: late answers within the grace window are still accepted (network latency)
+    app.config['ATTEMPT_GRACE_SECONDS'] = int(os.getenv('ATTEMPT_GRACE_SECONDS', '5'))
+    app.config['AUTO_SUBMIT_SCHEDULER'] = os.getenv('AUTO_SUBMIT_SCHEDULER', 'false').lower() == 'true'
+    app.config['AUTO_SUBMIT_POLL_SECONDS'] = int(os.getenv('AUTO_SUBMIT_POLL_SECONDS', '30'))
+    # Anti-cheating telemetry is buffered per process and bulk-written
+    app.config['ATTEMPT_EVENT_FLUSH_INTERVAL_MS'] = int(os.getenv('ATTEMPT_EVENT_FLUSH_INTERVAL_MS', '1000'))
+    app.config['ATTEMPT_EVENT_FLUSH_SIZE'] = int(os.getenv('ATTEMPT_EVENT_FLUSH_SIZE', '1000'))
+    app.config['ATTEMPT_EVENT_BUFFER_SIZE'] = int(os.getenv('ATTEMPT_EVENT_BUFFER_SIZE', '50000'))
+    # Leaderboards: 'memory' (per-process order-statistic trees) or 'redis' (shared sorted sets)
+    app.config['LEADERBOARD'] = os.getenv('LEADERBOARD', 'memory')
+    app.config['LEADERBOARD_VERIFY_SECONDS'] = int(os.getenv('LEADERBOARD_VERIFY_SECONDS', '5'))
+    # Live quizzes: 'memory' (single process only) or 'redis' (pub/sub fan-out across workers)
+    app.config['LIVE_HUB'] = os.getenv('LIVE_HUB', 'memory')
+    app.config['LIVE_COUNTS_INTERVAL_MS'] = int(os.getenv('LIVE_COUNTS_INTERVAL_MS', '1000'))
+    app.config['LIVE_QUEUE_SIZE'] = int(os.getenv('LIVE_QUEUE_SIZE', '100'))
+    app.config['LIVE_HEARTBEAT_SECONDS'] = int(os.getenv('LIVE_HEARTBEAT_SECONDS', '15'))
+    # Password hashing runs in a bounded process pool; 0 workers hashes on the request thread
+    app.config['BCRYPT_ROUNDS'] = int(os.getenv('BCRYPT_ROUNDS', '12'))
+    app.config['PASSWORD_HASH_WORKERS'] = int(os.getenv('PASSWORD_HASH_WORKERS', '2'))
+    app.config['PASSWORD_HASH_QUEUE_SIZE'] = int(os.getenv('PASSWORD_HASH_QUEUE_SIZE', '64'))
+    # Accounts allowed to read operational metrics (comma-separated emails); none by default
+    app.config['OPERATOR_EMAILS'] = frozenset(
+        email.strip().lower() for email in os.getenv('OPERATOR_EMAILS', '').split(',') if email.strip()
+    )
+    # Authenticated users: 'memory' (per process) or 'redis' (shared, invalidated everywhere)
+    app.config['USER_CACHE'] = os.getenv('USER_CACHE', 'memory')
+    app.config['USER_CACHE_TTL_SECONDS'] = int(os.getenv('USER_CACHE_TTL_SECONDS', '60'))
+    app.config['USER_CACHE_SIZE'] = int(os.getenv('USER_CACHE_SIZE', '10000'))
+    # Token revocation: 'memory' (workers pick up revocations on refresh) or 'redis' (pub/sub, immediate)
+    app.config['TOKEN_REVOCATION_SYNC'] = os.getenv('TOKEN_REVOCATION_SYNC', 'memory')
+    app.config['TOKEN_REVOCATION_REFRESH_SECONDS'] = int(os.getenv('TOKEN_REVOCATION_REFRESH_SECONDS', '30'))
+    app.config['TOKEN_REVOCATION_CAPACITY'] = int(os.getenv('TOKEN_REVOCATION_CAPACITY', '100000'))
+    # Rate limiting: 'memory' (per process), 'redis' (shared across workers) or 'off'; rates are N/period
+    app.config['RATE_LIMIT'] = os.getenv('RATE_LIMIT', 'memory')
+    app.config['RATE_LIMIT_DEFAULT'] = os.getenv('RATE_LIMIT_DEFAULT', '300/minute')
+    app.config['RATE_LIMIT_AUTH'] = os.getenv('RATE_LIMIT_AUTH', '10/minute')
+    app.config['RATE_LIMIT_GENERATE'] = os.getenv('RATE_LIMIT_GENERATE', '20/hour')
+    # Participants behind one NAT share an IP, so their attempt requests are limited per attempt and
+    # IP, with a generous per-IP ceiling across all attempts
+    app.config['RATE_LIMIT_ATTEMPT'] = os.getenv('RATE_LIMIT_ATTEMPT', '120/minute')
+    app.config['RATE_LIMIT_ATTEMPT_IP'] = os.getenv('RATE_LIMIT_ATTEMPT_IP', '1800/minute')
+    app.config['RATE_LIMIT_ATTEMPT_START'] = os.getenv('RATE_LIMIT_ATTEMPT_START', '600/minute')
+    app.config['RATE_LIMIT_MEMORY_SIZE'] = int(os.getenv('RATE_LIMIT_MEMORY_SIZE', '100000'))
+    # Reverse proxies in front of the app; their X-Forwarded-For entries give the client IP
+    app.config['TRUSTED_PROXY_COUNT'] = int(os.getenv('TRUSTED_PROXY_COUNT', '0'))
+    # Cold storage: answers of idle quizzes are moved to per-quiz gzip files by `flask attempts archive`
+    app.config['ARCHIVE_DIR'] = os.getenv('ARCHIVE_DIR', os.path.join(app.instance_path, 'archive'))
+    app.config['ARCHIVE_AFTER_DAYS'] = int(os.getenv('ARCHIVE_AFTER_DAYS', '180'))
     
+    if app.config['TRUSTED_PROXY_COUNT']:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['TRUSTED_PROXY_COUNT'])
+
     # Initialize extensions
     db.init_app(app)
     migrate.init_app(app, db)
@@ -200,6 +258,46 @@ def create_app(config_name='development'):
     app.register_blueprint(questions.bp, url_prefix='/api/questions')
     app.register_blueprint(attempts.bp, url_prefix='/api/attempts')
 
+    # Create the password hasher
+    from app.services import password_hasher
+    password_hasher.init_app(app)
+
+    # Create the authenticated-user cache
+    from app.services import user_cache
+    user_cache.init_app(app)
+
+    # Create the revoked-token filter
+    from app.services import token_revocation
+    token_revocation.init_app(app)
+
+    # Install the rate limiter
+    from app.services import rate_limiter
+    rate_limiter.init_app(app)
+
+    # Start the answer write-behind flusher if enabled
+    from app.services import answer_buffer
+    answer_buffer.init_app(app)
+
+    # Create the anti-cheating event writer
+    from app.services import attempt_event_service
+    attempt_event_service.init_app(app)
+
+    # Create the leaderboard backend
+    from app.services import leaderboard_service
+    leaderboard_service.init_app(app)
+
+    # Create the live quiz broadcast hub
+    from app.services import live_hub
+    live_hub.init_app(app)
+
+    # Start the in-process auto-submit scheduler if enabled
+    from app.services import deadline_scheduler
+    deadline_scheduler.init_app(app)
+
+    # Register CLI commands
+    from app.cli import register_commands
+    register_commands(app)
+
 
     # Add after_request handler to ensure CORS headers on all responses
     # This runs after logger's after_request (Flask executes in reverse order)
@@ -0,0 +1,70 @@
+"""
+Maintenance commands, available through the `flask` CLI (e.g. `flask quizzes repair-stats`).
+"""
+import click
+from flask.cli import AppGroup
+
+quizzes_cli = AppGroup('quizzes', help='Quiz maintenance commands.')
+attempts_cli = AppGroup('attempts', help='Attempt maintenance commands.')
+auth_cli = AppGroup('auth', help='Authentication maintenance commands.')
+
+
+@quizzes_cli.command('repair-stats')
+@click.option('--quiz-id', type=int, default=None, help='Only recompute this quiz.')
+def repair_stats(quiz_id):
+    """Recompute the denormalized quiz aggregates from questions and attempts."""
+    from app.services.quiz_stats_service import QuizStatsService
+
+    updated = QuizStatsService().recompute(quiz_id)
+    click.echo(f"Recomputed stats for {updated} quiz(es)")
+
+
+@quizzes_cli.command('index-answers')
+@click.option('--quiz-id', type=int, default=None, help='Only reindex this quiz.')
+def index_answers(quiz_id):
+    """Recompute the similarity signatures of submitted descriptive answers."""
+    from app.services.similarity_service import SimilarityService
+
+    indexed = SimilarityService().rebuild(quiz_id)
+    click.echo(f"Indexed {indexed} answer(s)")
+
+
+@attempts_cli.command('auto-submit')
+def auto_submit():
+    """Run the deadline scheduler in the foreground, auto-submitting expired attempts."""
+    from flask import current_app
+    from app.services.deadline_scheduler import DeadlineScheduler
+
+    app = current_app._get_current_object()
+    click.echo("Auto-submitting expired attempts (Ctrl+C to stop)")
+    DeadlineScheduler(app, app.config['AUTO_SUBMIT_POLL_SECONDS']).run()
+
+
+@attempts_cli.command('archive')
+@click.option('--older-than-days', type=int, default=None,
+              help='Archive attempts submitted this many days ago (default: ARCHIVE_AFTER_DAYS).')
+@click.option('--quiz-id', type=int, default=None, help='Only archive this quiz.')
+def archive(older_than_days, quiz_id):
+    """Move the answers of old attempts on idle quizzes to compressed per-quiz archive files."""
+    from flask import current_app
+    from app.services.archive_service import ArchiveService
+
+    if older_than_days is None:
+        older_than_days = current_app.config['ARCHIVE_AFTER_DAYS']
+    quizzes, attempts = ArchiveService().archive(older_than_days, quiz_id)
+    click.echo(f"Archived {attempts} attempt(s) from {quizzes} quiz(es)")
+
+
+@auth_cli.command('purge-revoked-tokens')
+def purge_revoked_tokens():
+    """Delete revocations of tokens that have expired anyway."""
+    from app.services.token_revocation import TokenRevocationService
+
+    deleted = TokenRevocationService().purge_expired()
+    click.echo(f"Purged {deleted} expired revocation(s)")
+
+
+def register_commands(app):
+    app.cli.add_command(quizzes_cli)
+    app.cli.add_command(attempts_cli)
+    app.cli.add_command(auth_cli)
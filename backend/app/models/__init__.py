@@ -2,6 +2,13 @@ from app.models.user import User
 from app.models.quiz import Quiz, QuizSettings
 from app.models.question import Question
 from app.models.attempt import Attempt, Answer
+from app.models.snapshot import QuizSnapshot
+from app.models.stats import QuestionStats, QuestionOptionCount, QuizScoreBucket
+from app.models.attempt_event import AttemptEvent, AttemptEventCount, AttemptEventWindow
+from app.models.similarity import AnswerSignature
+from app.models.revoked_token import RevokedToken
 
-__all__ = ['User', 'Quiz', 'QuizSettings', 'Question', 'Attempt', 'Answer']
+__all__ = ['User', 'Quiz', 'QuizSettings', 'Question', 'Attempt', 'Answer', 'QuizSnapshot',
+           'QuestionStats', 'QuestionOptionCount', 'QuizScoreBucket',
+           'AttemptEvent', 'AttemptEventCount', 'AttemptEventWindow', 'AnswerSignature', 'RevokedToken']
 
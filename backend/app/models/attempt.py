@@ -1,7 +1,8 @@
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from app.extensions import db
+from app.utils.randomization import seeded_permutation
 
 
 class AttemptStatus:
@@ -9,8 +10,26 @@ class AttemptStatus:
     SUBMITTED = 'SUBMITTED'
 
 
+def _load_participant_info(raw):
+    if raw:
+        try:
+            return json.loads(raw)
+        except:
+            return {}
+    return {}
+
+
 class Attempt(db.Model):
     __tablename__ = 'attempts'
+    __table_args__ = (
+        # Keyset pagination indexes: (filter column, started_at, id)
+        db.Index('ix_attempts_quiz_id_started_at_id', 'quiz_id', 'started_at', 'id'),
+        db.Index('ix_attempts_user_id_started_at_id', 'user_id', 'started_at', 'id'),
+        # Auto-submit scheduler loads open attempts in deadline order
+        db.Index('ix_attempts_status_deadline', 'status', 'deadline'),
+        # Leaderboards load a quiz's submitted scores from this covering index
+        db.Index('ix_attempts_quiz_id_status_score', 'quiz_id', 'status', 'score'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     quiz_id = db.Column(db.Integer, db.ForeignKey('quizzes.id'), nullable=False)
@@ -19,38 +38,71 @@ class Attempt(db.Model):
     participant_info = db.Column(db.Text, nullable=True)  # JSON string
     started_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     submitted_at = db.Column(db.DateTime, nullable=True)
+    deadline = db.Column(db.DateTime, nullable=True)  # started_at + time limit; null when untimed
     score = db.Column(db.Float, nullable=True)
     total_points = db.Column(db.Float, nullable=True)
     status = db.Column(db.String(20), default=AttemptStatus.IN_PROGRESS, nullable=False)
+    snapshot_id = db.Column(db.Integer, db.ForeignKey('quiz_snapshots.id'), nullable=True)  # null for legacy attempts
+    archived_at = db.Column(db.DateTime, nullable=True)  # answers moved to the quiz's archive file
+
+    # Randomization is pinned at start; orders are derived from the seed, never stored
+    seed = db.Column(db.Integer, nullable=True)
+    shuffle_questions = db.Column(db.Boolean, default=False, server_default='0', nullable=False)
+    shuffle_options = db.Column(db.Boolean, default=False, server_default='0', nullable=False)
 
     # Relationships
     answers = db.relationship('Answer', backref='attempt', lazy=True, cascade='all, delete-orphan')
+    events = db.relationship('AttemptEvent', lazy=True, cascade='all, delete-orphan')
+    event_counts = db.relationship('AttemptEventCount', lazy=True, cascade='all, delete-orphan')
+    event_windows = db.relationship('AttemptEventWindow', lazy=True, cascade='all, delete-orphan')
+    answer_signatures = db.relationship('AnswerSignature', lazy=True, cascade='all, delete-orphan')
 
     def get_participant_info(self):
-        if self.participant_info:
-            try:
-                return json.loads(self.participant_info)
-            except:
-                return {}
-        return {}
+        return _load_participant_info(self.participant_info)
 
     def set_participant_info(self, info):
         self.participant_info = json.dumps(info) if info else None
 
-    def to_dict(self, include_answers=False):
-        data = {
-            'id': self.id,
-            'quiz_id': self.quiz_id,
-            'user_id': self.user_id,
-            'participant_name': self.participant_name,
-            'participant_info': self.get_participant_info(),
-            'started_at': self.started_at.isoformat() if self.started_at else None,
-            'submitted_at': self.submitted_at.isoformat() if self.submitted_at else None,
-            'score': self.score,
-            'total_points': self.total_points,
-            'status': self.status
+    def is_expired(self, grace_seconds=0, now=None):
+        """Whether the time limit (plus grace) has run out"""
+        if self.deadline is None:
+            return False
+        now = now or datetime.utcnow()
+        return now > self.deadline + timedelta(seconds=grace_seconds)
+
+    def question_order(self, question_count):
+        """Display order of the quiz's questions for this attempt, or None if not shuffled"""
+        if not self.shuffle_questions or self.seed is None:
+            return None
+        return seeded_permutation(self.seed, 'questions', question_count)
+
+    def option_order(self, question_id, option_count):
+        """Display order of a question's options for this attempt, or None if not shuffled"""
+        if not self.shuffle_options or self.seed is None:
+            return None
+        return seeded_permutation(self.seed, f"options:{question_id}", option_count)
+
+    @staticmethod
+    def serialize(source):
+        """Attempt fields from an Attempt or from a row that selects the attempts table columns"""
+        return {
+            'id': source.id,
+            'quiz_id': source.quiz_id,
+            'user_id': source.user_id,
+            'participant_name': source.participant_name,
+            'participant_info': _load_participant_info(source.participant_info),
+            'started_at': source.started_at.isoformat() if source.started_at else None,
+            'submitted_at': source.submitted_at.isoformat() if source.submitted_at else None,
+            'deadline': source.deadline.isoformat() if source.deadline else None,
+            'score': source.score,
+            'total_points': source.total_points,
+            'status': source.status,
+            'snapshot_id': source.snapshot_id
         }
 
+    def to_dict(self, include_answers=False):
+        data = self.serialize(self)
+
         if include_answers:
             data['answers'] = [a.to_dict() for a in self.answers]
 
@@ -59,6 +111,10 @@ class Attempt(db.Model):
 
 class Answer(db.Model):
     __tablename__ = 'answers'
+    __table_args__ = (
+        # One answer per question per attempt; also the conflict target for upserts
+        db.Index('ux_answers_attempt_id_question_id', 'attempt_id', 'question_id', unique=True),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     attempt_id = db.Column(db.Integer, db.ForeignKey('attempts.id'), nullable=False)
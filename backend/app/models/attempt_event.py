@@ -0,0 +1,55 @@
+from datetime import datetime
+
+from app.extensions import db
+
+# Suspicious-interval detection: an attempt is flagged for every fixed window of this many seconds
+# in which it reported at least SUSPICIOUS_EVENTS_PER_WINDOW events
+SUSPICIOUS_WINDOW_SECONDS = 30
+SUSPICIOUS_EVENTS_PER_WINDOW = 3
+
+
+class AttemptEventType:
+    TAB_SWITCH = 'tab_switch'
+    WINDOW_SWITCH = 'window_switch'
+    WINDOW_BLUR = 'window_blur'
+    COPY = 'copy'
+    PASTE = 'paste'
+    CUT = 'cut'
+    RIGHT_CLICK = 'right_click'
+    DEVTOOLS_SHORTCUT = 'devtools_shortcut'
+    MAX_VIOLATIONS = 'max_violations'
+
+    ALL = (TAB_SWITCH, WINDOW_SWITCH, WINDOW_BLUR, COPY, PASTE, CUT, RIGHT_CLICK, DEVTOOLS_SHORTCUT,
+           MAX_VIOLATIONS)
+
+
+class AttemptEvent(db.Model):
+    """Append-only anti-cheating telemetry reported by the participant's browser"""
+    __tablename__ = 'attempt_events'
+    __table_args__ = (
+        db.Index('ix_attempt_events_attempt_id_occurred_at', 'attempt_id', 'occurred_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    attempt_id = db.Column(db.Integer, db.ForeignKey('attempts.id'), nullable=False)
+    type = db.Column(db.String(30), nullable=False)
+    occurred_at = db.Column(db.DateTime, nullable=False)  # client timestamp (UTC), capped at receipt
+    received_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+
+class AttemptEventCount(db.Model):
+    """Running count of an attempt's events per type"""
+    __tablename__ = 'attempt_event_counts'
+
+    attempt_id = db.Column(db.Integer, db.ForeignKey('attempts.id'), primary_key=True)
+    type = db.Column(db.String(30), primary_key=True)
+    count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+
+
+class AttemptEventWindow(db.Model):
+    """Running count of an attempt's events per SUSPICIOUS_WINDOW_SECONDS window"""
+    __tablename__ = 'attempt_event_windows'
+
+    attempt_id = db.Column(db.Integer, db.ForeignKey('attempts.id'), primary_key=True)
+    window_index = db.Column(db.BigInteger, primary_key=True, autoincrement=False)  # epoch seconds // window size
+    count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
@@ -26,6 +26,9 @@ class Question(db.Model):
 
     # Relationships
     answers = db.relationship('Answer', backref='question', lazy=True, cascade='all, delete-orphan')
+    stats = db.relationship('QuestionStats', uselist=False, lazy=True, cascade='all, delete-orphan')
+    option_counts = db.relationship('QuestionOptionCount', lazy=True, cascade='all, delete-orphan')
+    answer_signatures = db.relationship('AnswerSignature', lazy=True, cascade='all, delete-orphan')
 
     def get_options(self):
         if self.options:
@@ -6,6 +6,10 @@ from app.extensions import db
 
 class Quiz(db.Model):
     __tablename__ = 'quizzes'
+    __table_args__ = (
+        # Keyset pagination index: (creator_id, created_at, id)
+        db.Index('ix_quizzes_creator_id_created_at_id', 'creator_id', 'created_at', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     creator_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -13,15 +17,33 @@ class Quiz(db.Model):
     description = db.Column(db.Text, nullable=True)
     is_survey = db.Column(db.Boolean, default=False, nullable=False)
     requires_login = db.Column(db.Boolean, default=False, nullable=False)
-    share_code = db.Column(db.String(20), unique=True, nullable=False, index=True)
+    # Live (host-paced) mode: participants may only answer the question the host has opened
+    live_mode = db.Column(db.Boolean, default=False, server_default='0', nullable=False)
+    live_question_id = db.Column(db.Integer, nullable=True)  # not a foreign key: questions reference quizzes
+    live_question_open = db.Column(db.Boolean, default=False, server_default='0', nullable=False)
+    share_code = db.Column(db.String(20), unique=True, nullable=True, index=True)  # set from id after insert
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
+    # Denormalized aggregates, maintained by QuizStatsService in the same transaction as the writes
+    question_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    total_points = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    attempt_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    submitted_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    avg_score = db.Column(db.Float, nullable=True)
+    score_sum_sq = db.Column(db.Float, default=0.0, server_default='0', nullable=False)  # for variance
+
+    # Bumped on every question edit; attempts pin the QuizSnapshot built from one version
+    content_version = db.Column(db.Integer, default=1, server_default='1', nullable=False)
+
     # Relationships
     questions = db.relationship('Question', backref='quiz', lazy=True, cascade='all, delete-orphan',
                                 order_by='Question.order')
     attempts = db.relationship('Attempt', backref='quiz', lazy=True, cascade='all, delete-orphan')
     settings = db.relationship('QuizSettings', backref='quiz', uselist=False, cascade='all, delete-orphan')
+    snapshots = db.relationship('QuizSnapshot', backref='quiz', lazy=True, cascade='all, delete-orphan')
+    question_stats = db.relationship('QuestionStats', lazy=True, cascade='all, delete-orphan')
+    score_buckets = db.relationship('QuizScoreBucket', lazy=True, cascade='all, delete-orphan')
 
     def to_dict(self, include_questions=False):
         data = {
@@ -31,9 +53,15 @@ class Quiz(db.Model):
             'description': self.description,
             'is_survey': self.is_survey,
             'requires_login': self.requires_login,
+            'live_mode': self.live_mode,
             'share_code': self.share_code,
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'question_count': self.question_count,
+            'total_points': self.total_points,
+            'attempt_count': self.attempt_count,
+            'submitted_count': self.submitted_count,
+            'avg_score': self.avg_score
         }
 
         if self.settings:
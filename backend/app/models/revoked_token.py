@@ -0,0 +1,13 @@
+from datetime import datetime
+
+from app.extensions import db
+
+
+class RevokedToken(db.Model):
+    """Denylist of JWT ids (jti) revoked before their expiry"""
+    __tablename__ = 'revoked_tokens'
+
+    jti = db.Column(db.String(32), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True)
+    revoked_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)  # the token's exp; purgeable after
@@ -0,0 +1,18 @@
+from app.extensions import db
+
+# MinHash signature length (permutations) and word n-gram size for shingling answer text
+SIGNATURE_SIZE = 128
+SHINGLE_SIZE = 3
+
+
+class AnswerSignature(db.Model):
+    """MinHash signature of a submitted DESCRIPTIVE answer, used for similarity detection"""
+    __tablename__ = 'answer_signatures'
+    __table_args__ = (
+        db.Index('ix_answer_signatures_quiz_id_question_id', 'quiz_id', 'question_id'),
+    )
+
+    attempt_id = db.Column(db.Integer, db.ForeignKey('attempts.id'), primary_key=True)
+    question_id = db.Column(db.Integer, db.ForeignKey('questions.id'), primary_key=True)
+    quiz_id = db.Column(db.Integer, db.ForeignKey('quizzes.id'), nullable=False)
+    signature = db.Column(db.LargeBinary, nullable=False)  # SIGNATURE_SIZE little-endian uint32 values
@@ -0,0 +1,32 @@
+import json
+from datetime import datetime
+
+from app.extensions import db
+
+
+class QuizSnapshot(db.Model):
+    """Immutable, pre-serialized copy of a quiz's questions and answer key at one content version"""
+    __tablename__ = 'quiz_snapshots'
+    __table_args__ = (
+        db.UniqueConstraint('quiz_id', 'version', name='uq_quiz_snapshots_quiz_id_version'),
+        # Never reuse ids: compiled snapshots are cached by id for the life of the process
+        {'sqlite_autoincrement': True},
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    quiz_id = db.Column(db.Integer, db.ForeignKey('quizzes.id'), nullable=False)
+    version = db.Column(db.Integer, nullable=False)  # Quiz.content_version this was built from
+    questions_json = db.Column(db.Text, nullable=False)  # serialized list of Question.to_dict()
+    answer_key_json = db.Column(db.Text, nullable=False)  # {question_id: scoring fields}
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def get_answer_key(self):
+        return {int(qid): entry for qid, entry in json.loads(self.answer_key_json).items()}
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'quiz_id': self.quiz_id,
+            'version': self.version,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
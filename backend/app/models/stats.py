@@ -0,0 +1,44 @@
+from app.extensions import db
+
+# Fixed score histogram: bucket i holds submitted scores in [i, i + 1) * 100 / SCORE_BUCKETS percent
+SCORE_BUCKETS = 20
+# question_option_counts positions for TRUE_FALSE questions
+TRUE_FALSE_OPTIONS = ('true', 'false')
+
+
+class QuestionStats(db.Model):
+    """Running per-question aggregates over submitted attempts, maintained by QuizStatsService"""
+    __tablename__ = 'question_stats'
+
+    question_id = db.Column(db.Integer, db.ForeignKey('questions.id'), primary_key=True)
+    quiz_id = db.Column(db.Integer, db.ForeignKey('quizzes.id'), nullable=False, index=True)
+    answered_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    correct_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    points_sum = db.Column(db.Float, default=0.0, server_default='0', nullable=False)
+    points_sum_sq = db.Column(db.Float, default=0.0, server_default='0', nullable=False)
+
+
+class QuestionOptionCount(db.Model):
+    """How many submitted answers chose each option (MCQ in original option order, or TRUE_FALSE_OPTIONS)"""
+    __tablename__ = 'question_option_counts'
+
+    question_id = db.Column(db.Integer, db.ForeignKey('questions.id'), primary_key=True)
+    option_index = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+
+
+class QuizScoreBucket(db.Model):
+    """Fixed-width score histogram bucket over submitted attempts"""
+    __tablename__ = 'quiz_score_buckets'
+
+    quiz_id = db.Column(db.Integer, db.ForeignKey('quizzes.id'), primary_key=True)
+    bucket = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+
+
+def score_bucket(score, total_points):
+    """Histogram bucket for a score, or None when the attempt had no points available"""
+    if not total_points:
+        return None
+    fraction = min(max((score or 0) / total_points, 0.0), 1.0)
+    return min(int(fraction * SCORE_BUCKETS), SCORE_BUCKETS - 1)
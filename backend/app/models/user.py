@@ -15,6 +15,7 @@ class User(db.Model):
     # Relationships
     quizzes = db.relationship('Quiz', backref='creator', lazy=True, cascade='all, delete-orphan')
     attempts = db.relationship('Attempt', backref='user', lazy=True)
+    revoked_tokens = db.relationship('RevokedToken', lazy=True, cascade='all, delete-orphan')
 
     def to_dict(self):
         return {
@@ -1,17 +1,27 @@
+import hashlib
+import json
 import logging
 
 from flask import Blueprint, request
 from marshmallow import ValidationError
 
+from app.models.attempt import AttemptStatus
+from app.services.attempt_event_service import BUFFER_FULL_ERROR, AttemptEventService
 from app.services.attempt_service import AttemptService
+from app.services.leaderboard_service import LeaderboardService
+from app.services.result_cache_service import RESULT_CLIENT_MAX_AGE, ResultCacheService
 from app.services.scoring_service import ScoringService
 from app.utils.decorators import optional_token, token_required
+from app.utils.pagination import parse_page_args
 from app.utils.response import ResponseFormatter
-from app.utils.validators import AttemptSchema, AnswerSchema
+from app.utils.validators import AttemptSchema, AnswerSchema, AnswerBatchSchema, AttemptEventBatchSchema
 
 bp = Blueprint('attempts', __name__)
 attempt_service = AttemptService()
 scoring_service = ScoringService()
+result_cache_service = ResultCacheService()
+leaderboard_service = LeaderboardService()
+event_service = AttemptEventService()
 logger = logging.getLogger(__name__)
 
 
@@ -63,6 +73,51 @@ def save_answer(attempt_id):
     )
 
 
+@bp.route('/<int:attempt_id>/answers/batch', methods=['POST'])
+def save_answers_batch(attempt_id):
+    try:
+        schema = AnswerBatchSchema()
+        data = schema.load(request.json)
+    except ValidationError as err:
+        return ResponseFormatter.validation_error(err.messages)
+
+    question_ids, error = attempt_service.save_answers(
+        attempt_id=attempt_id,
+        answers=data['answers']
+    )
+
+    if error:
+        return ResponseFormatter.error(error)
+
+    return ResponseFormatter.success(
+        data={'attempt_id': attempt_id, 'saved': len(question_ids), 'question_ids': question_ids},
+        message="Answers saved successfully"
+    )
+
+
+@bp.route('/<int:attempt_id>/events', methods=['POST'])
+def record_events(attempt_id):
+    """Accept a batch of anti-cheating events; they are written asynchronously"""
+    try:
+        schema = AttemptEventBatchSchema()
+        data = schema.load(request.json)
+    except ValidationError as err:
+        return ResponseFormatter.validation_error(err.messages)
+
+    accepted, error = event_service.record_events(attempt_id, data['events'])
+
+    if error == BUFFER_FULL_ERROR:
+        return ResponseFormatter.error(error, status_code=503)
+    if error:
+        return ResponseFormatter.error(error)
+
+    return ResponseFormatter.success(
+        data={'attempt_id': attempt_id, 'accepted': accepted},
+        message="Events recorded successfully",
+        status_code=202
+    )
+
+
 @bp.route('/<int:attempt_id>', methods=['PUT', 'PATCH'])
 def update_attempt(attempt_id):
     try:
@@ -97,8 +152,10 @@ def submit_attempt(attempt_id):
 
     try:
         attempt = scoring_service.submit_attempt(attempt)
-        return ResponseFormatter.success(
-            data=attempt.to_dict(include_answers=True),
+        # Prime the result cache; the results page fetches this attempt next
+        entry = result_cache_service.store(attempt)
+        return ResponseFormatter.raw_success(
+            data_json=_with_standing(entry),
             message="Attempt submitted successfully"
         )
     except Exception as e:
@@ -106,46 +163,103 @@ def submit_attempt(attempt_id):
         return ResponseFormatter.server_error(f"Failed to submit attempt: {str(e)}")
 
 
+def _standing_json(entry):
+    """
+    The attempt's current rank, percentile and ranked_attempts as JSON object members;
+    empty for survey responses, which are not scored
+    """
+    if entry.score is None:
+        return ''
+    standing = leaderboard_service.rank(entry.quiz_id, entry.score)
+    return json.dumps(standing, separators=(',', ':'))[1:-1]
+
+
+def _with_standing(entry, standing_json=None):
+    """Cached result JSON with the standing members appended to the object"""
+    if standing_json is None:
+        standing_json = _standing_json(entry)
+    if not standing_json:
+        return entry.data_json
+    return entry.data_json[:-1] + ',' + standing_json + '}'
+
+
+def _result_response(entry):
+    """Serve a cached submitted result with validators so clients can revalidate cheaply"""
+    standing_json = _standing_json(entry)
+    response, status_code = ResponseFormatter.raw_success(
+        data_json=_with_standing(entry, standing_json),
+        message="Attempt retrieved successfully",
+    )
+    response.status_code = status_code
+    # The result part never changes, so only the standing needs hashing per request
+    response.set_etag(f"{entry.etag}-{hashlib.sha1(standing_json.encode('utf-8')).hexdigest()[:12]}")
+    response.cache_control.private = True
+    response.cache_control.max_age = RESULT_CLIENT_MAX_AGE
+    return response.make_conditional(request)
+
+
 @bp.route('/<int:attempt_id>', methods=['GET'])
 def get_attempt(attempt_id):
+    # Submitted results never change outside a regrade, so skip the database entirely
+    cached = result_cache_service.get(attempt_id)
+    if cached:
+        return _result_response(cached)
+
     attempt = attempt_service.get_attempt(attempt_id, include_answers=True)
     if not attempt:
         return ResponseFormatter.not_found("Attempt")
 
+    if attempt.status == AttemptStatus.SUBMITTED:
+        return _result_response(result_cache_service.store(attempt))
+
+    data = attempt.to_dict(include_answers=True)
+    if attempt.status == AttemptStatus.IN_PROGRESS:
+        # Resume must see answers still waiting in the write-behind buffer
+        data['answers'] = attempt_service.merge_pending_answers(attempt_id, data['answers'])
+
     return ResponseFormatter.success(
-        data=attempt.to_dict(include_answers=True),
+        data=data,
         message="Attempt retrieved successfully"
     )
 
 
+@bp.route('/<int:attempt_id>/questions', methods=['GET'])
+def get_attempt_questions(attempt_id):
+    """Get the questions an attempt was started with, in this participant's display order"""
+    attempt = attempt_service.get_attempt(attempt_id, include_answers=False)
+    if not attempt:
+        return ResponseFormatter.not_found("Attempt")
+
+    questions_json = attempt_service.get_attempt_questions_json(attempt)
+    if questions_json is not None:
+        return ResponseFormatter.raw_success(
+            data_json=questions_json,
+            message="Questions retrieved successfully"
+        )
+
+    # Attempts started before snapshots existed read the live questions
+    return ResponseFormatter.success(
+        data=[q.to_dict() for q in attempt.quiz.questions],
+        message="Questions retrieved successfully"
+    )
+
+
 @bp.route('/user/attempts', methods=['GET'])
 @token_required
 def get_user_attempts(current_user):
-    """Get all attempts for the current user"""
+    """Get one page of attempts for the current user"""
     try:
-        attempts = attempt_service.get_user_attempts(current_user.id)
-        # Include quiz information for each attempt
-        from app.services.quiz_service import QuizService
-        quiz_service = QuizService()
-        
-        attempts_with_quiz = []
-        for attempt in attempts:
-            attempt_dict = attempt.to_dict(include_answers=False)
-            quiz = quiz_service.get_quiz_by_id(attempt.quiz_id)
-            if quiz:
-                # Calculate total points from quiz questions
-                total_points = sum(q.points for q in quiz.questions) if quiz.questions else 0
-                attempt_dict['quiz'] = {
-                    'id': quiz.id,
-                    'title': quiz.title,
-                    'description': quiz.description,
-                    'share_code': quiz.share_code,
-                    'total_points': total_points
-                }
-            attempts_with_quiz.append(attempt_dict)
-        
-        return ResponseFormatter.success(
-            data=attempts_with_quiz,
+        limit, cursor = parse_page_args(request.args)
+    except ValueError as e:
+        return ResponseFormatter.error(str(e))
+
+    try:
+        attempts, next_cursor = attempt_service.get_user_attempts(current_user.id, limit=limit, cursor=cursor)
+
+        return ResponseFormatter.paginated(
+            data=attempts,
+            next_cursor=next_cursor,
+            limit=limit,
             message="User attempts retrieved successfully"
         )
     except Exception as e:
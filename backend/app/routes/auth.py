@@ -1,13 +1,25 @@
-from flask import Blueprint, request
+from datetime import datetime
+
+from flask import Blueprint, current_app, g, request
 from marshmallow import ValidationError
 
 from app.services.auth_service import AuthService
+from app.services.token_revocation import TokenRevocationService
 from app.utils.decorators import token_required
 from app.utils.response import ResponseFormatter
 from app.utils.validators import RegisterSchema, LoginSchema
 
 bp = Blueprint('auth', __name__)
 auth_service = AuthService()
+token_revocation_service = TokenRevocationService()
+
+
+def _error_response(message, status_code):
+    response, status_code = ResponseFormatter.error(message=message, status_code=status_code)
+    if status_code == 429:
+        # Password hashing is saturated; a short pause is enough for the queue to drain
+        response.headers['Retry-After'] = '1'
+    return response, status_code
 
 
 @bp.route('/register', methods=['POST', 'OPTIONS'])
@@ -26,10 +38,7 @@ def register():
     )
 
     if 'error' in result:
-        return ResponseFormatter.error(
-            message=result.get('error', 'Registration failed'),
-            status_code=status_code
-        )
+        return _error_response(result.get('error', 'Registration failed'), status_code)
 
     # Registration successful
     return ResponseFormatter.created(
@@ -53,10 +62,7 @@ def login():
     )
 
     if 'error' in result:
-        return ResponseFormatter.error(
-            message=result.get('error', 'Login failed'),
-            status_code=status_code
-        )
+        return _error_response(result.get('error', 'Login failed'), status_code)
 
     # Login successful
     return ResponseFormatter.success(
@@ -72,4 +78,30 @@ def get_current_user(current_user):
     return ResponseFormatter.success(
         data=current_user.to_dict(),
         message="User information retrieved successfully"
-    )
\ No newline at end of file
+    )
+
+
+@bp.route('/logout', methods=['POST', 'OPTIONS'])
+@token_required
+def logout(current_user):
+    # OPTIONS is handled by the global preflight handler
+    claims = g.token_claims
+    if 'jti' not in claims:
+        return ResponseFormatter.error(message="This token cannot be revoked, it expires on its own", status_code=400)
+
+    token_revocation_service.revoke(claims['jti'], datetime.utcfromtimestamp(claims['exp']), current_user.id)
+    return ResponseFormatter.success(message="Logged out successfully")
+
+
+@bp.route('/password-hasher/metrics', methods=['GET'])
+@token_required
+def get_password_hasher_metrics(current_user):
+    """Queue depth and hash latency of this worker's password hasher; operators only"""
+    if current_user.email.lower() not in current_app.config['OPERATOR_EMAILS']:
+        # Not advertised to other accounts
+        return ResponseFormatter.not_found()
+
+    return ResponseFormatter.success(
+        data=current_app.extensions['password_hasher'].stats(),
+        message="Password hasher metrics retrieved successfully"
+    )
@@ -1,15 +1,34 @@
+import json
 import logging
 
-from flask import Blueprint, request
+from flask import Blueprint, Response, current_app, request, stream_with_context
 from marshmallow import ValidationError
 
+from app.services.analytics_service import AnalyticsService
+from app.services.archive_service import ArchiveService
+from app.services.export_service import ExportService
+from app.services.leaderboard_service import MAX_LEADERBOARD_LIMIT, LeaderboardService
+from app.services.live_hub import sse_frame
+from app.services.live_service import LiveService
 from app.services.quiz_service import QuizService
+from app.services.quiz_stats_service import QuizStatsService
+from app.services.similarity_service import DEFAULT_THRESHOLD, MIN_THRESHOLD, SimilarityService
+from app.services.snapshot_service import SnapshotService
 from app.utils.decorators import token_required, optional_token
+from app.utils.pagination import parse_page_args
 from app.utils.response import ResponseFormatter
-from app.utils.validators import QuizSchema
+from app.utils.validators import LiveAdvanceSchema, QuizSchema
 
 bp = Blueprint('quizzes', __name__)
 quiz_service = QuizService()
+snapshot_service = SnapshotService()
+export_service = ExportService()
+analytics_service = AnalyticsService()
+stats_service = QuizStatsService()
+leaderboard_service = LeaderboardService()
+live_service = LiveService()
+archive_service = ArchiveService()
+similarity_service = SimilarityService()
 logger = logging.getLogger(__name__)
 
 
@@ -40,6 +59,7 @@ def create_quiz(current_user):
             description=data.get('description'),
             is_survey=data.get('is_survey', False),
             requires_login=data.get('requires_login', False),
+            live_mode=data.get('live_mode', False),
             settings=settings
         )
         return ResponseFormatter.created(
@@ -54,9 +74,16 @@ def create_quiz(current_user):
 @bp.route('', methods=['GET'])
 @token_required
 def list_quizzes(current_user):
-    quizzes = quiz_service.get_user_quizzes(current_user.id)
-    return ResponseFormatter.success(
+    try:
+        limit, cursor = parse_page_args(request.args)
+    except ValueError as e:
+        return ResponseFormatter.error(str(e))
+
+    quizzes, next_cursor = quiz_service.get_user_quizzes(current_user.id, limit=limit, cursor=cursor)
+    return ResponseFormatter.paginated(
         data=[q.to_dict() for q in quizzes],
+        next_cursor=next_cursor,
+        limit=limit,
         message="Quizzes retrieved successfully"
     )
 
@@ -83,9 +110,13 @@ def get_quiz_by_share_code(current_user, share_code):
     if not quiz:
         return ResponseFormatter.not_found("Quiz")
 
-    # Include questions for public access
+    # Include questions for public access, served from the published snapshot
+    snapshot = snapshot_service.get_current(quiz)
+    data = quiz.to_dict(include_questions=False)
+    data['questions'] = json.loads(snapshot.questions_json)
+    data['snapshot_id'] = snapshot.id
     return ResponseFormatter.success(
-        data=quiz.to_dict(include_questions=True),
+        data=data,
         message="Quiz retrieved successfully"
     )
 
@@ -131,6 +162,7 @@ def update_quiz(current_user, quiz_id):
             description=data.get('description'),
             is_survey=data.get('is_survey'),
             requires_login=data.get('requires_login'),
+            live_mode=data.get('live_mode'),
             settings=settings if settings else None
         )
         return ResponseFormatter.success(
@@ -165,8 +197,10 @@ def delete_quiz(current_user, quiz_id):
 @bp.route('/<int:quiz_id>/attempts', methods=['GET'])
 @token_required
 def list_attempts(current_user, quiz_id):
-    from app.services.attempt_service import AttemptService
+    from app.services.attempt_event_service import AttemptEventService
+    from app.services.attempt_service import STREAM_BATCH_SIZE, AttemptService
     attempt_service = AttemptService()
+    event_service = AttemptEventService()
 
     quiz = quiz_service.get_quiz_by_id(quiz_id)
     if not quiz:
@@ -175,12 +209,294 @@ def list_attempts(current_user, quiz_id):
     if quiz.creator_id != current_user.id:
         return ResponseFormatter.unauthorized("You don't have permission to view attempts for this quiz")
 
+    # ?stream=true sends the whole history in one response, serialized as rows arrive
+    if request.args.get('stream', '').lower() in ('1', 'true'):
+        return ResponseFormatter.streamed(
+            event_service.with_summaries(attempt_service.iter_quiz_attempts(quiz_id), STREAM_BATCH_SIZE),
+            message="Attempts retrieved successfully"
+        )
+
     try:
-        attempts = attempt_service.get_quiz_attempts(quiz_id, current_user.id)
-        return ResponseFormatter.success(
-            data=[a.to_dict(include_answers=True) for a in attempts],
+        limit, cursor = parse_page_args(request.args)
+    except ValueError as e:
+        return ResponseFormatter.error(str(e))
+
+    try:
+        attempts, next_cursor = attempt_service.get_quiz_attempts(
+            quiz_id, current_user.id, limit=limit, cursor=cursor
+        )
+        summaries = event_service.summaries(a.id for a in attempts)
+        data = []
+        for attempt in attempts:
+            item = archive_service.attempt_dict(attempt)
+            item['anti_cheating'] = summaries[attempt.id]
+            data.append(item)
+        return ResponseFormatter.paginated(
+            data=data,
+            next_cursor=next_cursor,
+            limit=limit,
             message="Attempts retrieved successfully"
         )
     except Exception as e:
         logger.error(f"Error retrieving attempts: {str(e)}", exc_info=True)
         return ResponseFormatter.server_error(f"Failed to retrieve attempts: {str(e)}")
+
+
+@bp.route('/<int:quiz_id>/leaderboard', methods=['GET'])
+@token_required
+def get_leaderboard(current_user, quiz_id):
+    """Top submitted attempts by score (owner only)"""
+    quiz = quiz_service.get_quiz_by_id(quiz_id)
+    if not quiz:
+        return ResponseFormatter.not_found("Quiz")
+
+    if quiz.creator_id != current_user.id:
+        return ResponseFormatter.unauthorized("You don't have permission to view the leaderboard for this quiz")
+
+    try:
+        limit = int(request.args.get('limit', 10))
+    except ValueError:
+        return ResponseFormatter.error("limit must be an integer")
+    if not 1 <= limit <= MAX_LEADERBOARD_LIMIT:
+        return ResponseFormatter.error(f"limit must be between 1 and {MAX_LEADERBOARD_LIMIT}")
+
+    return ResponseFormatter.success(
+        data=leaderboard_service.top(quiz_id, limit),
+        message="Leaderboard retrieved successfully"
+    )
+
+
+@bp.route('/<int:quiz_id>/stats', methods=['GET'])
+@token_required
+def get_stats(current_user, quiz_id):
+    """Dashboard statistics from the incrementally maintained aggregates"""
+    quiz = quiz_service.get_quiz_by_id(quiz_id)
+    if not quiz:
+        return ResponseFormatter.not_found("Quiz")
+
+    if quiz.creator_id != current_user.id:
+        return ResponseFormatter.unauthorized("You don't have permission to view statistics for this quiz")
+
+    return ResponseFormatter.success(
+        data=stats_service.summary(quiz),
+        message="Statistics retrieved successfully"
+    )
+
+
+@bp.route('/<int:quiz_id>/analytics', methods=['GET'])
+@token_required
+def get_analytics(current_user, quiz_id):
+    """Item analysis (difficulty, discrimination, option frequencies) and score distribution"""
+    quiz = quiz_service.get_quiz_by_id(quiz_id)
+    if not quiz:
+        return ResponseFormatter.not_found("Quiz")
+
+    if quiz.creator_id != current_user.id:
+        return ResponseFormatter.unauthorized("You don't have permission to view analytics for this quiz")
+
+    try:
+        return ResponseFormatter.success(
+            data=analytics_service.get_quiz_analytics(quiz),
+            message="Analytics retrieved successfully"
+        )
+    except Exception as e:
+        logger.error(f"Error computing analytics: {str(e)}", exc_info=True)
+        return ResponseFormatter.server_error(f"Failed to compute analytics: {str(e)}")
+
+
+@bp.route('/<int:quiz_id>/similarity', methods=['GET'])
+@token_required
+def get_similar_answers(current_user, quiz_id):
+    """Pairs of submitted descriptive answers that are likely copies of each other (owner only)"""
+    quiz = quiz_service.get_quiz_by_id(quiz_id)
+    if not quiz:
+        return ResponseFormatter.not_found("Quiz")
+
+    if quiz.creator_id != current_user.id:
+        return ResponseFormatter.unauthorized("You don't have permission to view similarity for this quiz")
+
+    try:
+        threshold = float(request.args.get('threshold', DEFAULT_THRESHOLD))
+        question_id = request.args.get('question_id', type=int)
+    except ValueError:
+        return ResponseFormatter.error("threshold must be a number")
+    if not MIN_THRESHOLD <= threshold <= 1:
+        return ResponseFormatter.error(f"threshold must be between {MIN_THRESHOLD} and 1")
+
+    try:
+        return ResponseFormatter.success(
+            data=similarity_service.get_similar_answers(quiz, threshold, question_id),
+            message="Similar answers retrieved successfully"
+        )
+    except Exception as e:
+        logger.error(f"Error finding similar answers: {str(e)}", exc_info=True)
+        return ResponseFormatter.server_error(f"Failed to find similar answers: {str(e)}")
+
+
+_EXPORT_FORMATS = {
+    'csv': ('text/csv', ExportService.iter_csv),
+    'ndjson': ('application/x-ndjson', ExportService.iter_ndjson),
+}
+
+
+@bp.route('/<int:quiz_id>/results.<any(csv, ndjson):fmt>', methods=['GET'])
+@token_required
+def export_results(current_user, quiz_id, fmt):
+    """Stream one row per attempt with per-question answer and points columns (owner only)"""
+    quiz = quiz_service.get_quiz_by_id(quiz_id)
+    if not quiz:
+        return ResponseFormatter.not_found("Quiz")
+
+    if quiz.creator_id != current_user.id:
+        return ResponseFormatter.unauthorized("You don't have permission to export results for this quiz")
+
+    mimetype, generate = _EXPORT_FORMATS[fmt]
+    response = Response(stream_with_context(generate(export_service, quiz)), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename="quiz-{quiz_id}-results.{fmt}"'
+    return response
+
+
+@bp.route('/<int:quiz_id>/live', methods=['GET'])
+@optional_token
+def get_live_state(current_user, quiz_id):
+    """Current live question and whether it is accepting answers"""
+    quiz = quiz_service.get_quiz_by_id(quiz_id)
+    if not quiz:
+        return ResponseFormatter.not_found("Quiz")
+
+    return ResponseFormatter.success(
+        data=live_service.get_state(quiz),
+        message="Live state retrieved successfully"
+    )
+
+
+@bp.route('/<int:quiz_id>/live/events', methods=['GET'])
+@optional_token
+def live_events(current_user, quiz_id):
+    """
+    Server-Sent Events for participants: a 'state' event on connect and whenever the host advances
+    or closes a question, and 'counts' events with live answer counts for the open question.
+    """
+    quiz = quiz_service.get_quiz_by_id(quiz_id)
+    if not quiz:
+        return ResponseFormatter.not_found("Quiz")
+
+    if quiz.requires_login and not current_user:
+        return ResponseFormatter.unauthorized("Login required for this quiz")
+
+    if not quiz.live_mode:
+        return ResponseFormatter.error("Quiz is not in live mode")
+
+    return _event_stream(quiz_id, 'state', lambda: live_service.get_state(quiz))
+
+
+def _event_stream(quiz_id, first_event, first_data):
+    """SSE response relaying a quiz's hub events, opened with first_event carrying first_data()"""
+    hub = current_app.extensions['live_hub']
+    # Subscribe before reading the current data so an update in between is not missed
+    subscription = hub.subscribe(quiz_id)
+    first_frame = 'retry: 3000\n' + sse_frame(first_event, first_data())
+
+    # No stream_with_context: the generator only touches the hub, so the request's database
+    # session is released as soon as this view returns
+    response = Response(
+        hub.stream(subscription, first_frame, current_app.config['LIVE_HEARTBEAT_SECONDS']),
+        mimetype='text/event-stream'
+    )
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@bp.route('/<int:quiz_id>/live/advance', methods=['POST'])
+@token_required
+def advance_live_question(current_user, quiz_id):
+    """Open the next question, or question_index, for every participant (owner only)"""
+    quiz = quiz_service.get_quiz_by_id(quiz_id)
+    if not quiz:
+        return ResponseFormatter.not_found("Quiz")
+
+    if quiz.creator_id != current_user.id:
+        return ResponseFormatter.unauthorized("You don't have permission to host this quiz")
+
+    try:
+        data = LiveAdvanceSchema().load(request.get_json(silent=True) or {})
+    except ValidationError as err:
+        return ResponseFormatter.validation_error(err.messages)
+
+    try:
+        state, error = live_service.advance(quiz, data.get('question_index'))
+    except Exception as e:
+        logger.error(f"Error advancing live quiz: {str(e)}", exc_info=True)
+        return ResponseFormatter.server_error(f"Failed to advance live quiz: {str(e)}")
+
+    if error:
+        return ResponseFormatter.error(error)
+
+    return ResponseFormatter.success(
+        data=state,
+        message="Live question opened"
+    )
+
+
+@bp.route('/<int:quiz_id>/live/close', methods=['POST'])
+@token_required
+def close_live_question(current_user, quiz_id):
+    """Stop accepting answers to the open question (owner only)"""
+    quiz = quiz_service.get_quiz_by_id(quiz_id)
+    if not quiz:
+        return ResponseFormatter.not_found("Quiz")
+
+    if quiz.creator_id != current_user.id:
+        return ResponseFormatter.unauthorized("You don't have permission to host this quiz")
+
+    try:
+        state, error = live_service.close_question(quiz)
+    except Exception as e:
+        logger.error(f"Error closing live question: {str(e)}", exc_info=True)
+        return ResponseFormatter.server_error(f"Failed to close live question: {str(e)}")
+
+    if error:
+        return ResponseFormatter.error(error)
+
+    return ResponseFormatter.success(
+        data=state,
+        message="Live question closed"
+    )
+
+
+@bp.route('/<int:quiz_id>/survey-summary', methods=['GET'])
+@token_required
+def get_survey_summary(current_user, quiz_id):
+    """Per-question response counts and option tallies of a survey (owner only)"""
+    quiz = quiz_service.get_quiz_by_id(quiz_id)
+    if not quiz:
+        return ResponseFormatter.not_found("Quiz")
+
+    if quiz.creator_id != current_user.id:
+        return ResponseFormatter.unauthorized("You don't have permission to view results for this survey")
+
+    if not quiz.is_survey:
+        return ResponseFormatter.error("Quiz is not a survey")
+
+    return ResponseFormatter.success(
+        data=stats_service.survey_summary(quiz),
+        message="Survey summary retrieved successfully"
+    )
+
+
+@bp.route('/<int:quiz_id>/survey-summary/events', methods=['GET'])
+@token_required
+def survey_summary_events(current_user, quiz_id):
+    """Server-Sent Events: the survey summary on connect, then a 'survey' event as responses come in"""
+    quiz = quiz_service.get_quiz_by_id(quiz_id)
+    if not quiz:
+        return ResponseFormatter.not_found("Quiz")
+
+    if quiz.creator_id != current_user.id:
+        return ResponseFormatter.unauthorized("You don't have permission to view results for this survey")
+
+    if not quiz.is_survey:
+        return ResponseFormatter.error("Quiz is not a survey")
+
+    return _event_stream(quiz_id, 'survey', lambda: stats_service.survey_summary(quiz))
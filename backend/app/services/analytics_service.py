@@ -0,0 +1,200 @@
+import logging
+from collections import namedtuple
+
+import numpy as np
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models.attempt import Answer, Attempt, AttemptStatus
+from app.models.question import Question, QuestionType
+from app.services.archive_service import ArchiveService
+from app.utils.cache import LRUCache
+from app.utils.randomization import original_choices, seeded_permutation
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (10, 25, 50, 75, 90)
+HISTOGRAM_BINS = 10
+
+# Keyed by the quiz's submitted_count and content_version, so a new submission or a question
+# edit changes the key and stale reports simply age out of the LRU
+_analytics_cache = LRUCache(maxsize=256)
+
+# Shape of the joined attempt/answer rows, for answers read back from the archive
+_AnswerRow = namedtuple('_AnswerRow', 'id score seed shuffle_options archived_at question_id points_earned answer_text')
+
+
+def _number(value):
+    """JSON-safe float: NaN (undefined statistic) becomes None"""
+    value = float(value)
+    return None if np.isnan(value) else round(value, 4)
+
+
+class AnalyticsService:
+    def __init__(self):
+        self.archive_service = ArchiveService()
+
+    def get_quiz_analytics(self, quiz):
+        """Item analysis and score distribution over a quiz's submitted attempts"""
+
+        key = (quiz.id, quiz.created_at, quiz.submitted_count, quiz.content_version)
+        report = _analytics_cache.get(key)
+        if report is not None:
+            logger.debug(f"Analytics cache hit: quiz_id={quiz.id}")
+            return report
+
+        report = self._compute(quiz)
+        _analytics_cache.set(key, report)
+        return report
+
+    def _compute(self, quiz):
+        logger.info(f"📈 Computing analytics: quiz_id={quiz.id}")
+
+        questions = Question.query.filter_by(quiz_id=quiz.id).order_by(Question.order, Question.id).all()
+        question_index = {q.id: j for j, q in enumerate(questions)}
+        max_points = np.array([q.points for q in questions], dtype=float)
+
+        # One query: every submitted attempt with its answers (attempts with no answers still appear)
+        rows = db.session.execute(
+            select(
+                Attempt.id, Attempt.score, Attempt.seed, Attempt.shuffle_options, Attempt.archived_at,
+                Answer.question_id, Answer.points_earned, Answer.answer_text
+            ).outerjoin(Answer, Answer.attempt_id == Attempt.id).where(
+                Attempt.quiz_id == quiz.id,
+                Attempt.status == AttemptStatus.SUBMITTED
+            )
+        ).all()
+        if any(row.archived_at is not None for row in rows):
+            rows = self._with_archived_answers(quiz.id, rows)
+
+        if not rows:
+            return self._empty_report(quiz, questions)
+
+        attempt_ids = np.fromiter((row.id for row in rows), dtype=np.int64, count=len(rows))
+        attempt_keys, attempt_idx = np.unique(attempt_ids, return_inverse=True)
+        question_idx = np.fromiter(
+            (question_index.get(row.question_id, -1) for row in rows), dtype=np.int64, count=len(rows)
+        )
+        earned = np.fromiter(
+            (row.points_earned or 0.0 for row in rows), dtype=float, count=len(rows)
+        )
+
+        # attempts x questions matrices; answers to questions no longer in the quiz are dropped
+        present = question_idx >= 0
+        points = np.zeros((len(attempt_keys), len(questions)))
+        answered = np.zeros((len(attempt_keys), len(questions)), dtype=bool)
+        points[attempt_idx[present], question_idx[present]] = earned[present]
+        answered[attempt_idx[present], question_idx[present]] = True
+
+        scores = np.zeros(len(attempt_keys))
+        scores[attempt_idx] = np.fromiter((row.score or 0.0 for row in rows), dtype=float, count=len(rows))
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # Difficulty: mean fraction of the question's points earned (unanswered counts as 0)
+            item = np.where(max_points > 0, points / max_points, 0.0)
+            p_values = item.mean(axis=0)
+
+            # Discrimination: point-biserial correlation of the item with the rest of the test
+            rest = points.sum(axis=1, keepdims=True) - points
+            item_dev = item - item.mean(axis=0)
+            rest_dev = rest - rest.mean(axis=0)
+            discrimination = (item_dev * rest_dev).sum(axis=0) / np.sqrt(
+                (item_dev ** 2).sum(axis=0) * (rest_dev ** 2).sum(axis=0)
+            )
+
+        option_counts = self._option_counts(questions, question_index, rows)
+        total_possible = float(max_points.sum())
+
+        return {
+            'quiz_id': quiz.id,
+            'submitted_attempts': int(len(attempt_keys)),
+            'max_points': total_possible,
+            'score': self._score_summary(scores, total_possible),
+            'questions': [
+                {
+                    'question_id': q.id,
+                    'type': q.type,
+                    'points': q.points,
+                    'answered': int(answered[:, j].sum()),
+                    'mean_points': _number(points[:, j].mean()),
+                    'p_value': _number(p_values[j]),
+                    'discrimination': _number(discrimination[j]),
+                    **({'option_counts': option_counts[q.id]} if q.id in option_counts else {})
+                }
+                for j, q in enumerate(questions)
+            ]
+        }
+
+    def _with_archived_answers(self, quiz_id, rows):
+        """Replace the answerless rows of archived attempts with their archived answers"""
+        archived = self.archive_service.load(quiz_id)
+        expanded = []
+        for row in rows:
+            if row.archived_at is None:
+                expanded.append(row)
+                continue
+            answers = archived.get(row.id) or [{'question_id': None, 'points_earned': None, 'answer_text': None}]
+            expanded.extend(
+                _AnswerRow(row.id, row.score, row.seed, row.shuffle_options, row.archived_at,
+                           answer['question_id'], answer['points_earned'], answer['answer_text'])
+                for answer in answers
+            )
+        return expanded
+
+    @staticmethod
+    def _option_counts(questions, question_index, rows):
+        """Choice frequencies per MCQ option, in original option order"""
+        mcq = {q.id: len(q.get_options()) for q in questions if q.type == QuestionType.MCQ}
+        counts = {question_id: np.zeros(n, dtype=np.int64) for question_id, n in mcq.items()}
+
+        for row in rows:
+            n = mcq.get(row.question_id)
+            if not n or not row.answer_text:
+                continue
+            order = None
+            if row.shuffle_options and row.seed is not None:
+                order = seeded_permutation(row.seed, f"options:{row.question_id}", n)
+            choices = np.asarray(original_choices(row.answer_text, n, order), dtype=np.int64)
+            np.add.at(counts[row.question_id], choices, 1)
+
+        return {question_id: c.tolist() for question_id, c in counts.items()}
+
+    @staticmethod
+    def _score_summary(scores, total_possible):
+        upper = max(total_possible, float(scores.max()), 1.0)
+        histogram, edges = np.histogram(scores, bins=HISTOGRAM_BINS, range=(0.0, upper))
+        return {
+            'mean': _number(scores.mean()),
+            'std': _number(scores.std()),
+            'min': _number(scores.min()),
+            'max': _number(scores.max()),
+            'percentiles': {
+                f"p{p}": _number(value) for p, value in zip(PERCENTILES, np.percentile(scores, PERCENTILES))
+            },
+            'histogram': {
+                'bin_edges': [_number(edge) for edge in edges],
+                'counts': histogram.tolist()
+            }
+        }
+
+    @staticmethod
+    def _empty_report(quiz, questions):
+        return {
+            'quiz_id': quiz.id,
+            'submitted_attempts': 0,
+            'max_points': float(sum(q.points for q in questions)),
+            'score': None,
+            'questions': [
+                {
+                    'question_id': q.id,
+                    'type': q.type,
+                    'points': q.points,
+                    'answered': 0,
+                    'mean_points': None,
+                    'p_value': None,
+                    'discrimination': None,
+                    **({'option_counts': [0] * len(q.get_options())} if q.type == QuestionType.MCQ else {})
+                }
+                for q in questions
+            ]
+        }
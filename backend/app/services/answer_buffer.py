@@ -0,0 +1,284 @@
+"""
+Write-behind buffering for answer autosaves.
+
+When ANSWER_BUFFER is set, save_answer writes into a buffer and returns immediately. A background
+flusher coalesces repeated saves of the same question and writes them in one batched transaction
+per interval. Submitting an attempt force-flushes it first, so scoring always sees every answer.
+
+Answers are claimed per attempt while they are written: until their transaction commits they stay
+in the buffer (still visible to reads) and no one else can take the attempt's answers. Submit waits
+for a flush holding its attempt to finish, so it never scores without answers a flush is writing.
+
+Backends:
+    memory - in-process dict; only safe when the app runs as a single process
+    redis  - one hash per attempt plus a dirty set; shared across workers
+"""
+import atexit
+import logging
+import threading
+import time
+import uuid
+
+from app.extensions import db
+from app.models.attempt import Attempt, AttemptStatus
+
+logger = logging.getLogger(__name__)
+
+# How long a flush or submit may hold an attempt's answers before another process takes them over
+CLAIM_TIMEOUT_SECONDS = 30
+
+
+class MemoryAnswerBuffer:
+    def __init__(self):
+        self._pending = {}  # attempt_id -> {question_id: answer_text}
+        self._claimed = {}  # attempt_id -> answers taken by a flush or submit that has not committed yet
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+
+    def put(self, attempt_id, question_id, answer_text):
+        with self._lock:
+            self._pending.setdefault(attempt_id, {})[question_id] = answer_text
+
+    def pending(self, attempt_id):
+        with self._lock:
+            return {**self._claimed.get(attempt_id, {}), **self._pending.get(attempt_id, {})}
+
+    def _claim(self, attempt_id):
+        answers = {**self._claimed.get(attempt_id, {}), **self._pending.pop(attempt_id, {})}
+        self._claimed[attempt_id] = answers
+        return answers
+
+    def drain(self):
+        """Claim every unclaimed attempt's answers: {attempt_id: {question_id: answer_text}}"""
+        with self._lock:
+            drained = {}
+            for attempt_id in [attempt_id for attempt_id in self._pending if attempt_id not in self._claimed]:
+                drained[attempt_id] = self._claim(attempt_id)
+            return drained
+
+    def take(self, attempt_id, timeout=CLAIM_TIMEOUT_SECONDS):
+        """
+        Claim one attempt's answers for submit, first waiting for a flush that holds them. Returns
+        {attempt_id: answers}, possibly with empty answers; the claim must be acked or restored.
+        """
+        with self._lock:
+            if not self._released.wait_for(lambda: attempt_id not in self._claimed, timeout):
+                # The flush is stuck; take over its answers, which are still held here
+                logger.warning(f"⚠️ Answer flush still running, taking over its claim: attempt_id={attempt_id}")
+            return {attempt_id: self._claim(attempt_id)}
+
+    def ack(self, drained):
+        """Release claimed answers once they are committed"""
+        with self._lock:
+            for attempt_id in drained:
+                self._claimed.pop(attempt_id, None)
+            self._released.notify_all()
+
+    def restore(self, drained):
+        """Put back answers whose write failed, without clobbering newer saves"""
+        with self._lock:
+            for attempt_id, answers in drained.items():
+                self._claimed.pop(attempt_id, None)
+                current = self._pending.setdefault(attempt_id, {})
+                for question_id, answer_text in answers.items():
+                    current.setdefault(question_id, answer_text)
+                if not current:
+                    del self._pending[attempt_id]
+            self._released.notify_all()
+
+
+class RedisAnswerBuffer:
+    DIRTY_KEY = 'quickquiz:answers:dirty'
+
+    # Move an attempt's pending answers into its in-flight hash under a claim, unless another
+    # worker holds the claim. The in-flight hash outlives a crashed claimant, so its answers are
+    # picked up by whoever claims the attempt after the claim expires.
+    _CLAIM = """
+if redis.call('SET', KEYS[3], ARGV[1], 'NX', 'PX', ARGV[2]) == false then
+    return false
+end
+local pending = redis.call('HGETALL', KEYS[1])
+if #pending > 0 then
+    redis.call('HSET', KEYS[2], unpack(pending))
+    redis.call('DEL', KEYS[1])
+end
+return redis.call('HGETALL', KEYS[2])
+"""
+    # Release a claim, either dropping its committed answers or returning them to pending
+    _RELEASE = """
+if redis.call('GET', KEYS[3]) ~= ARGV[1] then
+    return 0
+end
+if ARGV[2] == 'restore' then
+    local inflight = redis.call('HGETALL', KEYS[2])
+    for i = 1, #inflight, 2 do
+        redis.call('HSETNX', KEYS[1], inflight[i], inflight[i + 1])
+    end
+    if #inflight > 0 then
+        redis.call('SADD', KEYS[4], ARGV[3])
+    end
+end
+redis.call('DEL', KEYS[2], KEYS[3])
+return 1
+"""
+
+    def __init__(self, url):
+        import redis
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+        self._claim_script = self._redis.register_script(self._CLAIM)
+        self._release_script = self._redis.register_script(self._RELEASE)
+        self._tokens = {}  # attempt_id -> token of the claim this process holds
+
+    @staticmethod
+    def _keys(attempt_id):
+        key = f"quickquiz:answers:{attempt_id}"
+        return [key, f"{key}:inflight", f"{key}:claim"]
+
+    def put(self, attempt_id, question_id, answer_text):
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.hset(self._keys(attempt_id)[0], question_id, answer_text)
+        pipe.sadd(self.DIRTY_KEY, attempt_id)
+        pipe.execute()
+
+    def pending(self, attempt_id):
+        pending_key, inflight_key, _ = self._keys(attempt_id)
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.hgetall(inflight_key)
+        pipe.hgetall(pending_key)
+        inflight, pending = pipe.execute()
+        return {int(qid): text for qid, text in {**inflight, **pending}.items()}
+
+    def _claim(self, attempt_id):
+        """The attempt's answers under a new claim, or None if another claimant holds it"""
+        token = uuid.uuid4().hex
+        answers = self._claim_script(keys=self._keys(attempt_id), args=[token, int(CLAIM_TIMEOUT_SECONDS * 1000)])
+        if answers is None:
+            return None
+        self._tokens[attempt_id] = token
+        return {int(answers[i]): answers[i + 1] for i in range(0, len(answers), 2)}
+
+    def drain(self):
+        drained = {}
+        busy = []
+        for raw_id in self._redis.spop(self.DIRTY_KEY, 1000) or []:
+            answers = self._claim(int(raw_id))
+            if answers is None:
+                busy.append(raw_id)  # being flushed or submitted elsewhere; look again next interval
+            elif answers:
+                drained[int(raw_id)] = answers
+            else:
+                self.ack({int(raw_id): {}})
+        if busy:
+            self._redis.sadd(self.DIRTY_KEY, *busy)
+        return drained
+
+    def take(self, attempt_id, timeout=CLAIM_TIMEOUT_SECONDS):
+        # A claim held by a crashed worker expires after CLAIM_TIMEOUT_SECONDS, so this ends in time
+        deadline = time.monotonic() + timeout + 1
+        while True:
+            answers = self._claim(attempt_id)
+            if answers is not None:
+                return {attempt_id: answers}
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Buffered answers of attempt {attempt_id} are still being flushed")
+            time.sleep(0.05)
+
+    def _release(self, drained, mode):
+        for attempt_id in drained:
+            token = self._tokens.pop(attempt_id, None)
+            if token is not None:
+                self._release_script(keys=self._keys(attempt_id) + [self.DIRTY_KEY], args=[token, mode, attempt_id])
+
+    def ack(self, drained):
+        self._release(drained, 'ack')
+
+    def restore(self, drained):
+        self._release(drained, 'restore')
+
+
+def write_answers(drained):
+    """Upsert drained answers for attempts that are still in progress. Does not commit."""
+    from app.services.attempt_service import upsert_answer_rows
+
+    drained = {attempt_id: answers for attempt_id, answers in drained.items() if answers}
+    if not drained:
+        return 0
+
+    open_ids = {
+        attempt_id for (attempt_id,) in db.session.query(Attempt.id).filter(
+            Attempt.id.in_(drained.keys()),
+            Attempt.status == AttemptStatus.IN_PROGRESS
+        )
+    }
+    dropped = set(drained) - open_ids
+    if dropped:
+        # Saves accepted while their attempt was being submitted; submit scored what it had claimed
+        logger.warning(f"⚠️ Dropping answers saved during submit: attempt_ids={sorted(dropped)}")
+
+    rows = [
+        {'attempt_id': attempt_id, 'question_id': question_id, 'answer_text': answer_text}
+        for attempt_id in open_ids
+        for question_id, answer_text in drained[attempt_id].items()
+    ]
+    if rows:
+        upsert_answer_rows(rows)
+    return len(rows)
+
+
+class AnswerFlusher:
+    """Daemon thread that periodically drains the buffer into the database"""
+
+    def __init__(self, app, buffer, interval):
+        self.app = app
+        self.buffer = buffer
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='answer-flusher', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        self._stop.set()
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def flush(self):
+        with self.app.app_context():
+            drained = self.buffer.drain()
+            if not drained:
+                return
+            try:
+                written = write_answers(drained)
+                db.session.commit()
+                self.buffer.ack(drained)
+                logger.debug(f"Flushed {written} buffered answer(s) for {len(drained)} attempt(s)")
+            except Exception as e:
+                logger.error(f"💥 Answer flush failed, re-queueing: error={str(e)}", exc_info=True)
+                db.session.rollback()
+                self.buffer.restore(drained)
+            finally:
+                db.session.remove()
+
+
+def init_app(app):
+    """Create the configured buffer and start its flusher; no-op when ANSWER_BUFFER is unset"""
+    mode = app.config.get('ANSWER_BUFFER')
+    if not mode:
+        return None
+
+    if mode == 'memory':
+        buffer = MemoryAnswerBuffer()
+    elif mode == 'redis':
+        buffer = RedisAnswerBuffer(app.config['REDIS_URL'])
+    else:
+        raise ValueError(f"Unknown ANSWER_BUFFER mode: {mode}")
+
+    app.extensions['answer_buffer'] = buffer
+    AnswerFlusher(app, buffer, app.config['ANSWER_FLUSH_INTERVAL_MS'] / 1000.0).start()
+    logger.info(f"Answer write-behind enabled: mode={mode}, interval={app.config['ANSWER_FLUSH_INTERVAL_MS']}ms")
+    return buffer
@@ -0,0 +1,250 @@
+"""
+Cold storage for the answers of finished quizzes.
+
+`flask attempts archive` moves the answers of submitted attempts into one gzip-compressed JSON Lines
+file per quiz (ARCHIVE_DIR/quiz-<id>.jsonl.gz) and marks the attempts archived_at. Attempt rows stay:
+they are one per participant and carry everything lists, leaderboards and statistics read, while
+answers grow by questions x attempts. Readers that need an archived attempt's answers load them back
+through ArchiveService, so results, exports and analytics are unchanged.
+
+A file holds one line per attempt, sorted by attempt id, so bulk readers stream it alongside an
+attempts query ordered by id instead of loading it. A batch whose ids all follow the file's last
+line is appended as a new gzip member. Otherwise (a late submitter, or attempts whose earlier
+archive run was interrupted) the file is rewritten with the batch merged in. The new line replaces
+an existing line for the same attempt. Lines are on disk before their answers are deleted, so an
+interrupted run leaves the answers in the database.
+"""
+import gzip
+import heapq
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, select, update
+
+from app.extensions import db
+from app.models.attempt import Answer, Attempt, AttemptStatus
+from app.utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_BATCH_SIZE = 1000
+
+# Keyed by the file's size and mtime, so an archive run invalidates its quiz's entry
+_archive_cache = LRUCache(maxsize=32)
+# path -> (size, mtime_ns, last attempt id), so consecutive batches do not rescan the file
+_last_ids = LRUCache(maxsize=256)
+
+
+def archive_path(quiz_id):
+    return os.path.join(current_app.config['ARCHIVE_DIR'], f"quiz-{quiz_id}.jsonl.gz")
+
+
+def _iter_file(path):
+    """(attempt_id, answers) per line of an archive file, in file (attempt id) order"""
+    try:
+        archive = gzip.open(path, 'rt', encoding='utf-8')
+    except FileNotFoundError:
+        return
+    with archive:
+        for line in archive:
+            record = json.loads(line)
+            yield record['attempt_id'], record['answers']
+
+
+def _stat_key(path):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _write_lines(archive, records):
+    for attempt_id, answers in records:
+        line = json.dumps({'attempt_id': attempt_id, 'answers': answers}, separators=(',', ':'))
+        archive.write(line.encode('utf-8') + b'\n')
+
+
+class ArchiveReader:
+    """
+    A quiz's archived answers for attempt ids requested in ascending order. The file is read once,
+    alongside the caller's ordered query, holding a single line in memory.
+    """
+
+    def __init__(self, quiz_id):
+        self._records = _iter_file(archive_path(quiz_id))
+        self._current = None
+        self._started = False
+
+    def answers(self, attempt_id):
+        if not self._started:
+            self._current, self._started = next(self._records, None), True
+        while self._current is not None and self._current[0] < attempt_id:
+            self._current = next(self._records, None)
+        if self._current is not None and self._current[0] == attempt_id:
+            return self._current[1]
+        return []
+
+
+class ArchiveService:
+    def archive(self, older_than_days, quiz_id=None):
+        """
+        Archive the answers of attempts submitted more than older_than_days ago, for quizzes no one
+        has started an attempt on since then.
+
+        Returns:
+            (number of quizzes, number of attempts) archived
+        """
+
+        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+        logger.info(f"🗄️ Archiving attempts: cutoff={cutoff.isoformat()}, quiz_id={quiz_id}")
+
+        still_active = select(Attempt.quiz_id).where(Attempt.started_at >= cutoff)
+        eligible = [
+            Attempt.status == AttemptStatus.SUBMITTED,
+            Attempt.archived_at.is_(None),
+            Attempt.submitted_at < cutoff,
+            Attempt.quiz_id.not_in(still_active)
+        ]
+        if quiz_id is not None:
+            eligible.append(Attempt.quiz_id == quiz_id)
+
+        quiz_ids = db.session.scalars(select(Attempt.quiz_id).where(*eligible).distinct()).all()
+        os.makedirs(current_app.config['ARCHIVE_DIR'], exist_ok=True)
+
+        archived = 0
+        for qid in quiz_ids:
+            while True:
+                attempt_ids = db.session.scalars(
+                    select(Attempt.id).where(*eligible, Attempt.quiz_id == qid)
+                    .order_by(Attempt.id).limit(ARCHIVE_BATCH_SIZE)
+                ).all()
+                if not attempt_ids:
+                    break
+                archived += self._archive_batch(qid, attempt_ids)
+
+        logger.info(f"✅ Archived {archived} attempt(s) across {len(quiz_ids)} quiz(es)")
+        return len(quiz_ids), archived
+
+    def _archive_batch(self, quiz_id, attempt_ids):
+        answers = {attempt_id: [] for attempt_id in attempt_ids}
+        for answer in db.session.scalars(
+            select(Answer).where(Answer.attempt_id.in_(attempt_ids)).order_by(Answer.attempt_id, Answer.id)
+        ):
+            answers[answer.attempt_id].append(answer.to_dict())
+
+        # Durable on disk before the rows are deleted
+        self._write(quiz_id, sorted(answers.items()))
+
+        try:
+            db.session.execute(delete(Answer).where(Answer.attempt_id.in_(attempt_ids)),
+                               execution_options={'synchronize_session': False})
+            db.session.execute(update(Attempt).where(Attempt.id.in_(attempt_ids)).values(
+                archived_at=datetime.utcnow()
+            ), execution_options={'synchronize_session': False})
+            db.session.commit()
+            db.session.expire_all()
+            logger.info(f"Archived {len(attempt_ids)} attempt(s): quiz_id={quiz_id}")
+            return len(attempt_ids)
+        except Exception as e:
+            logger.error(f"💥 Archive batch failed: quiz_id={quiz_id}, error={str(e)}", exc_info=True)
+            db.session.rollback()
+            raise
+
+    def _write(self, quiz_id, records):
+        """Add (attempt_id, answers) records, sorted by attempt id, keeping the file sorted"""
+        path = archive_path(quiz_id)
+        last_id = self._last_attempt_id(path)
+        if last_id is None or records[0][0] > last_id:
+            with open(path, 'ab') as raw:
+                with gzip.GzipFile(fileobj=raw, mode='wb') as archive:
+                    _write_lines(archive, records)
+                raw.flush()
+                os.fsync(raw.fileno())
+        else:
+            # Merge into a copy and swap it in, so a crash leaves either the old or the new file
+            logger.info(f"Rewriting archive to merge out-of-order attempts: quiz_id={quiz_id}")
+            new_ids = {attempt_id for attempt_id, _ in records}
+            existing = ((attempt_id, answers) for attempt_id, answers in _iter_file(path) if attempt_id not in new_ids)
+            with open(path + '.tmp', 'wb') as raw:
+                with gzip.GzipFile(fileobj=raw, mode='wb') as archive:
+                    _write_lines(archive, heapq.merge(existing, records, key=lambda record: record[0]))
+                raw.flush()
+                os.fsync(raw.fileno())
+            os.replace(path + '.tmp', path)
+        _last_ids.set(path, (*_stat_key(path), max(records[-1][0], last_id or 0)))
+
+    @staticmethod
+    def _last_attempt_id(path):
+        try:
+            key = _stat_key(path)
+        except FileNotFoundError:
+            return None
+        cached = _last_ids.get(path)
+        if cached is not None and cached[:2] == key:
+            return cached[2]
+        last_id = None
+        for last_id, _ in _iter_file(path):
+            pass
+        _last_ids.set(path, (*key, last_id))
+        return last_id
+
+    def iter_archived_attempts(self, quiz_id, *columns):
+        """
+        (row, answers) for each archived attempt of a quiz, in id order, streaming the archive file
+        alongside the attempts query. row holds Attempt.id and the requested columns.
+        """
+        reader = ArchiveReader(quiz_id)
+        rows = db.session.execute(
+            select(Attempt.id, *columns).where(Attempt.quiz_id == quiz_id, Attempt.archived_at.isnot(None))
+            .order_by(Attempt.id),
+            execution_options={'yield_per': ARCHIVE_BATCH_SIZE}
+        )
+        for row in rows:
+            yield row, reader.answers(row.id)
+
+    @staticmethod
+    def archived_quiz_ids(quiz_id=None):
+        """Quizzes with archived attempts, optionally just quiz_id"""
+        stmt = select(Attempt.quiz_id).where(Attempt.archived_at.isnot(None)).distinct()
+        if quiz_id is not None:
+            stmt = stmt.where(Attempt.quiz_id == quiz_id)
+        return db.session.scalars(stmt).all()
+
+    def load(self, quiz_id):
+        """
+        {attempt_id: [answer dicts]} for a quiz's archived attempts (empty if it has no archive).
+        Holds the whole file in memory; readers that walk every attempt use ArchiveReader instead.
+        """
+        path = archive_path(quiz_id)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return {}
+
+        key = (quiz_id, stat.st_size, stat.st_mtime_ns)
+        archived = _archive_cache.get(key)
+        if archived is None:
+            archived = dict(_iter_file(path))
+            _archive_cache.set(key, archived)
+            logger.debug(f"Loaded archive: quiz_id={quiz_id}, attempts={len(archived)}")
+        return archived
+
+    def answers(self, quiz_id, attempt_id):
+        """An archived attempt's answers, as Answer.to_dict() dicts"""
+        return self.load(quiz_id).get(attempt_id, [])
+
+    def attempt_dict(self, attempt, include_answers=True):
+        """attempt.to_dict(), reading the answers from the archive once the attempt is archived"""
+        data = attempt.to_dict(include_answers=include_answers)
+        if include_answers and attempt.archived_at is not None:
+            data['answers'] = self.answers(attempt.quiz_id, attempt.id)
+        return data
+
+    def forget_quiz(self, quiz_id):
+        """Remove a deleted quiz's archive file"""
+        try:
+            os.remove(archive_path(quiz_id))
+            logger.info(f"🗑️ Removed archive: quiz_id={quiz_id}")
+        except FileNotFoundError:
+            pass
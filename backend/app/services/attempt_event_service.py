@@ -0,0 +1,225 @@
+"""
+Anti-cheating telemetry.
+
+Event batches posted by participants' browsers are appended to an in-process buffer. A background
+writer drains it every ATTEMPT_EVENT_FLUSH_INTERVAL_MS (sooner once ATTEMPT_EVENT_FLUSH_SIZE events
+are waiting): one bulk INSERT into attempt_events plus counter upserts for the per-type and
+per-window counts, in a single transaction. Thousands of events per second therefore cost a few
+commits per second, not one per event.
+
+Events are append-only and need no coalescing, so every worker buffers its own; no shared store is
+needed. A worker that is killed loses at most its unflushed events.
+"""
+import atexit
+import logging
+import threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy import func, insert, select
+
+from app.extensions import db
+from app.models.attempt import Attempt, AttemptStatus
+from app.models.attempt_event import (SUSPICIOUS_EVENTS_PER_WINDOW, SUSPICIOUS_WINDOW_SECONDS, AttemptEvent,
+                                      AttemptEventCount, AttemptEventWindow)
+from app.models.quiz import QuizSettings
+from app.utils.upsert import increment_counters
+
+logger = logging.getLogger(__name__)
+
+BUFFER_FULL_ERROR = "Too many events queued, retry later"
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _window_index(occurred_at):
+    return int((occurred_at - _EPOCH).total_seconds()) // SUSPICIOUS_WINDOW_SECONDS
+
+
+def write_events(rows):
+    """Append event rows and fold them into the per-type and per-window counters. Does not commit."""
+    # Attempts deleted since their events were queued would fail the whole batch on the foreign key
+    existing = set(db.session.scalars(
+        select(Attempt.id).where(Attempt.id.in_({row['attempt_id'] for row in rows}))
+    )) if rows else set()
+    rows = [row for row in rows if row['attempt_id'] in existing]
+    if not rows:
+        return 0
+    db.session.execute(insert(AttemptEvent), rows)
+    increment_counters(AttemptEventCount, ['attempt_id', 'type'], ['count'], [
+        {'attempt_id': attempt_id, 'type': event_type, 'count': count}
+        for (attempt_id, event_type), count in Counter((row['attempt_id'], row['type']) for row in rows).items()
+    ])
+    increment_counters(AttemptEventWindow, ['attempt_id', 'window_index'], ['count'], [
+        {'attempt_id': attempt_id, 'window_index': window_index, 'count': count}
+        for (attempt_id, window_index), count in Counter(
+            (row['attempt_id'], _window_index(row['occurred_at'])) for row in rows
+        ).items()
+    ])
+    return len(rows)
+
+
+class AttemptEventWriter:
+    """Bounded in-process event buffer drained by a daemon thread, started on first use"""
+
+    def __init__(self, app, interval, flush_size, max_size):
+        self.app = app
+        self.interval = interval
+        self.flush_size = flush_size
+        self.max_size = max_size
+        self._rows = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def put(self, rows):
+        """Queue event rows; returns False without queuing any if the buffer is full"""
+        with self._lock:
+            if len(self._rows) + len(rows) > self.max_size:
+                return False
+            self._rows.extend(rows)
+            backlog = len(self._rows)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='attempt-event-writer', daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+        if backlog >= self.flush_size:
+            self._wake.set()
+        return True
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            rows, self._rows = self._rows, []
+        if not rows:
+            return
+        with self.app.app_context():
+            try:
+                written = write_events(rows)
+                db.session.commit()
+                logger.debug(f"Wrote {written} attempt event(s)")
+            except Exception as e:
+                logger.error(f"💥 Attempt event write failed, re-queueing: error={str(e)}", exc_info=True)
+                db.session.rollback()
+                with self._lock:
+                    # Keep the oldest events if the buffer refilled meanwhile
+                    self._rows[:0] = rows[:max(self.max_size - len(self._rows), 0)]
+            finally:
+                db.session.remove()
+
+
+class AttemptEventService:
+    def record_events(self, attempt_id, events):
+        """
+        Queue a batch of client telemetry events for an attempt.
+
+        Args:
+            attempt_id: Attempt the events belong to
+            events: Iterable of dicts with type and timestamp (datetime)
+
+        Returns:
+            (number of events accepted, error)
+        """
+
+        logger.debug(f"Recording attempt events: attempt_id={attempt_id}, count={len(events)}")
+
+        # One lookup covers the attempt state and the quiz setting
+        row = db.session.execute(
+            select(Attempt.status, Attempt.started_at, Attempt.submitted_at, QuizSettings.enable_anti_cheating)
+            .outerjoin(QuizSettings, QuizSettings.quiz_id == Attempt.quiz_id)
+            .where(Attempt.id == attempt_id)
+        ).one_or_none()
+        if row is None:
+            logger.warning(f"⚠️ Event batch rejected: Attempt not found, attempt_id={attempt_id}")
+            return None, "Attempt not found"
+
+        if not row.enable_anti_cheating:
+            logger.warning(f"⚠️ Event batch rejected: Anti-cheating disabled, attempt_id={attempt_id}")
+            return None, "Anti-cheating is not enabled for this quiz"
+
+        now = datetime.utcnow()
+        if row.status == AttemptStatus.SUBMITTED:
+            # The browser's last batch may land just after the submit request
+            grace = timedelta(seconds=current_app.config['ATTEMPT_GRACE_SECONDS'])
+            if not row.submitted_at or now - row.submitted_at > grace:
+                logger.warning(f"⚠️ Event batch rejected: Attempt already submitted, attempt_id={attempt_id}")
+                return None, "Cannot record events for a submitted attempt"
+
+        rows = []
+        for event in events:
+            occurred_at = event['timestamp']
+            if occurred_at.tzinfo is not None:
+                occurred_at = occurred_at.astimezone(timezone.utc).replace(tzinfo=None)
+            # Client clocks drift; keep events inside the attempt's lifetime
+            occurred_at = min(max(occurred_at, row.started_at), now)
+            rows.append({'attempt_id': attempt_id, 'type': event['type'], 'occurred_at': occurred_at,
+                         'received_at': now})
+
+        if not current_app.extensions['attempt_events'].put(rows):
+            logger.warning(f"⚠️ Event batch rejected: Buffer full, attempt_id={attempt_id}, count={len(rows)}")
+            return None, BUFFER_FULL_ERROR
+        return len(rows), None
+
+    def summaries(self, attempt_ids):
+        """
+        Per-attempt telemetry summary from the running counters:
+        {attempt_id: {event_count, counts: {type: n}, suspicious_intervals, flagged}}
+        """
+        attempt_ids = list(attempt_ids)
+        summaries = {
+            attempt_id: {'event_count': 0, 'counts': {}, 'suspicious_intervals': 0, 'flagged': False}
+            for attempt_id in attempt_ids
+        }
+        if not attempt_ids:
+            return summaries
+
+        for attempt_id, event_type, count in db.session.execute(
+            select(AttemptEventCount.attempt_id, AttemptEventCount.type, AttemptEventCount.count)
+            .where(AttemptEventCount.attempt_id.in_(attempt_ids))
+        ):
+            summaries[attempt_id]['counts'][event_type] = count
+            summaries[attempt_id]['event_count'] += count
+
+        for attempt_id, windows in db.session.execute(
+            select(AttemptEventWindow.attempt_id, func.count())
+            .where(AttemptEventWindow.attempt_id.in_(attempt_ids),
+                   AttemptEventWindow.count >= SUSPICIOUS_EVENTS_PER_WINDOW)
+            .group_by(AttemptEventWindow.attempt_id)
+        ):
+            summaries[attempt_id]['suspicious_intervals'] = windows
+            summaries[attempt_id]['flagged'] = True
+        return summaries
+
+    def with_summaries(self, attempts, batch_size):
+        """Add an 'anti_cheating' summary to each attempt dict of a stream, one lookup per batch"""
+        batch = []
+        for attempt in attempts:
+            batch.append(attempt)
+            if len(batch) >= batch_size:
+                yield from self._attach(batch)
+                batch = []
+        yield from self._attach(batch)
+
+    def _attach(self, attempts):
+        summaries = self.summaries(attempt['id'] for attempt in attempts)
+        for attempt in attempts:
+            attempt['anti_cheating'] = summaries[attempt['id']]
+        return attempts
+
+
+def init_app(app):
+    """Create the event writer; its thread starts with the first event"""
+    writer = AttemptEventWriter(
+        app,
+        interval=app.config['ATTEMPT_EVENT_FLUSH_INTERVAL_MS'] / 1000.0,
+        flush_size=app.config['ATTEMPT_EVENT_FLUSH_SIZE'],
+        max_size=app.config['ATTEMPT_EVENT_BUFFER_SIZE']
+    )
+    app.extensions['attempt_events'] = writer
+    return writer
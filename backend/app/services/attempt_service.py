@@ -1,13 +1,66 @@
+import json
 import logging
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 
 from app.extensions import db
 from app.models.attempt import Attempt, Answer, AttemptStatus
+from app.models.question import QuestionType
 from app.models.quiz import Quiz
+from app.services.archive_service import ArchiveService
+from app.services.live_service import LiveService
+from app.services.quiz_stats_service import QuizStatsService
+from app.services.snapshot_service import SnapshotService
+from app.utils.pagination import DEFAULT_PAGE_SIZE, keyset_paginate
+from app.utils.randomization import invert, new_seed
+from app.utils.upsert import UPSERT_INSERTS
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round trip when streaming full attempt listings
+STREAM_BATCH_SIZE = 500
+
+
+def _answer_upsert(dialect_name, rows):
+    """Build an INSERT ... ON CONFLICT/DUPLICATE KEY UPDATE for answer rows, or None if unsupported"""
+    # Conflict target is the (attempt_id, question_id) unique index
+    insert = UPSERT_INSERTS.get(dialect_name)
+    if insert is None:
+        return None
+    stmt = insert(Answer).values(rows)
+    if dialect_name in ('mysql', 'mariadb'):
+        return stmt.on_duplicate_key_update(answer_text=stmt.inserted.answer_text)
+    return stmt.on_conflict_do_update(
+        index_elements=[Answer.attempt_id, Answer.question_id],
+        set_={'answer_text': stmt.excluded.answer_text}
+    )
+
+
+def upsert_answer_rows(rows):
+    """Insert or update answer rows ({attempt_id, question_id, answer_text}) in the current transaction"""
+    stmt = _answer_upsert(db.session.get_bind().dialect.name, rows)
+    if stmt is not None:
+        db.session.execute(stmt)
+        return
+
+    for row in rows:
+        answer = Answer.query.filter_by(attempt_id=row['attempt_id'], question_id=row['question_id']).first()
+        if answer:
+            answer.answer_text = row['answer_text']
+        else:
+            db.session.add(Answer(**row))
+
 
 class AttemptService:
+    def __init__(self):
+        self.stats_service = QuizStatsService()
+        self.snapshot_service = SnapshotService()
+        self.live_service = LiveService()
+        self.archive_service = ArchiveService()
+
     def start_attempt(self, quiz_id, user_id=None, participant_name=None, participant_info=None):
         """Start a new attempt"""
 
@@ -24,11 +77,23 @@ class AttemptService:
             return None, "Login required for this quiz"
 
         try:
+            # Pin the attempt to the current question set so later edits can't change it mid-exam
+            snapshot = self.snapshot_service.get_current(quiz)
+            settings = quiz.settings
+            started_at = datetime.utcnow()
+            time_limit = settings.time_limit if settings else None
+
             attempt = Attempt(
                 quiz_id=quiz_id,
                 user_id=user_id,
                 participant_name=participant_name,
-                status=AttemptStatus.IN_PROGRESS
+                status=AttemptStatus.IN_PROGRESS,
+                started_at=started_at,
+                deadline=started_at + timedelta(minutes=time_limit) if time_limit else None,
+                snapshot_id=snapshot.id,
+                seed=new_seed(),
+                shuffle_questions=bool(settings and settings.randomize_question_order),
+                shuffle_options=bool(settings and settings.randomize_answer_options)
             )
 
             if participant_info:
@@ -36,21 +101,42 @@ class AttemptService:
                 logger.debug(f"Set participant info for attempt")
 
             db.session.add(attempt)
+            self.stats_service.attempt_started(quiz_id)
             db.session.commit()
 
-            logger.info(f"✅ Attempt started successfully: attempt_id={attempt.id}, quiz_id={quiz_id}")
+            logger.info(f"✅ Attempt started successfully: attempt_id={attempt.id}, quiz_id={quiz_id}, "
+                        f"snapshot_id={snapshot.id}, deadline={attempt.deadline}")
+
+            scheduler = current_app.extensions.get('deadline_scheduler')
+            if scheduler and attempt.deadline:
+                scheduler.schedule(attempt.id, attempt.deadline)
             return attempt, None
         except Exception as e:
             logger.error(f"💥 Attempt start failed: quiz_id={quiz_id}, error={str(e)}", exc_info=True)
             db.session.rollback()
             raise
 
+    @staticmethod
+    def _get_with_live_state(attempt_id):
+        """
+        The attempt and its quiz's live state (live_mode, live_question_id, live_question_open) in
+        one query, for the answer save paths. Returns (None, None) if the attempt does not exist.
+        """
+        row = db.session.execute(
+            select(Attempt, Quiz.live_mode, Quiz.live_question_id, Quiz.live_question_open)
+            .join(Quiz, Quiz.id == Attempt.quiz_id)
+            .where(Attempt.id == attempt_id)
+        ).one_or_none()
+        if row is None:
+            return None, None
+        return row.Attempt, row
+
     def save_answer(self, attempt_id, question_id, answer_text):
         """Save or update an answer"""
 
         logger.info(f"💾 Saving answer: attempt_id={attempt_id}, question_id={question_id}")
 
-        attempt = Attempt.query.get(attempt_id)
+        attempt, live = self._get_with_live_state(attempt_id)
         if not attempt:
             logger.warning(f"⚠️ Answer save failed: Attempt not found, attempt_id={attempt_id}")
             return None, "Attempt not found"
@@ -59,27 +145,65 @@ class AttemptService:
             logger.warning(f"⚠️ Answer save failed: Attempt already submitted, attempt_id={attempt_id}")
             return None, "Cannot modify submitted attempt"
 
+        if attempt.is_expired(current_app.config['ATTEMPT_GRACE_SECONDS']):
+            logger.warning(f"⚠️ Answer save failed: Time limit exceeded, attempt_id={attempt_id}, deadline={attempt.deadline}")
+            return None, "Time limit exceeded"
+
+        is_live = live.live_mode
+        if is_live:
+            error = self.live_service.check_answers(live, [question_id])
+            if error:
+                logger.warning(f"⚠️ Answer save failed: {error}, attempt_id={attempt_id}, question_id={question_id}")
+                return None, error
+
+        buffer = current_app.extensions.get('answer_buffer')
+        if buffer:
+            # Write-behind: acknowledge now, the flusher persists it with the next batch
+            buffer.put(attempt_id, question_id, answer_text)
+            logger.debug(f"Answer buffered: attempt_id={attempt_id}, question_id={question_id}")
+            if is_live:
+                self.live_service.record_answers(attempt, {question_id: answer_text})
+            return Answer(attempt_id=attempt_id, question_id=question_id, answer_text=answer_text), None
+
         try:
-            # Check if answer already exists
-            answer = Answer.query.filter_by(
-                attempt_id=attempt_id,
-                question_id=question_id
-            ).first()
-
-            if answer:
-                logger.debug(f"Updating existing answer: answer_id={answer.id}")
-                answer.answer_text = answer_text
+            dialect_name = db.session.get_bind().dialect.name
+            stmt = _answer_upsert(dialect_name, [{
+                'attempt_id': attempt_id,
+                'question_id': question_id,
+                'answer_text': answer_text
+            }])
+
+            if stmt is not None and dialect_name not in ('mysql', 'mariadb'):
+                # One indexed statement; RETURNING hands back the row as an ORM object
+                answer = db.session.scalars(
+                    stmt.returning(Answer),
+                    execution_options={'populate_existing': True}
+                ).one()
+                # Already written; detach so commit doesn't expire it and force a refresh SELECT
+                db.session.expunge(answer)
             else:
-                logger.debug(f"Creating new answer")
-                answer = Answer(
+                # Fallback for dialects without INSERT ... RETURNING on upserts
+                answer = Answer.query.filter_by(
                     attempt_id=attempt_id,
-                    question_id=question_id,
-                    answer_text=answer_text
-                )
-                db.session.add(answer)
+                    question_id=question_id
+                ).first()
+
+                if answer:
+                    logger.debug(f"Updating existing answer: answer_id={answer.id}")
+                    answer.answer_text = answer_text
+                else:
+                    logger.debug(f"Creating new answer")
+                    answer = Answer(
+                        attempt_id=attempt_id,
+                        question_id=question_id,
+                        answer_text=answer_text
+                    )
+                    db.session.add(answer)
 
             db.session.commit()
             logger.info(f"✅ Answer saved successfully: answer_id={answer.id}, attempt_id={attempt_id}")
+            if is_live:
+                self.live_service.record_answers(attempt, {question_id: answer_text})
             return answer, None
         except Exception as e:
             logger.error(f"💥 Answer save failed: attempt_id={attempt_id}, question_id={question_id}, error={str(e)}",
@@ -87,6 +211,102 @@ class AttemptService:
             db.session.rollback()
             raise
 
+    def save_answers(self, attempt_id, answers):
+        """Save or update many answers for an attempt in a single transaction"""
+
+        logger.info(f"💾 Saving answer batch: attempt_id={attempt_id}, count={len(answers)}")
+
+        attempt, live = self._get_with_live_state(attempt_id)
+        if not attempt:
+            logger.warning(f"⚠️ Answer batch failed: Attempt not found, attempt_id={attempt_id}")
+            return None, "Attempt not found"
+
+        if attempt.status == AttemptStatus.SUBMITTED:
+            logger.warning(f"⚠️ Answer batch failed: Attempt already submitted, attempt_id={attempt_id}")
+            return None, "Cannot modify submitted attempt"
+
+        if attempt.is_expired(current_app.config['ATTEMPT_GRACE_SECONDS']):
+            logger.warning(f"⚠️ Answer batch failed: Time limit exceeded, attempt_id={attempt_id}, deadline={attempt.deadline}")
+            return None, "Time limit exceeded"
+
+        # Last write wins when the same question appears more than once
+        texts = {item['question_id']: item['answer_text'] for item in answers}
+
+        is_live = live.live_mode
+        if is_live:
+            error = self.live_service.check_answers(live, texts.keys())
+            if error:
+                logger.warning(f"⚠️ Answer batch failed: {error}, attempt_id={attempt_id}")
+                return None, error
+
+        buffer = current_app.extensions.get('answer_buffer')
+        if buffer:
+            for question_id, text in texts.items():
+                buffer.put(attempt_id, question_id, text)
+            logger.debug(f"Answer batch buffered: attempt_id={attempt_id}, count={len(texts)}")
+            if is_live:
+                self.live_service.record_answers(attempt, texts)
+            return sorted(texts.keys()), None
+
+        try:
+            upsert_answer_rows([
+                {'attempt_id': attempt_id, 'question_id': question_id, 'answer_text': text}
+                for question_id, text in texts.items()
+            ])
+            db.session.commit()
+            logger.info(f"✅ Answer batch saved: attempt_id={attempt_id}, count={len(texts)}")
+            if is_live:
+                self.live_service.record_answers(attempt, texts)
+            return sorted(texts.keys()), None
+        except Exception as e:
+            logger.error(f"💥 Answer batch failed: attempt_id={attempt_id}, error={str(e)}", exc_info=True)
+            db.session.rollback()
+            raise
+
+    def pending_answers(self, attempt_id):
+        """Answers accepted by the write-behind buffer but not yet flushed: {question_id: answer_text}"""
+        buffer = current_app.extensions.get('answer_buffer')
+        return buffer.pending(attempt_id) if buffer else {}
+
+    def merge_pending_answers(self, attempt_id, answers):
+        """Overlay buffered answers onto a list of Answer.to_dict() results"""
+        pending = self.pending_answers(attempt_id)
+        if not pending:
+            return answers
+
+        merged = []
+        for answer in answers:
+            if answer['question_id'] in pending:
+                answer = {**answer, 'answer_text': pending.pop(answer['question_id'])}
+            merged.append(answer)
+        merged.extend(
+            Answer(attempt_id=attempt_id, question_id=question_id, answer_text=answer_text).to_dict()
+            for question_id, answer_text in pending.items()
+        )
+        return merged
+
+    def flush_answers(self, attempt_id):
+        """Force-flush an attempt's buffered answers to the database and commit"""
+        buffer = current_app.extensions.get('answer_buffer')
+        if not buffer:
+            return 0
+
+        from app.services.answer_buffer import write_answers
+
+        # Waits for a background flush that holds this attempt's answers to commit first
+        drained = buffer.take(attempt_id)
+        try:
+            written = write_answers(drained)
+            db.session.commit()
+            buffer.ack(drained)
+            logger.info(f"✅ Flushed {written} buffered answer(s): attempt_id={attempt_id}")
+            return written
+        except Exception as e:
+            logger.error(f"💥 Buffered answer flush failed: attempt_id={attempt_id}, error={str(e)}", exc_info=True)
+            db.session.rollback()
+            buffer.restore(drained)
+            raise
+
     def update_attempt(self, attempt_id, participant_name=None, participant_info=None):
         """Update attempt metadata"""
 
@@ -132,30 +352,118 @@ class AttemptService:
             logger.warning(f"⚠️ Attempt not found: attempt_id={attempt_id}")
         return attempt
 
-    def get_quiz_attempts(self, quiz_id, user_id=None):
-        """Get all attempts for a quiz (owner only)"""
-
-        logger.debug(f"🔍 Fetching attempts for quiz: quiz_id={quiz_id}, user_id={user_id}")
+    def get_attempt_questions_json(self, attempt):
+        """
+        Serialized questions for an attempt, in the order this participant sees them.
+        MCQ options are permuted per the attempt seed and correct_answer is remapped to match,
+        so submitted option indices refer to display positions.
+        Returns None for legacy attempts without a snapshot.
+        """
+
+        snapshot = self.snapshot_service.get_by_id(attempt.snapshot_id) if attempt.snapshot_id else None
+        if not snapshot:
+            return None
+
+        if not attempt.shuffle_questions and not attempt.shuffle_options:
+            return snapshot.questions_json
+
+        questions = snapshot.questions
+        question_order = attempt.question_order(len(questions))
+        if question_order:
+            questions = [questions[i] for i in question_order]
+
+        if attempt.shuffle_options:
+            permuted = []
+            for question in questions:
+                options = question.get('options') or []
+                if question['type'] != QuestionType.MCQ or len(options) < 2:
+                    permuted.append(question)
+                    continue
+                order = attempt.option_order(question['id'], len(options))
+                position = invert(order)
+                correct = question.get('correct_answer')
+                if isinstance(correct, list):
+                    correct = sorted(position[i] for i in correct if 0 <= i < len(position))
+                elif isinstance(correct, int) and 0 <= correct < len(position):
+                    correct = position[correct]
+                permuted.append({**question, 'options': [options[i] for i in order], 'correct_answer': correct})
+            questions = permuted
+
+        return json.dumps(questions, separators=(',', ':'))
+
+    def get_quiz_attempts(self, quiz_id, user_id=None, limit=DEFAULT_PAGE_SIZE, cursor=None):
+        """Get one page of attempts for a quiz (owner only), newest first"""
+
+        logger.debug(f"🔍 Fetching attempts for quiz: quiz_id={quiz_id}, user_id={user_id}, limit={limit}")
 
         quiz = Quiz.query.get(quiz_id)
         if not quiz:
             logger.warning(f"⚠️ Quiz not found: quiz_id={quiz_id}")
-            return []
+            return [], None
 
         # Check ownership
         if user_id and quiz.creator_id != user_id:
             logger.warning(f"⚠️ Access denied: user_id={user_id} is not owner of quiz_id={quiz_id}")
-            return []
-
-        attempts = Attempt.query.filter_by(quiz_id=quiz_id).order_by(Attempt.started_at.desc()).all()
-        logger.info(f"Found {len(attempts)} attempt(s) for quiz_id={quiz_id}")
-        return attempts
-
-    def get_user_attempts(self, user_id):
-        """Get all attempts for a user"""
-
-        logger.debug(f"🔍 Fetching attempts for user: user_id={user_id}")
-
-        attempts = Attempt.query.filter_by(user_id=user_id).order_by(Attempt.started_at.desc()).all()
-        logger.info(f"Found {len(attempts)} attempt(s) for user_id={user_id}")
-        return attempts
+            return [], None
+
+        attempts, next_cursor = keyset_paginate(
+            Attempt.query.filter_by(quiz_id=quiz_id),
+            Attempt.started_at, Attempt.id, limit, cursor
+        )
+        logger.info(f"Found {len(attempts)} attempt(s) for quiz_id={quiz_id}, has_more={next_cursor is not None}")
+        return attempts, next_cursor
+
+    def iter_quiz_attempts(self, quiz_id, include_answers=True, batch_size=STREAM_BATCH_SIZE):
+        """
+        Yield every attempt of a quiz as a dict, newest first, without holding them all in memory.
+        Rows are fetched batch_size at a time (a server-side cursor where the driver supports one)
+        and each batch's answers are loaded with one IN query.
+        """
+
+        logger.debug(f"🔍 Streaming attempts for quiz: quiz_id={quiz_id}, batch_size={batch_size}")
+
+        stmt = select(Attempt).where(Attempt.quiz_id == quiz_id).order_by(
+            Attempt.started_at.desc(), Attempt.id.desc()
+        )
+        if include_answers:
+            stmt = stmt.options(selectinload(Attempt.answers))
+
+        count = 0
+        for attempt in db.session.scalars(stmt, execution_options={'yield_per': batch_size}):
+            yield self.archive_service.attempt_dict(attempt, include_answers)
+            count += 1
+        logger.info(f"Streamed {count} attempt(s) for quiz_id={quiz_id}")
+
+    def get_user_attempts(self, user_id, limit=DEFAULT_PAGE_SIZE, cursor=None):
+        """
+        Get one page of a user's attempt history, newest first, with a summary of each quiz.
+        Runs a single joined query over plain columns; quiz total points come from the
+        denormalized Quiz.total_points rather than summing questions per row.
+        """
+
+        logger.debug(f"🔍 Fetching attempts for user: user_id={user_id}, limit={limit}")
+
+        query = db.session.query(
+            *Attempt.__table__.columns,
+            Quiz.title.label('quiz_title'),
+            Quiz.description.label('quiz_description'),
+            Quiz.share_code.label('quiz_share_code'),
+            Quiz.total_points.label('quiz_total_points')
+        ).join(Quiz, Quiz.id == Attempt.quiz_id).filter(Attempt.user_id == user_id)
+
+        rows, next_cursor = keyset_paginate(query, Attempt.started_at, Attempt.id, limit, cursor)
+
+        attempts = []
+        for row in rows:
+            attempt = Attempt.serialize(row)
+            attempt['quiz'] = {
+                'id': row.quiz_id,
+                'title': row.quiz_title,
+                'description': row.quiz_description,
+                'share_code': row.quiz_share_code,
+                'total_points': row.quiz_total_points
+            }
+            attempts.append(attempt)
+
+        logger.info(f"Found {len(attempts)} attempt(s) for user_id={user_id}, has_more={next_cursor is not None}")
+        return attempts, next_cursor
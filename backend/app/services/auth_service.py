@@ -1,30 +1,35 @@
 import logging
+import uuid
 from datetime import datetime, timedelta
 
-import bcrypt
 import jwt
 from flask import current_app
 
 from app.extensions import db
 from app.models.user import User
+from app.services.password_hasher import HasherBusyError
 
 logger = logging.getLogger(__name__)
 
 
 class AuthService:
     @staticmethod
-    def hash_password(password):
-        """Hash a password using bcrypt"""
+    def _hasher():
+        return current_app.extensions['password_hasher']
+
+    @classmethod
+    def hash_password(cls, password):
+        """Hash a password using bcrypt in the hasher pool; raises HasherBusyError when saturated"""
         logger.debug("Hashing password")
-        hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        hashed = cls._hasher().hash(password)
         logger.debug("Password hashed successfully")
         return hashed
 
-    @staticmethod
-    def verify_password(password, password_hash):
-        """Verify a password against a hash"""
+    @classmethod
+    def verify_password(cls, password, password_hash):
+        """Verify a password against a hash in the hasher pool; raises HasherBusyError when saturated"""
         logger.debug("Verifying password")
-        is_valid = bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+        is_valid = cls._hasher().verify(password, password_hash)
         logger.debug(f"Password verification result: {is_valid}")
         return is_valid
 
@@ -35,7 +40,8 @@ class AuthService:
         payload = {
             'user_id': user_id,
             'exp': datetime.utcnow() + timedelta(days=7),
-            'iat': datetime.utcnow()
+            'iat': datetime.utcnow(),
+            'jti': uuid.uuid4().hex  # lets the token be revoked (logout) before exp
         }
         token = jwt.encode(payload, current_app.config['JWT_SECRET'], algorithm='HS256')
         logger.info(f"JWT token generated successfully for user_id={user_id}")
@@ -55,7 +61,10 @@ class AuthService:
             # Hash password
             logger.debug(f"Hashing password for new user")
             password_hash = self.hash_password(password)
+        except HasherBusyError as e:
+            return {'error': str(e)}, 429
 
+        try:
             # Create user
             logger.debug(f"Creating user record in database")
             user = User(
@@ -92,12 +101,18 @@ class AuthService:
             return {'error': 'Invalid email or password'}, 401
 
         logger.debug(f"User found: user_id={user.id}, verifying password")
-        password_valid = self.verify_password(password, user.password_hash)
+        try:
+            password_valid = self.verify_password(password, user.password_hash)
+        except HasherBusyError as e:
+            return {'error': str(e)}, 429
 
         if not password_valid:
             logger.warning(f"⚠️ Login failed: Invalid password for email={email}, user_id={user.id}")
             return {'error': 'Invalid email or password'}, 401
 
+        if self._hasher().needs_rehash(user.password_hash):
+            self._rehash(user, password)
+
         # Generate token
         token = self.generate_token(user.id)
 
@@ -106,3 +121,15 @@ class AuthService:
             'user': user.to_dict(),
             'token': token
         }, 200
+
+    def _rehash(self, user, password):
+        """Re-hash a verified password at the configured cost; failure leaves the old hash in place"""
+        try:
+            user.password_hash = self.hash_password(password)
+            db.session.commit()
+            logger.info(f"🔁 Password rehashed: user_id={user.id}, rounds={self._hasher().rounds}")
+        except HasherBusyError:
+            logger.debug(f"Password rehash deferred, hasher busy: user_id={user.id}")
+        except Exception as e:
+            logger.warning(f"⚠️ Password rehash failed: user_id={user.id}, error={str(e)}")
+            db.session.rollback()
@@ -0,0 +1,132 @@
+"""
+Auto-submission of attempts whose time limit has run out.
+
+Open attempts with a deadline are kept in a min-heap ordered by deadline, so the scheduler
+sleeps until exactly the next one is due instead of scanning the attempts table. The heap is
+loaded once from the (status, deadline) index; attempts started in this process are pushed
+directly, and attempts started by other processes are picked up by a cheap primary-key
+watermark query every AUTO_SUBMIT_POLL_SECONDS.
+
+Run it in-process with AUTO_SUBMIT_SCHEDULER=true (single worker), or as one dedicated process
+with `flask attempts auto-submit` when the app runs several workers.
+"""
+import atexit
+import heapq
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from app.extensions import db
+from app.models.attempt import Attempt, AttemptStatus
+
+logger = logging.getLogger(__name__)
+
+RETRY_SECONDS = 60
+
+
+class DeadlineScheduler:
+    def __init__(self, app, poll_seconds=30):
+        self.app = app
+        self.grace = timedelta(seconds=app.config['ATTEMPT_GRACE_SECONDS'])
+        self.poll_seconds = poll_seconds
+        self._heap = []  # (deadline, attempt_id)
+        self._watermark = 0  # highest attempt id loaded from the database
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = None
+
+    def schedule(self, attempt_id, deadline):
+        """Add an attempt; wakes the loop if it is now the earliest deadline"""
+        with self._cond:
+            heapq.heappush(self._heap, (deadline, attempt_id))
+            if self._heap[0][1] == attempt_id:
+                self._cond.notify()
+
+    def load(self):
+        """Push open timed attempts newer than the watermark onto the heap"""
+        with self.app.app_context():
+            try:
+                rows = db.session.query(Attempt.id, Attempt.deadline).filter(
+                    Attempt.status == AttemptStatus.IN_PROGRESS,
+                    Attempt.deadline.isnot(None),
+                    Attempt.id > self._watermark
+                ).order_by(Attempt.deadline).all()
+            finally:
+                db.session.remove()
+
+        with self._cond:
+            known = {attempt_id for _, attempt_id in self._heap}
+            for attempt_id, deadline in rows:
+                self._watermark = max(self._watermark, attempt_id)
+                if attempt_id not in known:
+                    heapq.heappush(self._heap, (deadline, attempt_id))
+            self._cond.notify()
+        if rows:
+            logger.debug(f"Loaded {len(rows)} timed attempt(s), watermark={self._watermark}")
+        return len(rows)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name='deadline-scheduler', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+
+    def run(self):
+        """Block, submitting attempts as their deadlines pass"""
+        logger.info(f"⏱️ Deadline scheduler started: grace={self.grace.total_seconds()}s")
+        self.load()
+        next_poll = datetime.utcnow() + timedelta(seconds=self.poll_seconds)
+
+        while True:
+            due = []
+            with self._cond:
+                if self._stopped:
+                    return
+                now = datetime.utcnow()
+                while self._heap and self._heap[0][0] + self.grace <= now:
+                    due.append(heapq.heappop(self._heap)[1])
+                if not due:
+                    wake_at = next_poll
+                    if self._heap:
+                        wake_at = min(wake_at, self._heap[0][0] + self.grace)
+                    self._cond.wait(max((wake_at - now).total_seconds(), 0))
+
+            for attempt_id in due:
+                self._submit(attempt_id)
+
+            if datetime.utcnow() >= next_poll:
+                self.load()
+                next_poll = datetime.utcnow() + timedelta(seconds=self.poll_seconds)
+
+    def _submit(self, attempt_id):
+        from app.services.scoring_service import ScoringService
+
+        with self.app.app_context():
+            try:
+                attempt = Attempt.query.get(attempt_id)
+                # Skip attempts the participant already submitted (or that were deleted)
+                if not attempt or attempt.status != AttemptStatus.IN_PROGRESS:
+                    return
+                logger.info(f"⏰ Auto-submitting expired attempt: attempt_id={attempt_id}, deadline={attempt.deadline}")
+                ScoringService().submit_attempt(attempt)
+            except Exception as e:
+                logger.error(f"💥 Auto-submit failed, retrying in {RETRY_SECONDS}s: attempt_id={attempt_id}, "
+                             f"error={str(e)}", exc_info=True)
+                self.schedule(attempt_id, datetime.utcnow() + timedelta(seconds=RETRY_SECONDS) - self.grace)
+            finally:
+                db.session.remove()
+
+
+def init_app(app):
+    """Start the in-process scheduler when AUTO_SUBMIT_SCHEDULER is enabled"""
+    if not app.config.get('AUTO_SUBMIT_SCHEDULER'):
+        return None
+
+    scheduler = DeadlineScheduler(app, app.config['AUTO_SUBMIT_POLL_SECONDS'])
+    app.extensions['deadline_scheduler'] = scheduler
+    scheduler.start()
+    return scheduler
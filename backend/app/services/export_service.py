@@ -0,0 +1,184 @@
+import csv
+import io
+import json
+import logging
+from itertools import groupby
+
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models.attempt import Answer, Attempt
+from app.models.question import Question, QuestionType
+from app.services.archive_service import ArchiveReader
+from app.utils.randomization import original_choices, seeded_permutation
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched per round trip; memory use is bounded by this, not by the number of attempts
+EXPORT_BATCH_SIZE = 1000
+
+ATTEMPT_COLUMNS = ['attempt_id', 'participant_name', 'user_id', 'status', 'started_at', 'submitted_at',
+                   'score', 'total_points']
+
+# Spreadsheet apps execute cells starting with these; participant-entered text is neutralized
+_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+def _load_info(raw):
+    try:
+        info = json.loads(raw) if raw else {}
+    except ValueError:
+        return {}
+    return info if isinstance(info, dict) else {}
+
+
+def _export_answer(answer_text, option_count, seed, shuffle_options, question_id):
+    """An MCQ answer as original option indices ("0" or "0,2"); stored answers are display positions"""
+    order = None
+    if shuffle_options and seed is not None:
+        order = seeded_permutation(seed, f"options:{question_id}", option_count)
+    return ','.join(str(choice) for choice in original_choices(answer_text, option_count, order))
+
+
+def _safe_cell(value):
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+class ExportService:
+    def _info_keys(self, quiz):
+        """participant_info columns: the quiz's custom fields in order, then any other keys seen"""
+        keys = []
+        custom_fields = quiz.settings.get_custom_fields() if quiz.settings else []
+        for index, field in enumerate(custom_fields):
+            name = field.get('name') or f"field{index}"
+            if name not in keys:
+                keys.append(name)
+
+        # Streams just the participant_info column; memory grows with distinct keys, not attempts
+        extra = set()
+        stmt = select(Attempt.participant_info).where(
+            Attempt.quiz_id == quiz.id,
+            Attempt.participant_info.isnot(None)
+        )
+        for raw in db.session.scalars(stmt, execution_options={'yield_per': EXPORT_BATCH_SIZE}):
+            extra.update(_load_info(raw).keys())
+        keys.extend(sorted(extra - set(keys)))
+        return keys
+
+    def result_columns(self, quiz):
+        """Return (columns, info_keys, questions) describing one export row"""
+        info_keys = self._info_keys(quiz)
+        questions = db.session.execute(
+            select(Question.id).where(Question.quiz_id == quiz.id).order_by(Question.order, Question.id)
+        ).scalars().all()
+
+        columns = list(ATTEMPT_COLUMNS)
+        columns.extend(f"info_{key}" for key in info_keys)
+        for position in range(1, len(questions) + 1):
+            columns.extend([f"q{position}_answer", f"q{position}_points"])
+        return columns, info_keys, questions
+
+    def iter_result_records(self, quiz_id, info_keys, questions):
+        """
+        Yield one flat dict per attempt, oldest first.
+        A single ordered query over attempts LEFT JOIN answers is grouped by attempt in one pass.
+        Archived answers are read from the quiz archive as it streams past, in the same id order.
+        """
+
+        logger.info(f"📤 Exporting results: quiz_id={quiz_id}, questions={len(questions)}")
+
+        positions = {question_id: position for position, question_id in enumerate(questions, 1)}
+        mcq = {
+            q.id: len(q.get_options())
+            for q in Question.query.filter(Question.quiz_id == quiz_id, Question.type == QuestionType.MCQ)
+        }
+        archive = ArchiveReader(quiz_id)
+        stmt = select(
+            Attempt.id, Attempt.participant_name, Attempt.user_id, Attempt.status, Attempt.started_at,
+            Attempt.submitted_at, Attempt.score, Attempt.total_points, Attempt.participant_info, Attempt.archived_at,
+            Attempt.seed, Attempt.shuffle_options,
+            Answer.question_id, Answer.answer_text, Answer.points_earned
+        ).outerjoin(Answer, Answer.attempt_id == Attempt.id).where(
+            Attempt.quiz_id == quiz_id
+        ).order_by(Attempt.id)  # ids follow start order, and the archive is sorted by id
+
+        rows = db.session.execute(stmt, execution_options={'yield_per': EXPORT_BATCH_SIZE})
+        count = 0
+        for _, group in groupby(rows, key=lambda row: row.id):
+            group = list(group)  # one attempt's answers
+            first = group[0]
+            record = {
+                'attempt_id': first.id,
+                'participant_name': first.participant_name,
+                'user_id': first.user_id,
+                'status': first.status,
+                'started_at': _isoformat(first.started_at),
+                'submitted_at': _isoformat(first.submitted_at),
+                'score': first.score,
+                'total_points': first.total_points
+            }
+            info = _load_info(first.participant_info)
+            for key in info_keys:
+                record[f"info_{key}"] = info.get(key)
+            for position in positions.values():
+                record[f"q{position}_answer"] = None
+                record[f"q{position}_points"] = None
+            answers = [(row.question_id, row.answer_text, row.points_earned) for row in group]
+            if first.archived_at is not None:
+                answers = [(a['question_id'], a['answer_text'], a['points_earned'])
+                           for a in archive.answers(first.id)]
+            for question_id, answer_text, points_earned in answers:
+                position = positions.get(question_id)
+                if position:
+                    if question_id in mcq and answer_text is not None:
+                        answer_text = _export_answer(
+                            answer_text, mcq[question_id], first.seed, first.shuffle_options, question_id
+                        )
+                    record[f"q{position}_answer"] = answer_text
+                    record[f"q{position}_points"] = points_earned
+            yield record
+            count += 1
+        logger.info(f"✅ Results exported: quiz_id={quiz_id}, attempts={count}")
+
+    def iter_csv(self, quiz):
+        """
+        Resolve the columns now and return a generator of CSV text chunks, header first.
+        The generator only holds ids, so it can run after the request's ORM objects are gone.
+        """
+        columns, info_keys, questions = self.result_columns(quiz)
+        quiz_id = quiz.id
+
+        def generate():
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+
+            def flush():
+                chunk = buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                return chunk
+
+            writer.writerow(columns)
+            yield flush()
+            for record in self.iter_result_records(quiz_id, info_keys, questions):
+                writer.writerow([_safe_cell(record[column]) for column in columns])
+                yield flush()
+
+        return generate()
+
+    def iter_ndjson(self, quiz):
+        """Resolve the columns now and return a generator of JSON lines, one object per attempt"""
+        _, info_keys, questions = self.result_columns(quiz)
+        quiz_id = quiz.id
+
+        def generate():
+            for record in self.iter_result_records(quiz_id, info_keys, questions):
+                yield json.dumps(record, separators=(',', ':')) + '\n'
+
+        return generate()
@@ -0,0 +1,234 @@
+"""
+Per-quiz leaderboards of submitted attempt scores.
+
+Each quiz board is a sorted structure updated on submit, so rank, percentile and top-N lookups
+never sort the attempts table:
+    memory - an in-process order-statistic tree per quiz (default)
+    redis  - one sorted set per quiz, shared by every worker (LEADERBOARD=redis)
+
+A board is loaded from the (quiz_id, status, score) index the first time it is used. At most every
+LEADERBOARD_VERIFY_SECONDS its size is compared with Quiz.submitted_count, and the board is
+reloaded if they differ. This picks up submissions made by other processes, or missed while the
+board was being loaded.
+"""
+import logging
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models.attempt import Attempt, AttemptStatus
+from app.models.quiz import Quiz
+from app.utils.order_statistic_tree import OrderStatisticTree
+
+logger = logging.getLogger(__name__)
+
+MAX_LEADERBOARD_LIMIT = 100
+
+
+def _load_scores(quiz_id):
+    """(attempt_id, score) for every submitted attempt of a quiz, from the covering index"""
+    return db.session.execute(
+        select(Attempt.id, Attempt.score).where(
+            Attempt.quiz_id == quiz_id,
+            Attempt.status == AttemptStatus.SUBMITTED
+        )
+    ).all()
+
+
+def _submitted_count(quiz_id):
+    return db.session.execute(select(Quiz.submitted_count).where(Quiz.id == quiz_id)).scalar()
+
+
+class _VerifiedBoards:
+    """Rate-limits the size check that keeps a board in step with Quiz.submitted_count"""
+
+    def __init__(self, verify_seconds):
+        self.verify_seconds = verify_seconds
+        self._verified_at = {}
+
+    def _due(self, quiz_id):
+        now = time.monotonic()
+        if now - self._verified_at.get(quiz_id, float('-inf')) < self.verify_seconds:
+            return False
+        self._verified_at[quiz_id] = now
+        return True
+
+    def _forget(self, quiz_id):
+        self._verified_at.pop(quiz_id, None)
+
+
+class MemoryLeaderboard(_VerifiedBoards):
+    def __init__(self, verify_seconds=5):
+        super().__init__(verify_seconds)
+        self._trees = {}  # quiz_id -> OrderStatisticTree of (-score, attempt_id)
+        self._lock = threading.Lock()
+
+    def _tree(self, quiz_id):
+        with self._lock:
+            tree = self._trees.get(quiz_id)
+            if tree is not None and not self._due(quiz_id):
+                return tree
+
+        if tree is None or len(tree) != _submitted_count(quiz_id):
+            rows = _load_scores(quiz_id)
+            tree = OrderStatisticTree((-(score or 0.0), attempt_id) for attempt_id, score in rows)
+            logger.debug(f"Leaderboard loaded: quiz_id={quiz_id}, entries={len(tree)}")
+            with self._lock:
+                self._trees[quiz_id] = tree
+                self._verified_at[quiz_id] = time.monotonic()
+        return tree
+
+    def record(self, quiz_id, attempt_id, score):
+        with self._lock:
+            tree = self._trees.get(quiz_id)
+            if tree is not None:  # unloaded boards pick the attempt up when they load
+                tree.insert((-(score or 0.0), attempt_id))
+
+    def forget_quiz(self, quiz_id):
+        with self._lock:
+            self._trees.pop(quiz_id, None)
+            self._forget(quiz_id)
+
+    def counts(self, quiz_id, score):
+        """Return (attempts scoring higher, attempts scoring lower, total)"""
+        tree = self._tree(quiz_id)
+        with self._lock:
+            higher = tree.count_less((-score, float('-inf')))
+            lower = len(tree) - tree.count_less((-score, float('inf')))
+            return higher, lower, len(tree)
+
+    def top(self, quiz_id, limit):
+        """[(attempt_id, score)] best first; ties go to the earlier attempt"""
+        tree = self._tree(quiz_id)
+        with self._lock:
+            entries = []
+            for neg_score, attempt_id in tree.iter_from_smallest():
+                if len(entries) >= limit:
+                    break
+                entries.append((attempt_id, -neg_score))
+            return entries
+
+
+class RedisLeaderboard(_VerifiedBoards):
+    def __init__(self, url, verify_seconds=5):
+        import redis
+        super().__init__(verify_seconds)
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+
+    @staticmethod
+    def _key(quiz_id):
+        return f"quickquiz:leaderboard:{quiz_id}"
+
+    def _ensure(self, quiz_id):
+        if not self._due(quiz_id):
+            return
+        key = self._key(quiz_id)
+        if self._redis.zcard(key) == _submitted_count(quiz_id):
+            return
+        rows = _load_scores(quiz_id)
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.delete(key)
+        if rows:
+            pipe.zadd(key, {str(attempt_id): score or 0.0 for attempt_id, score in rows})
+        pipe.execute()
+        logger.debug(f"Leaderboard loaded: quiz_id={quiz_id}, entries={len(rows)}")
+
+    def record(self, quiz_id, attempt_id, score):
+        self._redis.zadd(self._key(quiz_id), {str(attempt_id): score or 0.0})
+
+    def forget_quiz(self, quiz_id):
+        self._redis.delete(self._key(quiz_id))
+        self._forget(quiz_id)
+
+    def counts(self, quiz_id, score):
+        self._ensure(quiz_id)
+        key = self._key(quiz_id)
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.zcount(key, f"({score}", '+inf')
+        pipe.zcount(key, '-inf', f"({score}")
+        pipe.zcard(key)
+        higher, lower, total = pipe.execute()
+        return higher, lower, total
+
+    def top(self, quiz_id, limit):
+        self._ensure(quiz_id)
+        members = self._redis.zrange(self._key(quiz_id), 0, limit - 1, desc=True, withscores=True)
+        return [(int(member), score) for member, score in members]
+
+
+class LeaderboardService:
+    @staticmethod
+    def _board():
+        return current_app.extensions['leaderboard']
+
+    def record(self, quiz_id, attempt_id, score):
+        """Add a newly submitted attempt; call after the submission is committed"""
+        try:
+            self._board().record(quiz_id, attempt_id, score)
+        except Exception as e:
+            # The periodic size check reloads the board, so a missed update is only temporary
+            logger.warning(f"⚠️ Leaderboard update failed: quiz_id={quiz_id}, attempt_id={attempt_id}, "
+                           f"error={str(e)}")
+
+    def forget_quiz(self, quiz_id):
+        self._board().forget_quiz(quiz_id)
+
+    def rank(self, quiz_id, score):
+        """
+        Competition rank (1 = best; ties share a rank) and percentile rank of a score:
+        the share of submitted attempts scoring lower, counting ties as half.
+        """
+        score = score or 0.0
+        higher, lower, total = self._board().counts(quiz_id, score)
+        if not total:
+            return {'rank': 1, 'percentile': 100.0, 'ranked_attempts': 0}
+        equal = total - higher - lower
+        return {
+            'rank': higher + 1,
+            'percentile': round(100.0 * (lower + 0.5 * equal) / total, 2),
+            'ranked_attempts': total
+        }
+
+    def top(self, quiz_id, limit):
+        """Top submitted attempts as dicts, best first, with competition ranks"""
+        entries = self._board().top(quiz_id, limit)
+        attempts = {
+            a.id: a for a in Attempt.query.filter(Attempt.id.in_([attempt_id for attempt_id, _ in entries]))
+        }
+
+        board, rank, previous = [], 0, None
+        for position, (attempt_id, score) in enumerate(entries, 1):
+            attempt = attempts.get(attempt_id)
+            if attempt is None:  # deleted since the board was loaded
+                continue
+            if score != previous:
+                rank, previous = position, score
+            board.append({
+                'rank': rank,
+                'attempt_id': attempt.id,
+                'participant_name': attempt.participant_name,
+                'user_id': attempt.user_id,
+                'score': attempt.score,
+                'total_points': attempt.total_points,
+                'submitted_at': attempt.submitted_at.isoformat() if attempt.submitted_at else None
+            })
+        return board
+
+
+def init_app(app):
+    """Create the configured leaderboard backend"""
+    mode = app.config.get('LEADERBOARD', 'memory')
+    verify_seconds = app.config['LEADERBOARD_VERIFY_SECONDS']
+    if mode == 'memory':
+        board = MemoryLeaderboard(verify_seconds)
+    elif mode == 'redis':
+        board = RedisLeaderboard(app.config['REDIS_URL'], verify_seconds)
+    else:
+        raise ValueError(f"Unknown LEADERBOARD mode: {mode}")
+
+    app.extensions['leaderboard'] = board
+    logger.info(f"Leaderboard backend: mode={mode}")
+    return board
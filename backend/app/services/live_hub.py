@@ -0,0 +1,248 @@
+"""
+Broadcast hub for live (host-paced) quizzes.
+
+Each SSE client owns a bounded in-process queue. An event is serialized once, as a ready-to-send
+SSE frame, and put on the queue of every local subscriber to the quiz:
+    memory - publish delivers straight to this process's queues (single process only, default)
+    redis  - publish goes through Redis pub/sub; one listener thread per worker receives each event
+             once and fans it out to that worker's queues (LIVE_HUB=redis)
+
+Answers to the open question are tallied in the hub as well. Frequently changing data such as
+these counts goes through publish_later: at most one event per quiz and event name is sent every
+LIVE_COUNTS_INTERVAL_MS however fast updates arrive, so the number of events does not grow with the
+number of participants answering.
+"""
+import json
+import logging
+import queue
+import threading
+import time
+from functools import partial
+
+logger = logging.getLogger(__name__)
+
+
+def sse_frame(event, data):
+    """Serialize one Server-Sent Events frame"""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+class Subscription:
+    """One SSE client's queue of frames; closed by the hub if the client falls too far behind"""
+
+    def __init__(self, quiz_id, maxsize):
+        self.quiz_id = quiz_id
+        self.closed = False
+        self._queue = queue.Queue(maxsize=maxsize)
+
+    def offer(self, frame):
+        try:
+            self._queue.put_nowait(frame)
+            return True
+        except queue.Full:
+            return False
+
+    def get(self, timeout):
+        """Next frame, or None after timeout seconds without one"""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+def _counts(tally, option_count):
+    """Counts event payload from {attempt_id: [original option indices]}"""
+    data = {'answered': len(tally)}
+    if option_count:
+        option_counts = [0] * option_count
+        for choices in tally.values():
+            for choice in choices:
+                option_counts[choice] += 1
+        data['option_counts'] = option_counts
+    return data
+
+
+class _LocalFanout:
+    """Subscriber registry and answer-count coalescing shared by both backends"""
+
+    def __init__(self, queue_size, counts_interval):
+        self.queue_size = queue_size
+        self.counts_interval = counts_interval
+        self._subscribers = {}  # quiz_id -> set of Subscription
+        self._pending = {}  # (quiz_id, event) -> callable building the data to publish
+        self._lock = threading.Lock()
+        self._pending_thread = None
+
+    def subscribe(self, quiz_id):
+        subscription = Subscription(quiz_id, self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(quiz_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.quiz_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.quiz_id]
+
+    def subscriber_count(self, quiz_id):
+        with self._lock:
+            return len(self._subscribers.get(quiz_id, ()))
+
+    def stream(self, subscription, first_frame, heartbeat):
+        """SSE body for one client: first_frame, then the quiz's events, with keepalives while idle"""
+        try:
+            yield first_frame
+            while not subscription.closed:
+                frame = subscription.get(timeout=heartbeat)
+                yield frame if frame is not None else ': keepalive\n\n'
+        finally:
+            # Runs when the client disconnects and the server closes the generator
+            self.unsubscribe(subscription)
+
+    def _deliver(self, quiz_id, frame):
+        with self._lock:
+            subscribers = list(self._subscribers.get(quiz_id, ()))
+        for subscription in subscribers:
+            if not subscription.offer(frame):
+                # A stalled client must not hold up the others; it reconnects and gets fresh state
+                self.unsubscribe(subscription)
+                subscription.closed = True
+                logger.warning(f"⚠️ Live subscriber dropped, queue full: quiz_id={quiz_id}")
+
+    def publish_later(self, quiz_id, event, build):
+        """
+        Publish event with the data returned by build() on the next tick. Calls made before then
+        coalesce into one event, built from the latest state; build() may return None to skip it.
+        """
+        with self._lock:
+            self._pending[(quiz_id, event)] = build
+            if self._pending_thread is None:
+                self._pending_thread = threading.Thread(target=self._publish_pending_loop,
+                                                        name='live-publisher', daemon=True)
+                self._pending_thread.start()
+
+    def _publish_pending_loop(self):
+        while True:
+            time.sleep(self.counts_interval)
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            for (quiz_id, event), build in pending.items():
+                try:
+                    data = build()
+                    if data is not None:
+                        self.publish(quiz_id, event, data)
+                except Exception as e:
+                    logger.error(f"💥 Live event publish failed: quiz_id={quiz_id}, event={event}, error={str(e)}")
+
+    def record_answer(self, quiz_id, question_id, attempt_id, choices, option_count=None):
+        """Tally one attempt's answer to the open question; re-answering replaces its earlier choices"""
+        self._store_answer(quiz_id, question_id, attempt_id, choices)
+        self.publish_later(quiz_id, 'counts', partial(self.counts, quiz_id, question_id, option_count))
+
+    def counts(self, quiz_id, question_id, option_count=None):
+        """'counts' event data for a question's current tally"""
+        return {'question_id': question_id, **_counts(self._load_tally(quiz_id, question_id), option_count)}
+
+
+class MemoryLiveHub(_LocalFanout):
+    def __init__(self, queue_size=100, counts_interval=1.0):
+        super().__init__(queue_size, counts_interval)
+        self._tallies = {}  # quiz_id -> (question_id, {attempt_id: choices})
+        self._tally_lock = threading.Lock()
+
+    def publish(self, quiz_id, event, data):
+        self._deliver(quiz_id, sse_frame(event, data))
+
+    def _store_answer(self, quiz_id, question_id, attempt_id, choices):
+        with self._tally_lock:
+            current = self._tallies.get(quiz_id)
+            if current is None or current[0] != question_id:
+                current = self._tallies[quiz_id] = (question_id, {})
+            current[1][attempt_id] = list(choices)
+
+    def _load_tally(self, quiz_id, question_id):
+        with self._tally_lock:
+            current = self._tallies.get(quiz_id)
+            return dict(current[1]) if current and current[0] == question_id else {}
+
+    def clear_tally(self, quiz_id, question_id):
+        with self._tally_lock:
+            current = self._tallies.get(quiz_id)
+            if current and current[0] == question_id:
+                del self._tallies[quiz_id]
+
+
+class RedisLiveHub(_LocalFanout):
+    CHANNEL_PREFIX = 'quickquiz:live:events:'
+    TALLY_TTL_SECONDS = 24 * 3600
+
+    def __init__(self, url, queue_size=100, counts_interval=1.0):
+        import redis
+        super().__init__(queue_size, counts_interval)
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+        self._listener = None
+
+    @staticmethod
+    def _tally_key(quiz_id, question_id):
+        return f"quickquiz:live:tally:{quiz_id}:{question_id}"
+
+    def publish(self, quiz_id, event, data):
+        self._redis.publish(f"{self.CHANNEL_PREFIX}{quiz_id}", sse_frame(event, data))
+
+    def subscribe(self, quiz_id):
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name='live-listener', daemon=True)
+                self._listener.start()
+        return super().subscribe(quiz_id)
+
+    def _listen(self):
+        """Receive every quiz's events once for this worker and hand them to local subscribers"""
+        while True:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.psubscribe(f"{self.CHANNEL_PREFIX}*")
+                for message in pubsub.listen():
+                    quiz_id = int(message['channel'][len(self.CHANNEL_PREFIX):])
+                    self._deliver(quiz_id, message['data'])
+            except Exception as e:
+                logger.error(f"💥 Live listener lost its Redis connection, retrying: error={str(e)}")
+                time.sleep(1)
+            finally:
+                pubsub.close()
+
+    def _store_answer(self, quiz_id, question_id, attempt_id, choices):
+        key = self._tally_key(quiz_id, question_id)
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.hset(key, attempt_id, json.dumps(list(choices)))
+        pipe.expire(key, self.TALLY_TTL_SECONDS)
+        pipe.execute()
+
+    def _load_tally(self, quiz_id, question_id):
+        return {
+            int(attempt_id): json.loads(choices)
+            for attempt_id, choices in self._redis.hgetall(self._tally_key(quiz_id, question_id)).items()
+        }
+
+    def clear_tally(self, quiz_id, question_id):
+        self._redis.delete(self._tally_key(quiz_id, question_id))
+
+
+def init_app(app):
+    """Create the configured live broadcast hub"""
+    mode = app.config.get('LIVE_HUB', 'memory')
+    queue_size = app.config['LIVE_QUEUE_SIZE']
+    counts_interval = app.config['LIVE_COUNTS_INTERVAL_MS'] / 1000.0
+    if mode == 'memory':
+        hub = MemoryLiveHub(queue_size, counts_interval)
+    elif mode == 'redis':
+        hub = RedisLiveHub(app.config['REDIS_URL'], queue_size, counts_interval)
+    else:
+        raise ValueError(f"Unknown LIVE_HUB mode: {mode}")
+
+    app.extensions['live_hub'] = hub
+    logger.info(f"Live hub: mode={mode}")
+    return hub
@@ -0,0 +1,180 @@
+import logging
+
+from flask import current_app
+from sqlalchemy import update
+
+from app.extensions import db
+from app.models.question import QuestionType
+from app.models.quiz import Quiz
+from app.services.quiz_stats_service import QuizStatsService
+from app.services.snapshot_service import SnapshotService
+from app.utils.randomization import original_choices
+
+logger = logging.getLogger(__name__)
+
+
+def _public_question(question):
+    """A snapshot question as broadcast to participants: everything but the answer"""
+    return {key: value for key, value in question.items() if key != 'correct_answer'}
+
+
+class LiveService:
+    def __init__(self):
+        self.snapshot_service = SnapshotService()
+        self.stats_service = QuizStatsService()
+
+    @staticmethod
+    def _hub():
+        return current_app.extensions['live_hub']
+
+    def _publish(self, quiz_id, event, data):
+        try:
+            self._hub().publish(quiz_id, event, data)
+        except Exception as e:
+            # Clients that miss an event catch up from GET /live when they reconnect
+            logger.warning(f"⚠️ Live event publish failed: quiz_id={quiz_id}, event={event}, error={str(e)}")
+
+    def get_state(self, quiz):
+        """The question the host has opened (or last opened), from the published snapshot"""
+        questions = self.snapshot_service.get_current(quiz).questions
+        index = next((i for i, q in enumerate(questions) if q['id'] == quiz.live_question_id), None)
+        return {
+            'quiz_id': quiz.id,
+            'live_mode': quiz.live_mode,
+            'question_index': index,
+            'question_count': len(questions),
+            'open': quiz.live_question_open and index is not None,
+            'question': _public_question(questions[index]) if index is not None else None
+        }
+
+    def advance(self, quiz, question_index=None):
+        """Open the next question (or question_index) and broadcast it"""
+
+        logger.info(f"⏭️ Advancing live quiz: quiz_id={quiz.id}, question_index={question_index}")
+
+        if not quiz.live_mode:
+            logger.warning(f"⚠️ Live advance failed: Quiz is not in live mode, quiz_id={quiz.id}")
+            return None, "Quiz is not in live mode"
+
+        questions = self.snapshot_service.get_current(quiz).questions
+        if question_index is None:
+            current = next((i for i, q in enumerate(questions) if q['id'] == quiz.live_question_id), None)
+            question_index = 0 if current is None else current + 1
+        if not 0 <= question_index < len(questions):
+            logger.warning(f"⚠️ Live advance failed: No question at index {question_index}, quiz_id={quiz.id}")
+            return None, "No more questions" if questions else "Quiz has no questions"
+
+        question_id = questions[question_index]['id']
+        quiz_id, previous_id = quiz.id, quiz.live_question_id
+        try:
+            # Pin updated_at: moving through a live session is not an edit of the quiz
+            db.session.execute(
+                update(Quiz).where(Quiz.id == quiz_id).values(
+                    live_question_id=question_id, live_question_open=True, updated_at=Quiz.updated_at
+                )
+            )
+            db.session.commit()
+        except Exception as e:
+            logger.error(f"💥 Live advance failed: quiz_id={quiz_id}, error={str(e)}", exc_info=True)
+            db.session.rollback()
+            raise
+
+        try:
+            hub = self._hub()
+            for stale_id in {previous_id, question_id} - {None}:
+                hub.clear_tally(quiz_id, stale_id)
+        except Exception as e:
+            logger.warning(f"⚠️ Live tally reset failed: quiz_id={quiz_id}, error={str(e)}")
+
+        state = self.get_state(quiz)
+        self._publish(quiz_id, 'state', state)
+        logger.info(f"✅ Live question opened: quiz_id={quiz_id}, question_id={question_id}, index={question_index}")
+        return state, None
+
+    def close_question(self, quiz):
+        """Stop accepting answers to the open question and broadcast its final counts"""
+
+        logger.info(f"⏹️ Closing live question: quiz_id={quiz.id}, question_id={quiz.live_question_id}")
+
+        if not quiz.live_mode:
+            logger.warning(f"⚠️ Live close failed: Quiz is not in live mode, quiz_id={quiz.id}")
+            return None, "Quiz is not in live mode"
+        if not quiz.live_question_open:
+            logger.warning(f"⚠️ Live close failed: No question is open, quiz_id={quiz.id}")
+            return None, "No question is open"
+
+        quiz_id, question_id = quiz.id, quiz.live_question_id
+        try:
+            db.session.execute(
+                update(Quiz).where(Quiz.id == quiz_id).values(
+                    live_question_open=False, updated_at=Quiz.updated_at
+                )
+            )
+            db.session.commit()
+        except Exception as e:
+            logger.error(f"💥 Live close failed: quiz_id={quiz_id}, error={str(e)}", exc_info=True)
+            db.session.rollback()
+            raise
+
+        state = self.get_state(quiz)
+        self._publish(quiz_id, 'state', state)
+        question = state['question']
+        if question:
+            option_count = len(question.get('options') or []) if question['type'] == QuestionType.MCQ else None
+            try:
+                hub = self._hub()
+                hub.publish(quiz_id, 'counts', hub.counts(quiz_id, question_id, option_count))
+            except Exception as e:
+                logger.warning(f"⚠️ Live counts publish failed: quiz_id={quiz_id}, error={str(e)}")
+        logger.info(f"✅ Live question closed: quiz_id={quiz_id}, question_id={question_id}")
+        return state, None
+
+    @staticmethod
+    def check_answers(live, question_ids):
+        """
+        Gate answer saves for a live quiz: only the open question may be answered.
+
+        Args:
+            live: The quiz's live state, a row with live_question_id and live_question_open
+                  (loaded with the attempt, see AttemptService)
+            question_ids: Questions being answered
+
+        Returns:
+            An error message, or None when the answers are accepted
+        """
+        if not live.live_question_open:
+            return "No question is open"
+        if any(question_id != live.live_question_id for question_id in question_ids):
+            return "Question is not open"
+        return None
+
+    def record_answers(self, attempt, answers):
+        """Tally accepted answers ({question_id: answer_text}) for the live counts"""
+        try:
+            snapshot = self.snapshot_service.get_by_id(attempt.snapshot_id) if attempt.snapshot_id else None
+            hub = self._hub()
+            for question_id, answer_text in answers.items():
+                question = snapshot.answer_key.get(question_id) if snapshot else None
+                option_count, choices = None, []
+                if question and question.type == QuestionType.MCQ:
+                    option_count = len(question.get_options())
+                    order = attempt.option_order(question_id, option_count)
+                    choices = original_choices(answer_text, option_count, order)
+                hub.record_answer(attempt.quiz_id, question_id, attempt.id, choices, option_count)
+        except Exception as e:
+            # The answer itself is saved; only the live counts miss it
+            logger.warning(f"⚠️ Live answer tally failed: attempt_id={attempt.id}, error={str(e)}")
+
+    def survey_response_submitted(self, quiz_id):
+        """Schedule a 'survey' event with fresh tallies; a burst of submissions sends one event per tick"""
+        app = current_app._get_current_object()
+
+        def build():
+            with app.app_context():
+                quiz = db.session.get(Quiz, quiz_id)
+                return self.stats_service.survey_summary(quiz) if quiz else None
+
+        try:
+            self._hub().publish_later(quiz_id, 'survey', build)
+        except Exception as e:
+            logger.warning(f"⚠️ Survey feed update failed: quiz_id={quiz_id}, error={str(e)}")
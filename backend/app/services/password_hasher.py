@@ -0,0 +1,144 @@
+"""
+bcrypt hashing and verification off the request threads.
+
+bcrypt is deliberately CPU-bound, and a login burst (everyone signing in as an exam starts) would
+otherwise pin every worker and stall unrelated requests. Hashes run in a small process pool of
+PASSWORD_HASH_WORKERS processes per app worker (0 runs them inline on the request thread, still
+bounded). At most PASSWORD_HASH_QUEUE_SIZE operations may be running or waiting; beyond that
+callers get HasherBusyError immediately, which the auth routes turn into 429.
+
+The pool is created on first use and again after a fork, so pre-forking servers do not share one.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import bcrypt
+
+logger = logging.getLogger(__name__)
+
+# Latency samples kept per operation for the percentiles in stats()
+LATENCY_SAMPLES = 1000
+
+
+class HasherBusyError(Exception):
+    """Raised when the hashing queue is full"""
+
+
+def _hash(password, rounds):
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+
+
+def _check(password, password_hash):
+    return bcrypt.checkpw(password, password_hash)
+
+
+def hash_rounds(password_hash):
+    """The cost factor a bcrypt hash was made with ('$2b$12$...' -> 12), or None if unparseable"""
+    try:
+        return int(password_hash.split('$')[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class PasswordHasher:
+    def __init__(self, workers=2, queue_size=64, rounds=12):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.rounds = rounds
+        self._slots = threading.BoundedSemaphore(queue_size)
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pool_pid = None
+        self._depth = 0
+        self._rejected = 0
+        self._latencies = {'hash': deque(maxlen=LATENCY_SAMPLES), 'verify': deque(maxlen=LATENCY_SAMPLES)}
+        self._completed = {'hash': 0, 'verify': 0}
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None or self._pool_pid != os.getpid():
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+                self._pool_pid = os.getpid()
+                atexit.register(self._pool.shutdown, wait=False, cancel_futures=True)
+                logger.info(f"Password hasher pool started: workers={self.workers}, pid={self._pool_pid}")
+            return self._pool
+
+    def _run(self, operation, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            logger.warning(f"⚠️ Password hasher saturated: operation={operation}, queue_size={self.queue_size}")
+            raise HasherBusyError("Too many sign-in requests, retry shortly")
+
+        with self._lock:
+            self._depth += 1
+        started = time.perf_counter()
+        try:
+            if self.workers > 0:
+                return self._executor().submit(fn, *args).result()
+            return fn(*args)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with self._lock:
+                self._depth -= 1
+                self._completed[operation] += 1
+                self._latencies[operation].append(elapsed_ms)
+            self._slots.release()
+            logger.debug(f"Password {operation} took {elapsed_ms:.1f}ms")
+
+    def hash(self, password, rounds=None):
+        """bcrypt hash of a password at the configured cost (or rounds)"""
+        hashed = self._run('hash', _hash, password.encode('utf-8'), rounds or self.rounds)
+        return hashed.decode('utf-8')
+
+    def verify(self, password, password_hash):
+        return self._run('verify', _check, password.encode('utf-8'), password_hash.encode('utf-8'))
+
+    def needs_rehash(self, password_hash):
+        return hash_rounds(password_hash) != self.rounds
+
+    def stats(self):
+        """Queue depth, rejections and latency percentiles (milliseconds) per operation"""
+        with self._lock:
+            latencies = {operation: list(samples) for operation, samples in self._latencies.items()}
+            stats = {
+                'workers': self.workers,
+                'rounds': self.rounds,
+                'queue_depth': self._depth,
+                'queue_size': self.queue_size,
+                'rejected': self._rejected,
+            }
+            completed = dict(self._completed)
+        for operation, samples in latencies.items():
+            stats[operation] = {
+                'completed': completed[operation],
+                'latency_ms': {
+                    'mean': round(sum(samples) / len(samples), 1),
+                    'p50': round(_percentile(samples, 0.5), 1),
+                    'p95': round(_percentile(samples, 0.95), 1),
+                    'max': round(max(samples), 1),
+                } if samples else None
+            }
+        return stats
+
+
+def init_app(app):
+    """Create the password hasher; its process pool starts with the first hash"""
+    hasher = PasswordHasher(
+        workers=app.config['PASSWORD_HASH_WORKERS'],
+        queue_size=app.config['PASSWORD_HASH_QUEUE_SIZE'],
+        rounds=app.config['BCRYPT_ROUNDS']
+    )
+    app.extensions['password_hasher'] = hasher
+    logger.info(f"Password hasher: workers={hasher.workers}, queue_size={hasher.queue_size}, rounds={hasher.rounds}")
+    return hasher
@@ -2,11 +2,19 @@ import logging
 
 from app.extensions import db
 from app.models.question import Question, QuestionType
+from app.services.quiz_stats_service import QuizStatsService
+from app.services.result_cache_service import ResultCacheService
+from app.services.snapshot_service import SnapshotService
 
 logger = logging.getLogger(__name__)
 
 
 class QuestionService:
+    def __init__(self):
+        self.stats_service = QuizStatsService()
+        self.snapshot_service = SnapshotService()
+        self.result_cache_service = ResultCacheService()
+
     def create_question(self, quiz_id, question_type, prompt, options=None,
                         correct_answer=None, points=1, order=0):
         """Create a new question"""
@@ -36,6 +44,8 @@ class QuestionService:
                 logger.debug(f"Set correct answer for question")
 
             db.session.add(question)
+            self.stats_service.question_added(quiz_id, points)
+            self.snapshot_service.content_changed(quiz_id)
             db.session.commit()
             logger.info(f"✅ Question created successfully: question_id={question.id}, quiz_id={quiz_id}")
             return question
@@ -62,6 +72,7 @@ class QuestionService:
                 question.set_correct_answer(correct_answer)
                 updates.append("correct_answer")
             if points is not None:
+                self.stats_service.question_points_changed(question.quiz_id, points - question.points)
                 question.points = points
                 updates.append(f"points={points}")
             if order is not None:
@@ -70,6 +81,7 @@ class QuestionService:
 
             if updates:
                 logger.debug(f"Question fields updated: {', '.join(updates)}")
+                self.snapshot_service.content_changed(question.quiz_id)
 
             db.session.commit()
             logger.info(f"✅ Question updated successfully: question_id={question.id}")
@@ -94,9 +106,13 @@ class QuestionService:
         quiz_id = question.quiz_id
         logger.info(f"🗑️ Deleting question: question_id={question_id}, quiz_id={quiz_id}")
         try:
+            self.stats_service.question_removed(quiz_id, question.points)
+            self.snapshot_service.content_changed(quiz_id)
             db.session.delete(question)
             db.session.commit()
             logger.info(f"✅ Question deleted successfully: question_id={question_id}")
+            # Deleting questions deletes their answers, so cached results are stale
+            self.result_cache_service.invalidate_quiz(quiz_id)
         except Exception as e:
             logger.error(f"💥 Question deletion failed: question_id={question_id}, error={str(e)}", exc_info=True)
             db.session.rollback()
@@ -115,6 +131,8 @@ class QuestionService:
                     updated_count += 1
                     logger.debug(f"Updated question order: question_id={q_id}, order={order}")
 
+            if updated_count:
+                self.snapshot_service.content_changed(quiz_id)
             db.session.commit()
             logger.info(f"✅ Reordered {updated_count} question(s) for quiz_id={quiz_id}")
         except Exception as e:
@@ -1,52 +1,55 @@
 import logging
-import secrets
-import string
+
+from flask import current_app
 
 from app.extensions import db
 from app.models.quiz import Quiz, QuizSettings
+from app.services.archive_service import ArchiveService
+from app.services.leaderboard_service import LeaderboardService
+from app.services.result_cache_service import ResultCacheService
+from app.utils.pagination import DEFAULT_PAGE_SIZE, keyset_paginate
+from app.utils.share_codes import share_code_for
 
 logger = logging.getLogger(__name__)
 
 
 class QuizService:
+    def __init__(self):
+        self.result_cache_service = ResultCacheService()
+        self.leaderboard_service = LeaderboardService()
+        self.archive_service = ArchiveService()
+
     @staticmethod
-    def generate_share_code():
-        """Generate a unique share code"""
-        logger.debug("Generating unique share code")
-        alphabet = string.ascii_uppercase + string.digits
-        attempts = 0
-        while True:
-            attempts += 1
-            code = ''.join(secrets.choice(alphabet) for _ in range(8))
-            if not Quiz.query.filter_by(share_code=code).first():
-                logger.debug(f"Share code generated after {attempts} attempt(s): {code}")
-                return code
-            if attempts > 10:
-                logger.warning(f"Share code generation taking too long ({attempts} attempts)")
+    def generate_share_code(quiz_id):
+        """Derive the share code for a quiz from its id (no uniqueness lookup needed)"""
+        code = share_code_for(quiz_id, current_app.config['SHARE_CODE_SECRET'])
+        logger.debug(f"Share code derived for quiz_id={quiz_id}: {code}")
+        return code
 
     def create_quiz(self, creator_id, title, description=None, is_survey=False,
-                    requires_login=False, settings=None):
+                    requires_login=False, settings=None, live_mode=False):
         """Create a new quiz"""
 
         logger.info(f"📝 Creating quiz: creator_id={creator_id}, title={title}, is_survey={is_survey}")
 
         try:
-            share_code = self.generate_share_code()
-            logger.debug(f"Generated share_code={share_code}")
-
             quiz = Quiz(
                 creator_id=creator_id,
                 title=title,
                 description=description,
                 is_survey=is_survey,
                 requires_login=requires_login,
-                share_code=share_code
+                live_mode=live_mode
             )
 
             db.session.add(quiz)
             db.session.flush()
             logger.debug(f"Quiz created with id={quiz.id}")
 
+            # The share code is a bijection of the id, so it is unique without a lookup
+            share_code = self.generate_share_code(quiz.id)
+            quiz.share_code = share_code
+
             # Create settings
             quiz_settings = QuizSettings(
                 quiz_id=quiz.id,
@@ -74,7 +77,7 @@ class QuizService:
             raise
 
     def update_quiz(self, quiz, title=None, description=None, is_survey=None,
-                    requires_login=None, settings=None):
+                    requires_login=None, settings=None, live_mode=None):
         """Update a quiz"""
 
         logger.info(f"✏️ Updating quiz: quiz_id={quiz.id}")
@@ -93,6 +96,9 @@ class QuizService:
             if requires_login is not None:
                 quiz.requires_login = requires_login
                 updates.append(f"requires_login={requires_login}")
+            if live_mode is not None:
+                quiz.live_mode = live_mode
+                updates.append(f"live_mode={live_mode}")
 
             if updates:
                 logger.debug(f"Quiz fields updated: {', '.join(updates)}")
@@ -157,13 +163,16 @@ class QuizService:
             logger.warning(f"⚠️ Quiz not found: share_code={share_code}")
         return quiz
 
-    def get_user_quizzes(self, user_id):
-        """Get all quizzes created by a user"""
+    def get_user_quizzes(self, user_id, limit=DEFAULT_PAGE_SIZE, cursor=None):
+        """Get one page of quizzes created by a user, newest first"""
 
-        logger.debug(f"🔍 Fetching quizzes for user: user_id={user_id}")
-        quizzes = Quiz.query.filter_by(creator_id=user_id).order_by(Quiz.created_at.desc()).all()
-        logger.info(f"Found {len(quizzes)} quiz(es) for user_id={user_id}")
-        return quizzes
+        logger.debug(f"🔍 Fetching quizzes for user: user_id={user_id}, limit={limit}")
+        quizzes, next_cursor = keyset_paginate(
+            Quiz.query.filter_by(creator_id=user_id),
+            Quiz.created_at, Quiz.id, limit, cursor
+        )
+        logger.info(f"Found {len(quizzes)} quiz(es) for user_id={user_id}, has_more={next_cursor is not None}")
+        return quizzes, next_cursor
 
     def delete_quiz(self, quiz):
         """Delete a quiz"""
@@ -174,6 +183,9 @@ class QuizService:
             db.session.delete(quiz)
             db.session.commit()
             logger.info(f"✅ Quiz deleted successfully: quiz_id={quiz_id}")
+            self.result_cache_service.invalidate_quiz(quiz_id)
+            self.leaderboard_service.forget_quiz(quiz_id)
+            self.archive_service.forget_quiz(quiz_id)
         except Exception as e:
             logger.error(f"💥 Quiz deletion failed: quiz_id={quiz_id}, error={str(e)}", exc_info=True)
             db.session.rollback()
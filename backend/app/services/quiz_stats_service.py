@@ -0,0 +1,428 @@
+import logging
+import math
+from collections import Counter
+
+from sqlalchemy import delete, func, insert, select, update
+
+from app.extensions import db
+from app.models.attempt import Answer, Attempt, AttemptStatus
+from app.models.question import Question, QuestionType
+from app.models.quiz import Quiz
+from app.models.stats import (SCORE_BUCKETS, TRUE_FALSE_OPTIONS, QuestionOptionCount, QuestionStats, QuizScoreBucket,
+                              score_bucket)
+from app.services.archive_service import ArchiveService
+from app.services.snapshot_service import SnapshotService
+from app.utils.randomization import original_choices, seeded_permutation
+from app.utils.upsert import increment_counters
+
+logger = logging.getLogger(__name__)
+
+
+def answer_choices(question_type, answer_text, option_count=0, option_order=None):
+    """
+    Option counter positions an answer selects: original MCQ option indices, or the
+    TRUE_FALSE_OPTIONS position (parsed as the scorer does). Empty for free-text types.
+    """
+    if question_type == QuestionType.MCQ:
+        return original_choices(answer_text, option_count, option_order)
+    if question_type == QuestionType.TRUE_FALSE:
+        return [0 if (answer_text or '').lower() in ('true', '1', 'yes') else 1]
+    return []
+
+
+class QuizStatsService:
+    """
+    Maintains the denormalized aggregate columns on Quiz and the per-question and score-histogram
+    counters in question_stats, question_option_counts and quiz_score_buckets.
+
+    Every write method issues atomic UPDATEs/upserts in the caller's session and does not commit,
+    so the aggregates change in the same transaction as the question or attempt write.
+    """
+
+    @staticmethod
+    def _bump(quiz_id, *values):
+        # Assigning updated_at to itself keeps its onupdate hook from treating stats as an edit
+        db.session.execute(
+            update(Quiz).where(Quiz.id == quiz_id).ordered_values(*values, (Quiz.updated_at, Quiz.updated_at)),
+            execution_options={'synchronize_session': False}
+        )
+
+    def question_added(self, quiz_id, points):
+        logger.debug(f"Stats: question added to quiz_id={quiz_id}, points={points}")
+        self._bump(
+            quiz_id,
+            (Quiz.question_count, Quiz.question_count + 1),
+            (Quiz.total_points, Quiz.total_points + points)
+        )
+
+    def question_removed(self, quiz_id, points):
+        logger.debug(f"Stats: question removed from quiz_id={quiz_id}, points={points}")
+        self._bump(
+            quiz_id,
+            (Quiz.question_count, Quiz.question_count - 1),
+            (Quiz.total_points, Quiz.total_points - points)
+        )
+
+    def question_points_changed(self, quiz_id, delta):
+        if not delta:
+            return
+        logger.debug(f"Stats: question points changed on quiz_id={quiz_id}, delta={delta}")
+        self._bump(quiz_id, (Quiz.total_points, Quiz.total_points + delta))
+
+    def attempt_started(self, quiz_id):
+        logger.debug(f"Stats: attempt started on quiz_id={quiz_id}")
+        self._bump(quiz_id, (Quiz.attempt_count, Quiz.attempt_count + 1))
+
+    def attempt_submitted(self, quiz_id, score, total_points=None):
+        logger.debug(f"Stats: attempt submitted on quiz_id={quiz_id}, score={score}")
+        # avg_score is assigned first so it reads the old submitted_count on every backend
+        # (MySQL evaluates SET clauses left to right)
+        self._bump(
+            quiz_id,
+            (Quiz.avg_score,
+             (func.coalesce(Quiz.avg_score, 0.0) * Quiz.submitted_count + score) / (Quiz.submitted_count + 1)),
+            (Quiz.submitted_count, Quiz.submitted_count + 1),
+            (Quiz.score_sum_sq, Quiz.score_sum_sq + score * score)
+        )
+
+        bucket = score_bucket(score, total_points)
+        if bucket is not None:
+            increment_counters(QuizScoreBucket, ['quiz_id', 'bucket'], ['count'],
+                               [{'quiz_id': quiz_id, 'bucket': bucket, 'count': 1}])
+
+    def answers_scored(self, quiz_id, scored):
+        """
+        Fold one submission's scored answers into the per-question aggregates.
+
+        Args:
+            quiz_id: Quiz the answers belong to
+            scored: Iterable of dicts with question_id, is_correct, points and choices
+                    (from answer_choices)
+        """
+        scored = list(scored)
+        logger.debug(f"Stats: {len(scored)} answer(s) scored on quiz_id={quiz_id}")
+        increment_counters(
+            QuestionStats, ['question_id'], ['answered_count', 'correct_count', 'points_sum', 'points_sum_sq'],
+            [{
+                'question_id': item['question_id'],
+                'quiz_id': quiz_id,
+                'answered_count': 1,
+                'correct_count': 1 if item['is_correct'] else 0,
+                'points_sum': item['points'] or 0.0,
+                'points_sum_sq': (item['points'] or 0.0) ** 2
+            } for item in scored]
+        )
+        increment_counters(
+            QuestionOptionCount, ['question_id', 'option_index'], ['count'],
+            [{'question_id': item['question_id'], 'option_index': choice, 'count': 1}
+             for item in scored for choice in item['choices']]
+        )
+
+    def survey_submitted(self, quiz_id, responses):
+        """
+        Fold one submitted survey response into the aggregates. Surveys are not scored: this counts
+        the submission and each question's responses and choices, leaving the score aggregates alone.
+
+        Args:
+            quiz_id: Survey the response belongs to
+            responses: Iterable of dicts with question_id and choices (from answer_choices)
+        """
+        logger.debug(f"Stats: survey response submitted on quiz_id={quiz_id}")
+        self._bump(quiz_id, (Quiz.submitted_count, Quiz.submitted_count + 1))
+        self.answers_scored(quiz_id, [
+            {'question_id': item['question_id'], 'is_correct': None, 'points': 0.0, 'choices': item['choices']}
+            for item in responses
+        ])
+
+    def recompute(self, quiz_id=None):
+        """Recompute the aggregates from the source tables; returns the number of quizzes updated"""
+
+        logger.info(f"🔧 Recomputing quiz stats: quiz_id={quiz_id or 'all'}")
+
+        question_totals = db.session.query(
+            Question.quiz_id,
+            func.count(Question.id),
+            func.coalesce(func.sum(Question.points), 0)
+        ).group_by(Question.quiz_id)
+        attempt_totals = db.session.query(
+            Attempt.quiz_id,
+            func.count(Attempt.id),
+            func.sum(db.case((Attempt.status == AttemptStatus.SUBMITTED, 1), else_=0)),
+            func.avg(db.case((Attempt.status == AttemptStatus.SUBMITTED, Attempt.score), else_=None)),
+            func.sum(db.case((Attempt.status == AttemptStatus.SUBMITTED, Attempt.score * Attempt.score), else_=0))
+        ).group_by(Attempt.quiz_id)
+        quiz_ids = db.session.query(Quiz.id)
+
+        if quiz_id is not None:
+            question_totals = question_totals.filter(Question.quiz_id == quiz_id)
+            attempt_totals = attempt_totals.filter(Attempt.quiz_id == quiz_id)
+            quiz_ids = quiz_ids.filter(Quiz.id == quiz_id)
+
+        questions_by_quiz = {row[0]: row[1:] for row in question_totals}
+        attempts_by_quiz = {row[0]: row[1:] for row in attempt_totals}
+
+        updated = 0
+        try:
+            for (qid,) in quiz_ids:
+                question_count, total_points = questions_by_quiz.get(qid, (0, 0))
+                attempt_count, submitted_count, avg_score, score_sum_sq = attempts_by_quiz.get(qid, (0, 0, None, 0))
+                db.session.execute(
+                    update(Quiz).where(Quiz.id == qid).values(
+                        question_count=question_count,
+                        total_points=total_points,
+                        attempt_count=attempt_count,
+                        submitted_count=submitted_count or 0,
+                        avg_score=avg_score,
+                        score_sum_sq=score_sum_sq or 0.0,
+                        updated_at=Quiz.updated_at
+                    ),
+                    execution_options={'synchronize_session': False}
+                )
+                updated += 1
+            self._rebuild_distributions(quiz_id)
+            db.session.commit()
+            logger.info(f"✅ Recomputed stats for {updated} quiz(es)")
+            return updated
+        except Exception as e:
+            logger.error(f"💥 Quiz stats recompute failed: error={str(e)}", exc_info=True)
+            db.session.rollback()
+            raise
+
+    def _rebuild_distributions(self, quiz_id=None):
+        """Rebuild per-question stats, option counters and score buckets from submitted attempts, archived ones included"""
+
+        submitted = [Attempt.status == AttemptStatus.SUBMITTED]
+        question_ids = select(Question.id)
+        if quiz_id is not None:
+            submitted.append(Attempt.quiz_id == quiz_id)
+            question_ids = question_ids.where(Question.quiz_id == quiz_id)
+
+        for stmt in (
+            delete(QuestionOptionCount).where(QuestionOptionCount.question_id.in_(question_ids)),
+            delete(QuestionStats).where(QuestionStats.question_id.in_(question_ids)),
+            delete(QuizScoreBucket).where(QuizScoreBucket.quiz_id == quiz_id) if quiz_id is not None
+            else delete(QuizScoreBucket)
+        ):
+            db.session.execute(stmt, execution_options={'synchronize_session': False})
+
+        question_stats = {row.question_id: row._asdict() for row in db.session.execute(
+            select(
+                Answer.question_id,
+                Question.quiz_id,
+                func.count(Answer.id).label('answered_count'),
+                func.sum(db.case((Answer.is_correct.is_(True), 1), else_=0)).label('correct_count'),
+                func.sum(Answer.points_earned).label('points_sum'),
+                func.sum(Answer.points_earned * Answer.points_earned).label('points_sum_sq')
+            ).join(Attempt, Attempt.id == Answer.attempt_id).join(Question, Question.id == Answer.question_id)
+            .where(*submitted).group_by(Answer.question_id, Question.quiz_id)
+        )}
+
+        # MCQ answers are stored as display positions, so map each back through its attempt's seed
+        choice_questions = {
+            q.id: (q.type, len(q.get_options()))
+            for q in Question.query.filter(
+                Question.type.in_([QuestionType.MCQ, QuestionType.TRUE_FALSE]), Question.id.in_(question_ids)
+            )
+        }
+        choices = Counter()
+        answer_rows = db.session.execute(
+            select(Answer.question_id, Answer.answer_text, Attempt.seed, Attempt.shuffle_options)
+            .join(Attempt, Attempt.id == Answer.attempt_id)
+            .where(*submitted, Answer.question_id.in_(choice_questions.keys())),
+            execution_options={'yield_per': 1000}
+        )
+        for row in answer_rows:
+            self._count_choices(choices, choice_questions, row.question_id, row.answer_text, row)
+
+        # Archived attempts (all submitted) have no answer rows; their answers come from the archive
+        quiz_questions = {}
+        for qid, question_id in db.session.execute(select(Question.quiz_id, Question.id).where(
+                Question.id.in_(question_ids))):
+            quiz_questions.setdefault(qid, set()).add(question_id)
+        archive_service = ArchiveService()
+        for qid in archive_service.archived_quiz_ids(quiz_id):
+            archived = archive_service.iter_archived_attempts(qid, Attempt.seed, Attempt.shuffle_options)
+            for row, answers in archived:
+                for answer in answers:
+                    if answer['question_id'] not in quiz_questions.get(qid, ()):
+                        continue
+                    self._add_question_stats(question_stats, qid, answer)
+                    if answer['question_id'] in choice_questions:
+                        self._count_choices(choices, choice_questions, answer['question_id'],
+                                            answer['answer_text'], row)
+
+        if question_stats:
+            db.session.execute(insert(QuestionStats), list(question_stats.values()))
+        if choices:
+            db.session.execute(insert(QuestionOptionCount), [
+                {'question_id': question_id, 'option_index': option_index, 'count': count}
+                for (question_id, option_index), count in choices.items()
+            ])
+
+        # Buckets are relative to the points in the snapshot each attempt was scored against
+        snapshot_service = SnapshotService()
+        quiz_totals = dict(db.session.query(Quiz.id, Quiz.total_points))
+        snapshot_totals = {}
+        buckets = Counter()
+        attempt_rows = db.session.execute(
+            # Survey responses are not scored and have no score to bucket
+            select(Attempt.quiz_id, Attempt.score, Attempt.snapshot_id).where(*submitted, Attempt.score.isnot(None)),
+            execution_options={'yield_per': 1000}
+        )
+        for row in attempt_rows:
+            possible = quiz_totals.get(row.quiz_id)
+            if row.snapshot_id:
+                if row.snapshot_id not in snapshot_totals:
+                    snapshot = snapshot_service.get_by_id(row.snapshot_id)
+                    snapshot_totals[row.snapshot_id] = (
+                        sum(q.points for q in snapshot.answer_key.values()) if snapshot else None
+                    )
+                possible = snapshot_totals[row.snapshot_id] or possible
+            bucket = score_bucket(row.score, possible)
+            if bucket is not None:
+                buckets[(row.quiz_id, bucket)] += 1
+        if buckets:
+            db.session.execute(insert(QuizScoreBucket), [
+                {'quiz_id': qid, 'bucket': bucket, 'count': count} for (qid, bucket), count in buckets.items()
+            ])
+
+        logger.info(f"Rebuilt distributions: questions={len(question_stats)}, option_counters={len(choices)}, "
+                    f"buckets={len(buckets)}")
+
+    @staticmethod
+    def _add_question_stats(question_stats, quiz_id, answer):
+        """Fold one archived answer into the per-question aggregates the SQL rebuild produced"""
+        stats = question_stats.setdefault(answer['question_id'], {
+            'question_id': answer['question_id'], 'quiz_id': quiz_id, 'answered_count': 0,
+            'correct_count': 0, 'points_sum': None, 'points_sum_sq': None
+        })
+        stats['answered_count'] += 1
+        stats['correct_count'] = (stats['correct_count'] or 0) + (1 if answer['is_correct'] is True else 0)
+        points = answer['points_earned']
+        if points is not None:
+            stats['points_sum'] = (stats['points_sum'] or 0) + points
+            stats['points_sum_sq'] = (stats['points_sum_sq'] or 0) + points * points
+
+    @staticmethod
+    def _count_choices(choices, choice_questions, question_id, answer_text, attempt):
+        question_type, n = choice_questions[question_id]
+        order = None
+        if question_type == QuestionType.MCQ and attempt.shuffle_options and attempt.seed is not None:
+            order = seeded_permutation(attempt.seed, f"options:{question_id}", n)
+        choices.update((question_id, choice) for choice in answer_choices(question_type, answer_text, n, order))
+
+    def summary(self, quiz):
+        """
+        Dashboard statistics read from the maintained aggregates: a handful of indexed lookups,
+        independent of how many attempts the quiz has.
+        """
+
+        n = quiz.submitted_count
+        mean = quiz.avg_score if n else None
+        variance = max(quiz.score_sum_sq / n - mean * mean, 0.0) if n else None
+
+        counts = [0] * SCORE_BUCKETS
+        for bucket in QuizScoreBucket.query.filter_by(quiz_id=quiz.id):
+            if 0 <= bucket.bucket < SCORE_BUCKETS:
+                counts[bucket.bucket] = bucket.count
+
+        questions = Question.query.filter_by(quiz_id=quiz.id).order_by(Question.order, Question.id).all()
+        stats = {s.question_id: s for s in QuestionStats.query.filter_by(quiz_id=quiz.id)}
+        options = {}
+        for row in QuestionOptionCount.query.filter(
+            QuestionOptionCount.question_id.in_([q.id for q in questions if q.type == QuestionType.MCQ])
+        ):
+            options.setdefault(row.question_id, {})[row.option_index] = row.count
+
+        return {
+            'quiz_id': quiz.id,
+            'attempt_count': quiz.attempt_count,
+            'submitted_count': n,
+            'score': {
+                'mean': mean,
+                'variance': variance,
+                'std': math.sqrt(variance) if variance is not None else None,
+                'percentiles': {f"p{p}": _bucket_percentile(counts, p) for p in (10, 25, 50, 75, 90)},
+                'histogram': {'bucket_width_percent': 100 / SCORE_BUCKETS, 'counts': counts}
+            },
+            'questions': [self._question_summary(q, stats.get(q.id), options.get(q.id, {}), n) for q in questions]
+        }
+
+    def survey_summary(self, quiz):
+        """
+        Survey tallies read from the maintained counters: responses per question and, for choice
+        questions, how often each option was picked. No answers are scanned.
+        """
+
+        questions = Question.query.filter_by(quiz_id=quiz.id).order_by(Question.order, Question.id).all()
+        responses = dict(
+            db.session.query(QuestionStats.question_id, QuestionStats.answered_count).filter_by(quiz_id=quiz.id)
+        )
+        options = {}
+        for row in QuestionOptionCount.query.filter(QuestionOptionCount.question_id.in_(
+            [q.id for q in questions if q.type in (QuestionType.MCQ, QuestionType.TRUE_FALSE)]
+        )):
+            options.setdefault(row.question_id, {})[row.option_index] = row.count
+
+        summary = []
+        for question in questions:
+            data = {
+                'question_id': question.id,
+                'type': question.type,
+                'prompt': question.prompt,
+                'responses': responses.get(question.id, 0)
+            }
+            labels = None
+            if question.type == QuestionType.MCQ:
+                labels = question.get_options()
+            elif question.type == QuestionType.TRUE_FALSE:
+                labels = list(TRUE_FALSE_OPTIONS)
+            if labels is not None:
+                counts = options.get(question.id, {})
+                data['options'] = labels
+                data['option_counts'] = [counts.get(i, 0) for i in range(len(labels))]
+            summary.append(data)
+
+        return {
+            'quiz_id': quiz.id,
+            'response_count': quiz.submitted_count,
+            'started_count': quiz.attempt_count,
+            'questions': summary
+        }
+
+    @staticmethod
+    def _question_summary(question, stats, options, submitted_count):
+        answered = stats.answered_count if stats else 0
+        points_sum = stats.points_sum if stats else 0.0
+        mean_points = points_sum / answered if answered else None
+        data = {
+            'question_id': question.id,
+            'type': question.type,
+            'points': question.points,
+            'answered': answered,
+            'correct_count': stats.correct_count if stats else 0,
+            'correct_rate': stats.correct_count / answered if answered else None,
+            # Difficulty (p-value): share of available points earned, unanswered counting as zero
+            'difficulty': points_sum / (submitted_count * question.points)
+            if submitted_count and question.points else None,
+            'mean_points': mean_points,
+            'points_variance': max(stats.points_sum_sq / answered - mean_points ** 2, 0.0) if answered else None
+        }
+        if question.type == QuestionType.MCQ:
+            data['option_counts'] = [options.get(i, 0) for i in range(len(question.get_options()))]
+        return data
+
+
+def _bucket_percentile(counts, percentile):
+    """Percent score at a percentile, interpolated linearly inside the fixed-width bucket"""
+    total = sum(counts)
+    if not total:
+        return None
+    target = percentile / 100 * total
+    cumulative = 0
+    for index, count in enumerate(counts):
+        if count and cumulative + count >= target:
+            return round((index + (target - cumulative) / count) * 100 / SCORE_BUCKETS, 2)
+        cumulative += count
+    return 100.0
+
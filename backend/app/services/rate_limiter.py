@@ -0,0 +1,236 @@
+"""
+Request rate limiting.
+
+Every API request is charged to the route's own policies if it has any (ROUTE_POLICIES), otherwise
+to the default policy, and is rejected if any of them is spent. A policy allows `limit` requests per
+`period` seconds per client, keyed by the authenticated user, by client IP, or by attempt and IP
+for a participant's attempt requests (so a class sharing one NAT address does not share one budget,
+while a per-IP ceiling still bounds a client cycling through attempt ids). Limits use GCRA (a token
+bucket stored as a single "theoretical arrival time" per key): bursts up to the limit are allowed,
+and capacity refills evenly over the period instead of all at once at a window boundary. Each
+check is one O(1) update:
+    memory - a dict per process; each worker enforces the limit separately (default)
+    redis  - one Lua script per request, atomic across every worker (RATE_LIMIT=redis)
+
+Responses carry RateLimit-Limit, RateLimit-Remaining, RateLimit-Reset and RateLimit-Policy headers
+for the request's tightest policy; rejected requests get 429 with Retry-After. If Redis is unreachable, requests are let through.
+"""
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import jwt
+from flask import current_app, g, request
+
+from app.utils.response import ResponseFormatter
+
+logger = logging.getLogger(__name__)
+
+RateLimitPolicy = namedtuple('RateLimitPolicy', ['name', 'limit', 'period', 'key'])
+RateLimitResult = namedtuple('RateLimitResult', ['policy', 'allowed', 'remaining', 'reset', 'retry_after'])
+
+_PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+# Participants' (often anonymous) requests on an attempt: per attempt and IP, under a per-IP ceiling
+_ATTEMPT_POLICIES = ('attempt', 'attempt_ip')
+
+# Endpoints with their own policies, charged in order: sign-in by client IP, Groq-backed generation
+# by user, and participants' attempt traffic, or starting an attempt by IP
+ROUTE_POLICIES = {
+    'auth.login': ('auth',),
+    'auth.register': ('auth',),
+    'questions.generate_questions': ('generate',),
+    'attempts.start_attempt': ('attempt_start',),
+    'attempts.save_answer': _ATTEMPT_POLICIES,
+    'attempts.save_answers_batch': _ATTEMPT_POLICIES,
+    'attempts.record_events': _ATTEMPT_POLICIES,
+    'attempts.update_attempt': _ATTEMPT_POLICIES,
+    'attempts.submit_attempt': _ATTEMPT_POLICIES,
+    'attempts.get_attempt': _ATTEMPT_POLICIES,
+    'attempts.get_attempt_questions': _ATTEMPT_POLICIES,
+}
+
+
+def parse_rate(name, rate, key='user'):
+    """A policy from a rate string such as '10/minute' or '100/hour'"""
+    try:
+        limit, period = rate.split('/')
+        policy = RateLimitPolicy(name, int(limit), _PERIODS[period.strip().rstrip('s')], key)
+    except (ValueError, KeyError):
+        raise ValueError(f"Invalid rate limit for {name}: {rate!r} (expected e.g. '10/minute')")
+    if policy.limit < 1:
+        raise ValueError(f"Invalid rate limit for {name}: {rate!r} (limit must be at least 1)")
+    return policy
+
+
+def _result(policy, allowed, backlog):
+    """
+    Turn a GCRA outcome into header values.
+
+    backlog is how far the key's theoretical arrival time is ahead of now, in seconds: 0 for an
+    idle client, `period` for one that has used its whole burst.
+    """
+    interval = policy.period / policy.limit
+    remaining = max(0, int((policy.period - backlog) // interval)) if allowed else 0
+    retry_after = 0 if allowed else math.ceil(backlog + interval - policy.period)
+    return RateLimitResult(policy, allowed, remaining, math.ceil(backlog), retry_after)
+
+
+class MemoryRateLimiter:
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self._arrivals = OrderedDict()  # key -> theoretical arrival time, least recently used first
+        self._lock = threading.Lock()
+
+    def hit(self, key, policy):
+        interval = policy.period / policy.limit
+        now = time.monotonic()
+        with self._lock:
+            arrival = max(self._arrivals.get(key, now), now)
+            allowed = arrival + interval - now <= policy.period
+            if allowed:
+                arrival += interval
+                self._arrivals[key] = arrival
+                self._arrivals.move_to_end(key)
+            self._prune(now)
+        return _result(policy, allowed, arrival - now)
+
+    def _prune(self, now):
+        # Keys whose arrival time has passed are back to a full bucket, the same as absent. Popping
+        # them from the cold end keeps memory bounded at amortized O(1) per request.
+        while self._arrivals:
+            key, arrival = next(iter(self._arrivals.items()))
+            if arrival > now and len(self._arrivals) <= self.maxsize:
+                break
+            self._arrivals.popitem(last=False)
+
+
+class RedisRateLimiter:
+    # GCRA in one round trip. Uses the server clock, so workers with skewed clocks agree.
+    _SCRIPT = """
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local arrival = tonumber(redis.call('GET', KEYS[1]) or now)
+if arrival < now then
+    arrival = now
+end
+if arrival + interval - now > period then
+    return {0, arrival - now}
+end
+arrival = arrival + interval
+redis.call('SET', KEYS[1], arrival, 'PX', arrival - now)
+return {1, arrival - now}
+"""
+
+    def __init__(self, url):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._gcra = self._redis.register_script(self._SCRIPT)
+
+    def hit(self, key, policy):
+        interval_ms = max(1, round(policy.period * 1000 / policy.limit))
+        allowed, backlog_ms = self._gcra(
+            keys=[f"quickquiz:ratelimit:{key}"], args=[interval_ms, policy.period * 1000]
+        )
+        return _result(policy, bool(allowed), backlog_ms / 1000)
+
+
+def _client_key(policy):
+    ip = request.remote_addr or 'unknown'
+    if policy.key == 'attempt':
+        # Also keyed by IP, so guessing another participant's attempt id cannot spend their budget
+        attempt_id = (request.view_args or {}).get('attempt_id')
+        if attempt_id is not None:
+            return f"{policy.name}:attempt:{attempt_id}:ip:{ip}"
+    if policy.key == 'user':
+        # Authenticated clients share a budget across IPs; the signature is checked so a forged
+        # token cannot pick someone else's bucket. Revocation is left to the route's own check.
+        token = request.headers.get('Authorization', '')
+        token = token.split(' ')[1] if ' ' in token else token
+        if token:
+            try:
+                claims = jwt.decode(token, current_app.config['JWT_SECRET'], algorithms=['HS256'])
+                return f"{policy.name}:user:{claims['user_id']}"
+            except Exception:
+                pass
+    return f"{policy.name}:ip:{ip}"
+
+
+def check_rate_limit():
+    """
+    before_request hook: charge the request to each of its policies, 429 once any budget is spent.
+    Policies after the one that rejects are not charged.
+    """
+    if request.method == 'OPTIONS' or not request.path.startswith('/api/'):
+        return None
+
+    limiter = current_app.extensions['rate_limiter']
+    policies = current_app.extensions['rate_limit_policies']
+    results = []
+    for name in ROUTE_POLICIES.get(request.endpoint, ('default',)):
+        policy = policies[name]
+        key = _client_key(policy)
+        try:
+            result = limiter.hit(key, policy)
+        except Exception as e:
+            logger.warning(f"⚠️ Rate limiter unavailable, allowing request: key={key}, error={str(e)}")
+            return None
+
+        if not result.allowed:
+            g.rate_limit = result
+            logger.warning(f"⚠️ Rate limit exceeded: key={key}, policy={policy.limit}/{policy.period}s")
+            response, status_code = ResponseFormatter.error(
+                message="Too many requests, please slow down", status_code=429
+            )
+            response.headers['Retry-After'] = str(result.retry_after)
+            return response, status_code
+        results.append(result)
+
+    g.rate_limit = min(results, key=lambda result: result.remaining)
+    return None
+
+
+def add_rate_limit_headers(response):
+    """after_request hook: report the request's tightest policy and its remaining budget"""
+    result = g.get('rate_limit')
+    if result is not None:
+        response.headers['RateLimit-Limit'] = str(result.policy.limit)
+        response.headers['RateLimit-Remaining'] = str(result.remaining)
+        response.headers['RateLimit-Reset'] = str(result.reset)
+        response.headers['RateLimit-Policy'] = f"{result.policy.limit};w={result.policy.period}"
+    return response
+
+
+def init_app(app):
+    """Create the configured rate limiter and install its request hooks"""
+    mode = app.config.get('RATE_LIMIT', 'memory')
+    if mode == 'off':
+        logger.info("Rate limiting: off")
+        return None
+    if mode == 'memory':
+        limiter = MemoryRateLimiter(app.config['RATE_LIMIT_MEMORY_SIZE'])
+    elif mode == 'redis':
+        limiter = RedisRateLimiter(app.config['REDIS_URL'])
+    else:
+        raise ValueError(f"Unknown RATE_LIMIT mode: {mode}")
+
+    policies = {
+        'default': parse_rate('default', app.config['RATE_LIMIT_DEFAULT']),
+        'auth': parse_rate('auth', app.config['RATE_LIMIT_AUTH'], key='ip'),
+        'generate': parse_rate('generate', app.config['RATE_LIMIT_GENERATE']),
+        'attempt': parse_rate('attempt', app.config['RATE_LIMIT_ATTEMPT'], key='attempt'),
+        'attempt_ip': parse_rate('attempt_ip', app.config['RATE_LIMIT_ATTEMPT_IP'], key='ip'),
+        'attempt_start': parse_rate('attempt_start', app.config['RATE_LIMIT_ATTEMPT_START'], key='ip'),
+    }
+    app.extensions['rate_limiter'] = limiter
+    app.extensions['rate_limit_policies'] = policies
+    app.before_request(check_rate_limit)
+    app.after_request(add_rate_limit_headers)
+    logger.info(f"Rate limiting: mode={mode}, policies="
+                f"{', '.join(f'{p.name}={p.limit}/{p.period}s' for p in policies.values())}")
+    return limiter
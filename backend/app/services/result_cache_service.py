@@ -0,0 +1,67 @@
+import hashlib
+import json
+import logging
+import time
+
+from app.services.archive_service import ArchiveService
+from app.utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# How long a cached result is served by this process. Invalidation is per-process, so this also
+# bounds how stale another worker's copy can be after a regrade or deletion.
+RESULT_MAX_AGE = 3600
+# Clients revalidate sooner: the rank served alongside the cached result moves as others submit
+RESULT_CLIENT_MAX_AGE = 60
+
+_result_cache = LRUCache(maxsize=2048)
+
+
+class CachedResult:
+    """Serialized to_dict(include_answers=True) of a submitted attempt"""
+
+    __slots__ = ('attempt_id', 'quiz_id', 'score', 'data_json', 'etag', 'cached_at')
+
+    def __init__(self, attempt_id, quiz_id, score, data_json):
+        self.attempt_id = attempt_id
+        self.quiz_id = quiz_id
+        self.score = score
+        self.data_json = data_json
+        self.etag = hashlib.sha1(data_json.encode('utf-8')).hexdigest()
+        self.cached_at = time.monotonic()
+
+    @property
+    def fresh(self):
+        return time.monotonic() - self.cached_at < RESULT_MAX_AGE
+
+
+class ResultCacheService:
+    def __init__(self):
+        self.archive_service = ArchiveService()
+
+    def get(self, attempt_id):
+        """Cached result for a submitted attempt, or None"""
+        entry = _result_cache.get(attempt_id)
+        if entry and not entry.fresh:
+            _result_cache.delete(attempt_id)
+            return None
+        return entry
+
+    def store(self, attempt):
+        """Serialize a submitted attempt's results and cache them"""
+        data_json = json.dumps(self.archive_service.attempt_dict(attempt), separators=(',', ':'))
+        entry = CachedResult(attempt.id, attempt.quiz_id, attempt.score, data_json)
+        _result_cache.set(attempt.id, entry)
+        logger.debug(f"Cached attempt result: attempt_id={attempt.id}, bytes={len(data_json)}")
+        return entry
+
+    def invalidate(self, attempt_id):
+        """Drop one attempt's cached result; call after it is regraded or manually graded"""
+        _result_cache.delete(attempt_id)
+        logger.debug(f"Invalidated attempt result: attempt_id={attempt_id}")
+
+    def invalidate_quiz(self, quiz_id):
+        """Drop cached results for every attempt of a quiz (question or quiz deleted)"""
+        dropped = _result_cache.delete_where(lambda entry: entry.quiz_id == quiz_id)
+        if dropped:
+            logger.debug(f"Invalidated {dropped} attempt result(s): quiz_id={quiz_id}")
@@ -1,9 +1,18 @@
 import logging
+from datetime import datetime
+
+from sqlalchemy import update
 
 from app.extensions import db
-from app.models.attempt import AttemptStatus
+from app.models.attempt import Attempt, AttemptStatus
 from app.models.question import QuestionType
+from app.services.attempt_service import AttemptService
 from app.services.groq_service import GroqService
+from app.services.leaderboard_service import LeaderboardService
+from app.services.live_service import LiveService
+from app.services.quiz_stats_service import QuizStatsService, answer_choices
+from app.services.similarity_service import SimilarityService
+from app.services.snapshot_service import SnapshotService
 
 logger = logging.getLogger(__name__)
 
@@ -11,18 +20,30 @@ logger = logging.getLogger(__name__)
 class ScoringService:
     def __init__(self):
         self.groq_service = GroqService()
-
-    def score_mcq(self, question, user_answer):
-        """Score an MCQ question"""
+        self.attempt_service = AttemptService()
+        self.leaderboard_service = LeaderboardService()
+        self.live_service = LiveService()
+        self.stats_service = QuizStatsService()
+        self.similarity_service = SimilarityService()
+        self.snapshot_service = SnapshotService()
+
+    @staticmethod
+    def _unshuffle(index, option_order):
+        """Map a displayed option index back to the original option index"""
+        if option_order is None or not 0 <= index < len(option_order):
+            return index
+        return option_order[index]
+
+    def score_mcq(self, question, user_answer, option_order=None):
+        """Score an MCQ question; option_order maps displayed option positions to original indices"""
 
         logger.debug(f"📊 Scoring MCQ: question_id={question.id}, user_answer={user_answer}")
 
         correct_answer = question.get_correct_answer()
-        options = question.get_options()
 
         if isinstance(correct_answer, list):
             # Multiple correct answers
-            user_answers = [int(x) for x in user_answer.split(',') if x.isdigit()]
+            user_answers = [self._unshuffle(int(x), option_order) for x in user_answer.split(',') if x.isdigit()]
             user_answers.sort()
             correct_answer.sort()
             is_correct = user_answers == correct_answer
@@ -30,7 +51,7 @@ class ScoringService:
         else:
             # Single correct answer
             try:
-                user_choice = int(user_answer)
+                user_choice = self._unshuffle(int(user_answer), option_order)
                 is_correct = user_choice == correct_answer
                 logger.debug(f"MCQ single choice: user={user_choice}, correct={correct_answer}, result={is_correct}")
             except:
@@ -112,10 +133,10 @@ class ScoringService:
             logger.debug(f"Manual scoring required for question_id={question.id}")
             return None, 0, None
 
-    def score_answer(self, question, user_answer, allow_ai_evaluation=False):
+    def score_answer(self, question, user_answer, allow_ai_evaluation=False, option_order=None):
         """Score an answer based on question type"""
         if question.type == QuestionType.MCQ:
-            return self.score_mcq(question, user_answer)
+            return self.score_mcq(question, user_answer, option_order)
         elif question.type == QuestionType.TRUE_FALSE:
             return self.score_true_false(question, user_answer)
         elif question.type == QuestionType.FILL_BLANK:
@@ -134,27 +155,56 @@ class ScoringService:
             logger.warning(f"⚠️ Attempt already submitted: attempt_id={attempt.id}")
             return attempt  # Already submitted
 
+        # Persist any write-behind answers before scoring reads them
+        self.attempt_service.flush_answers(attempt.id)
+
+        if not self._claim(attempt):
+            logger.warning(f"⚠️ Attempt already submitted: attempt_id={attempt.id}")
+            return attempt
+
         try:
             quiz = attempt.quiz
             allow_ai_evaluation = quiz.settings.allow_ai_evaluation if quiz.settings else False
             logger.debug(f"Scoring attempt with AI evaluation: {allow_ai_evaluation}")
 
+            # Score against the answer key the attempt was started with, not the live questions
+            answer_key = {}
+            if attempt.snapshot_id:
+                snapshot = self.snapshot_service.get_by_id(attempt.snapshot_id)
+                if snapshot:
+                    answer_key = snapshot.answer_key
+
+            if quiz.is_survey:
+                # Surveys are tallied, not scored
+                self._record_survey_response(attempt, answer_key)
+                db.session.commit()
+                self.live_service.survey_response_submitted(attempt.quiz_id)
+                logger.info(f"✅ Survey response submitted: attempt_id={attempt.id}, answers={len(attempt.answers)}")
+                return attempt
+
             total_points = 0
             earned_points = 0
             answered_count = len(attempt.answers)
+            scored = []
+            descriptive = []
 
             logger.info(f"Scoring {answered_count} answer(s) for attempt_id={attempt.id}")
 
             for idx, answer in enumerate(attempt.answers, 1):
-                question = answer.question
+                question = answer_key.get(answer.question_id) or answer.question
                 total_points += question.points
 
                 logger.debug(f"Scoring answer {idx}/{answered_count}: question_id={question.id}, type={question.type}")
 
+                option_order = None
+                if question.type == QuestionType.MCQ:
+                    option_order = attempt.option_order(question.id, len(question.get_options()))
+
                 is_correct, points, feedback = self.score_answer(
                     question,
                     answer.answer_text,
-                    allow_ai_evaluation
+                    allow_ai_evaluation,
+                    option_order
                 )
 
                 answer.is_correct = is_correct
@@ -162,16 +212,25 @@ class ScoringService:
                 if feedback:
                     answer.ai_feedback = feedback
 
+                choices = answer_choices(question.type, answer.answer_text, len(question.get_options()), option_order)
+                scored.append({'question_id': question.id, 'is_correct': is_correct, 'points': points,
+                               'choices': choices})
+                if question.type == QuestionType.DESCRIPTIVE:
+                    descriptive.append((question.id, answer.answer_text))
+
                 earned_points += points
                 logger.debug(f"Answer {idx} scored: points={points}/{question.points}, correct={is_correct}")
 
-            from datetime import datetime
             attempt.score = earned_points
             attempt.total_points = total_points
-            attempt.status = AttemptStatus.SUBMITTED
-            attempt.submitted_at = datetime.utcnow()
+            # Histogram buckets are relative to every question the attempt was given, answered or not
+            possible_points = sum(q.points for q in answer_key.values()) if answer_key else quiz.total_points
+            self.stats_service.attempt_submitted(attempt.quiz_id, earned_points, possible_points)
+            self.stats_service.answers_scored(attempt.quiz_id, scored)
+            self.similarity_service.answers_submitted(attempt, descriptive)
 
             db.session.commit()
+            self.leaderboard_service.record(attempt.quiz_id, attempt.id, earned_points)
 
             percentage = (earned_points / total_points * 100) if total_points > 0 else 0
             logger.info(
@@ -181,3 +240,41 @@ class ScoringService:
             logger.error(f"💥 Attempt submission failed: attempt_id={attempt.id}, error={str(e)}", exc_info=True)
             db.session.rollback()
             raise
+
+    @staticmethod
+    def _claim(attempt):
+        """
+        Move an attempt from IN_PROGRESS to SUBMITTED in one conditional UPDATE, so only one of
+        several concurrent submits (the participant, a retry, the deadline scheduler) scores it.
+        Does not commit: the claim is released if scoring rolls back.
+
+        Returns:
+            True if this call claimed the attempt, False if another submit already had. Then the
+            attempt is reloaded with that submit's result.
+        """
+        claimed = db.session.execute(
+            update(Attempt)
+            .where(Attempt.id == attempt.id, Attempt.status == AttemptStatus.IN_PROGRESS)
+            .values(status=AttemptStatus.SUBMITTED, submitted_at=datetime.utcnow())
+            .execution_options(synchronize_session='evaluate')
+        ).rowcount
+        if not claimed:
+            db.session.rollback()
+            db.session.refresh(attempt)
+        return claimed == 1
+
+    def _record_survey_response(self, attempt, answer_key):
+        """Count a claimed survey attempt's responses and choices. Does not commit."""
+        responses = []
+        for answer in attempt.answers:
+            question = answer_key.get(answer.question_id) or answer.question
+            option_count = len(question.get_options()) if question.type == QuestionType.MCQ else 0
+            option_order = attempt.option_order(question.id, option_count) if option_count else None
+            responses.append({
+                'question_id': question.id,
+                'choices': answer_choices(question.type, answer.answer_text, option_count, option_order)
+            })
+
+        attempt.score = None
+        attempt.total_points = None
+        self.stats_service.survey_submitted(attempt.quiz_id, responses)
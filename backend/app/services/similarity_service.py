@@ -0,0 +1,228 @@
+"""
+Near-duplicate detection for DESCRIPTIVE answers.
+
+Each submitted answer is reduced to word 3-gram shingles and a MinHash signature, stored in
+answer_signatures. Two signatures agree at any position with probability equal to the Jaccard
+similarity of their shingle sets, so the fraction of agreeing positions estimates it.
+
+To avoid comparing every pair, signatures are split into bands (LSH banding) and only answers that
+share an identical band with another answer become candidates; candidates are then scored on their
+full signatures. The band width is picked per request so that pairs at the requested threshold are
+almost never missed, which keeps the work close to linear in the number of answers.
+"""
+import logging
+import re
+import zlib
+
+import numpy as np
+from sqlalchemy import delete, insert, select
+
+from app.extensions import db
+from app.models.attempt import Answer, Attempt, AttemptStatus
+from app.models.question import Question, QuestionType
+from app.models.similarity import SHINGLE_SIZE, SIGNATURE_SIZE, AnswerSignature
+from app.services.archive_service import ArchiveService
+from app.utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLD = 0.8
+MIN_THRESHOLD = 0.1
+MAX_PAIRS_PER_QUESTION = 100
+# Very short answers ("I don't know") match by chance and are not indexed
+MIN_SHINGLES = 5
+# Probability that a pair exactly at the threshold shares at least one band
+_TARGET_RECALL = 0.99
+
+# Hash family h(x) = (a * x + b) mod p over 32-bit shingle hashes; a * x + b stays below 2**64.
+# Fixed seed: stored signatures are only comparable while these coefficients never change.
+_PRIME = np.uint64(4294967311)
+_rng = np.random.default_rng(20240611)
+_A = _rng.integers(1, 2 ** 32, size=SIGNATURE_SIZE, dtype=np.uint64)
+_B = _rng.integers(0, 2 ** 32, size=SIGNATURE_SIZE, dtype=np.uint64)
+del _rng
+
+_WORD = re.compile(r'\w+')
+
+# Keyed by the quiz's submitted_count, so every submission invalidates its reports
+_pairs_cache = LRUCache(maxsize=128)
+
+
+def shingles(text):
+    """Set of lowercase word SHINGLE_SIZE-grams of an answer"""
+    words = _WORD.findall((text or '').lower())
+    return {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def minhash(text):
+    """MinHash signature (uint32 array of SIGNATURE_SIZE) of an answer, or None if it is too short"""
+    grams = shingles(text)
+    if len(grams) < MIN_SHINGLES:
+        return None
+    hashes = np.fromiter((zlib.crc32(gram.encode('utf-8')) for gram in grams), dtype=np.uint64, count=len(grams))
+    values = (_A[:, None] * hashes[None, :] + _B[:, None]) % _PRIME
+    return (values.min(axis=1) & np.uint64(0xFFFFFFFF)).astype('<u4')
+
+
+def band_rows(threshold):
+    """Rows per LSH band: the widest bands that still catch pairs at the threshold with _TARGET_RECALL"""
+    rows = 1
+    for candidate in (2, 4, 8, 16, 32):
+        bands = SIGNATURE_SIZE // candidate
+        if 1 - (1 - threshold ** candidate) ** bands < _TARGET_RECALL:
+            break
+        rows = candidate
+    return rows
+
+
+def similar_pairs(signatures, threshold):
+    """
+    Pairs of rows of a signature matrix whose estimated Jaccard similarity is at least threshold.
+    Returns (left, right, similarity) arrays, left < right.
+    """
+    count = len(signatures)
+    rows = band_rows(threshold)
+    keys = []
+    for start in range(0, SIGNATURE_SIZE, rows):
+        band = np.ascontiguousarray(signatures[:, start:start + rows]).view(np.dtype((np.void, 4 * rows))).ravel()
+        _, bucket, sizes = np.unique(band, return_inverse=True, return_counts=True)
+        shared = np.flatnonzero(sizes[bucket] > 1)
+        if not len(shared):
+            continue
+        # Group the answers that share a bucket and emit each group's pairs
+        shared = shared[np.argsort(bucket[shared], kind='stable')]
+        for group in np.split(shared, np.flatnonzero(np.diff(bucket[shared])) + 1):
+            left, right = np.triu_indices(len(group), 1)
+            keys.append(group[left] * count + group[right])
+
+    if not keys:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0)
+
+    keys = np.unique(np.concatenate(keys))
+    left, right = keys // count, keys % count
+    similarity = (signatures[left] == signatures[right]).mean(axis=1)
+    keep = similarity >= threshold
+    return left[keep], right[keep], similarity[keep]
+
+
+class SimilarityService:
+    def answers_submitted(self, attempt, answers):
+        """
+        Index the DESCRIPTIVE answers of a just-submitted attempt. Does not commit.
+
+        Args:
+            attempt: The submitted attempt
+            answers: Iterable of (question_id, answer_text)
+        """
+        rows = []
+        for question_id, answer_text in answers:
+            signature = minhash(answer_text)
+            if signature is not None:
+                rows.append({'attempt_id': attempt.id, 'question_id': question_id, 'quiz_id': attempt.quiz_id,
+                             'signature': signature.tobytes()})
+        if rows:
+            db.session.execute(insert(AnswerSignature), rows)
+            logger.debug(f"Indexed {len(rows)} answer signature(s): attempt_id={attempt.id}")
+
+    def rebuild(self, quiz_id=None):
+        """Recompute the signatures of submitted DESCRIPTIVE answers (archived ones included), for one quiz or all"""
+
+        logger.info(f"🔁 Rebuilding answer signatures: quiz_id={quiz_id}")
+
+        try:
+            stmt = delete(AnswerSignature)
+            query = select(Answer.attempt_id, Answer.question_id, Attempt.quiz_id, Answer.answer_text).join(
+                Attempt, Attempt.id == Answer.attempt_id
+            ).join(Question, Question.id == Answer.question_id).where(
+                Attempt.status == AttemptStatus.SUBMITTED,
+                Question.type == QuestionType.DESCRIPTIVE
+            )
+            if quiz_id is not None:
+                stmt = stmt.where(AnswerSignature.quiz_id == quiz_id)
+                query = query.where(Attempt.quiz_id == quiz_id)
+            db.session.execute(stmt, execution_options={'synchronize_session': False})
+
+            indexed, rows = 0, []
+            for attempt_id, question_id, qid, answer_text in self._descriptive_answers(query, quiz_id):
+                signature = minhash(answer_text)
+                if signature is None:
+                    continue
+                rows.append({'attempt_id': attempt_id, 'question_id': question_id, 'quiz_id': qid,
+                             'signature': signature.tobytes()})
+                if len(rows) >= 1000:
+                    db.session.execute(insert(AnswerSignature), rows)
+                    indexed, rows = indexed + len(rows), []
+            if rows:
+                db.session.execute(insert(AnswerSignature), rows)
+                indexed += len(rows)
+
+            db.session.commit()
+            logger.info(f"✅ Rebuilt {indexed} answer signature(s)")
+            return indexed
+        except Exception as e:
+            logger.error(f"💥 Answer signature rebuild failed: error={str(e)}", exc_info=True)
+            db.session.rollback()
+            raise
+
+    @staticmethod
+    def _descriptive_answers(query, quiz_id):
+        """(attempt_id, question_id, quiz_id, answer_text) from the answers table, then from the archives"""
+        for row in db.session.execute(query.execution_options(yield_per=1000)):
+            yield row.attempt_id, row.question_id, row.quiz_id, row.answer_text
+
+        archive_service = ArchiveService()
+        for qid in archive_service.archived_quiz_ids(quiz_id):
+            descriptive = set(db.session.scalars(select(Question.id).where(
+                Question.quiz_id == qid, Question.type == QuestionType.DESCRIPTIVE
+            )))
+            if not descriptive:
+                continue
+            for row, answers in archive_service.iter_archived_attempts(qid):
+                for answer in answers:
+                    if answer['question_id'] in descriptive:
+                        yield row.id, answer['question_id'], qid, answer['answer_text']
+
+    def get_similar_answers(self, quiz, threshold=DEFAULT_THRESHOLD, question_id=None):
+        """Likely-copied answer pairs per DESCRIPTIVE question, most similar first"""
+
+        key = (quiz.id, quiz.created_at, quiz.submitted_count, threshold, question_id)
+        report = _pairs_cache.get(key)
+        if report is not None:
+            logger.debug(f"Similarity cache hit: quiz_id={quiz.id}")
+            return report
+
+        logger.info(f"🔎 Finding similar answers: quiz_id={quiz.id}, threshold={threshold}, question_id={question_id}")
+
+        query = select(AnswerSignature.question_id, AnswerSignature.attempt_id, AnswerSignature.signature).where(
+            AnswerSignature.quiz_id == quiz.id
+        ).order_by(AnswerSignature.question_id, AnswerSignature.attempt_id)
+        if question_id is not None:
+            query = query.where(AnswerSignature.question_id == question_id)
+
+        by_question = {}
+        for row in db.session.execute(query):
+            by_question.setdefault(row.question_id, []).append((row.attempt_id, row.signature))
+
+        questions = []
+        for qid, entries in by_question.items():
+            attempt_ids = np.array([attempt_id for attempt_id, _ in entries], dtype=np.int64)
+            signatures = np.frombuffer(b''.join(signature for _, signature in entries), dtype='<u4').reshape(
+                len(entries), SIGNATURE_SIZE
+            )
+            left, right, similarity = similar_pairs(signatures, threshold)
+            top = np.argsort(-similarity, kind='stable')[:MAX_PAIRS_PER_QUESTION]
+            questions.append({
+                'question_id': qid,
+                'indexed_answers': len(entries),
+                'pair_count': int(len(similarity)),
+                'pairs': [
+                    {'attempt_ids': [int(attempt_ids[left[k]]), int(attempt_ids[right[k]])],
+                     'similarity': round(float(similarity[k]), 4)}
+                    for k in top
+                ]
+            })
+
+        report = {'quiz_id': quiz.id, 'threshold': threshold, 'questions': questions}
+        _pairs_cache.set(key, report)
+        return report
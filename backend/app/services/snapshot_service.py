@@ -0,0 +1,132 @@
+import json
+import logging
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models.question import Question
+from app.models.quiz import Quiz
+from app.models.snapshot import QuizSnapshot
+from app.utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Snapshots never change once written, so cached entries never need invalidation
+_snapshot_cache = LRUCache(maxsize=512)
+
+
+class SnapshotQuestion:
+    """Read-only question built from a snapshot answer key; quacks like Question for the scorers"""
+
+    def __init__(self, question_id, entry):
+        self.id = question_id
+        self.type = entry['type']
+        self.prompt = entry['prompt']
+        self.points = entry['points']
+        self._options = entry['options']
+        self._correct_answer = entry['correct_answer']
+
+    def get_options(self):
+        return list(self._options)
+
+    def get_correct_answer(self):
+        # Scorers sort list answers in place, so hand out a copy
+        answer = self._correct_answer
+        return list(answer) if isinstance(answer, list) else answer
+
+
+class CompiledSnapshot:
+    """Cached form of a QuizSnapshot: raw questions JSON plus the compiled answer key"""
+
+    def __init__(self, snapshot):
+        self.id = snapshot.id
+        self.quiz_id = snapshot.quiz_id
+        self.version = snapshot.version
+        self.questions_json = snapshot.questions_json
+        self.questions = json.loads(snapshot.questions_json)  # shared: copy before modifying
+        self.answer_key = {
+            qid: SnapshotQuestion(qid, entry) for qid, entry in snapshot.get_answer_key().items()
+        }
+
+
+class SnapshotService:
+    def content_changed(self, quiz_id):
+        """Bump the quiz content version; the next reader publishes a new snapshot. Does not commit."""
+        logger.debug(f"Quiz content changed: quiz_id={quiz_id}")
+        db.session.execute(
+            update(Quiz).where(Quiz.id == quiz_id).values(content_version=Quiz.content_version + 1),
+            execution_options={'synchronize_session': False}
+        )
+
+    def get_current(self, quiz):
+        """Get the snapshot for the quiz's current content version, publishing it if needed"""
+
+        # created_at guards against SQLite reusing the id of a deleted quiz
+        key = ('quiz', quiz.id, quiz.created_at, quiz.content_version)
+        compiled = _snapshot_cache.get(key)
+        if compiled:
+            return compiled
+
+        snapshot = QuizSnapshot.query.filter_by(quiz_id=quiz.id, version=quiz.content_version).first()
+        if not snapshot:
+            snapshot = self._publish(quiz)
+        compiled = self._remember(snapshot)
+        _snapshot_cache.set(key, compiled)
+        return compiled
+
+    def get_by_id(self, snapshot_id):
+        """Get a compiled snapshot by id"""
+
+        compiled = _snapshot_cache.get(('id', snapshot_id))
+        if compiled:
+            return compiled
+
+        snapshot = QuizSnapshot.query.get(snapshot_id)
+        if not snapshot:
+            logger.warning(f"⚠️ Snapshot not found: snapshot_id={snapshot_id}")
+            return None
+        return self._remember(snapshot)
+
+    def _publish(self, quiz):
+        quiz_id, version = quiz.id, quiz.content_version
+        logger.info(f"📸 Publishing quiz snapshot: quiz_id={quiz_id}, version={version}")
+
+        questions = Question.query.filter_by(quiz_id=quiz_id).order_by(Question.order).all()
+        answer_key = {
+            str(q.id): {
+                'type': q.type,
+                'prompt': q.prompt,
+                'points': q.points,
+                'options': q.get_options(),
+                'correct_answer': q.get_correct_answer()
+            }
+            for q in questions
+        }
+        snapshot = QuizSnapshot(
+            quiz_id=quiz_id,
+            version=version,
+            questions_json=json.dumps([q.to_dict() for q in questions], separators=(',', ':')),
+            answer_key_json=json.dumps(answer_key, separators=(',', ':'))
+        )
+
+        try:
+            db.session.add(snapshot)
+            db.session.commit()
+            logger.info(f"✅ Snapshot published: snapshot_id={snapshot.id}, quiz_id={quiz_id}, version={version}")
+            return snapshot
+        except IntegrityError:
+            # Another request published this version first; theirs is identical
+            db.session.rollback()
+            logger.debug(f"Snapshot already published concurrently: quiz_id={quiz_id}, version={version}")
+            return QuizSnapshot.query.filter_by(quiz_id=quiz_id, version=version).one()
+        except Exception as e:
+            logger.error(f"💥 Snapshot publish failed: quiz_id={quiz_id}, error={str(e)}", exc_info=True)
+            db.session.rollback()
+            raise
+
+    @staticmethod
+    def _remember(snapshot):
+        compiled = CompiledSnapshot(snapshot)
+        _snapshot_cache.set(('id', compiled.id), compiled)
+        return compiled
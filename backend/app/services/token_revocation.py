@@ -0,0 +1,184 @@
+"""
+JWT revocation (logout, compromised tokens).
+
+Every token carries a jti. Revoking a token inserts its jti into revoked_tokens, where it stays until
+the token would have expired anyway. Each worker keeps a bloom filter of revoked jtis, so the
+check for a token that was never revoked (nearly every request) does no I/O. Only filter hits are
+confirmed against the table.
+
+The filter is loaded on first use. At most every TOKEN_REVOCATION_REFRESH_SECONDS it is topped up
+with rows revoked since the last refresh, which picks up revocations made by other workers. With
+TOKEN_REVOCATION_SYNC=redis each revocation is also published on a pub/sub channel, so every
+worker adds it at once. Once it holds more entries than it was sized for (TOKEN_REVOCATION_CAPACITY,
+or twice the unexpired rows if larger) the filter is rebuilt from the unexpired rows.
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models.revoked_token import RevokedToken
+from app.utils.bloom_filter import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+# Incremental refreshes re-read this much before the previous one, covering commits in flight
+_REFRESH_OVERLAP = timedelta(seconds=5)
+
+
+class RevocationFilter:
+    """A worker's bloom filter of revoked jtis, kept in step with revoked_tokens"""
+
+    def __init__(self, capacity=100000, refresh_seconds=30, error_rate=0.001):
+        self.capacity = capacity
+        self.refresh_seconds = refresh_seconds
+        self.error_rate = error_rate
+        self._filter = None
+        self._loaded_until = None  # wall-clock time the last refresh query covered
+        self._checked_at = float('-inf')
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        monotonic_now = time.monotonic()
+        if (self._filter is not None and self._filter.count < self._filter.capacity
+                and monotonic_now - self._checked_at < self.refresh_seconds):
+            return
+        with self._lock:
+            if self._filter is None or self._filter.count >= self._filter.capacity:
+                self._rebuild()
+            elif monotonic_now - self._checked_at >= self.refresh_seconds:
+                since, self._loaded_until = self._loaded_until - _REFRESH_OVERLAP, datetime.utcnow()
+                jtis = db.session.scalars(select(RevokedToken.jti).where(RevokedToken.revoked_at >= since)).all()
+                for jti in jtis:
+                    self._filter.add(jti)
+            self._checked_at = monotonic_now
+
+    def _rebuild(self):
+        now = datetime.utcnow()
+        jtis = db.session.scalars(select(RevokedToken.jti).where(RevokedToken.expires_at > now)).all()
+        bloom = BloomFilter(max(self.capacity, len(jtis) * 2), self.error_rate)
+        for jti in jtis:
+            bloom.add(jti)
+        self._filter, self._loaded_until = bloom, now
+        logger.info(f"Revocation filter loaded: revoked_tokens={len(jtis)}")
+
+    def might_contain(self, jti):
+        self._refresh()
+        return jti in self._filter
+
+    def add(self, jti):
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(jti)
+
+    def publish(self, jti):
+        """Tell the other workers about a revocation; without a channel they catch up on refresh"""
+
+
+class RedisRevocationFilter(RevocationFilter):
+    CHANNEL = 'quickquiz:revoked-tokens'
+
+    def __init__(self, url, capacity=100000, refresh_seconds=30, error_rate=0.001):
+        import redis
+        super().__init__(capacity, refresh_seconds, error_rate)
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+        self._listener = threading.Thread(target=self._listen, name='revocation-listener', daemon=True)
+        self._listener.start()
+
+    def publish(self, jti):
+        self._redis.publish(self.CHANNEL, jti)
+
+    def _listen(self):
+        """Add revocations published by any worker to this worker's filter"""
+        while True:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self.CHANNEL)
+                for message in pubsub.listen():
+                    self.add(message['data'])
+            except Exception as e:
+                # Revocations missed meanwhile arrive with the next periodic refresh
+                logger.error(f"💥 Revocation listener lost its Redis connection, retrying: error={str(e)}")
+                time.sleep(1)
+            finally:
+                pubsub.close()
+
+
+class TokenRevocationService:
+    @staticmethod
+    def _filter():
+        return current_app.extensions['token_revocation']
+
+    def is_revoked(self, jti):
+        """Whether a token id was revoked; a database lookup only for bloom filter hits"""
+        if not self._filter().might_contain(jti):
+            return False
+        return db.session.get(RevokedToken, jti) is not None
+
+    def revoke(self, jti, expires_at, user_id=None):
+        """
+        Revoke a token until its expiry.
+
+        Args:
+            jti: The token's jti claim
+            expires_at: The token's exp, as a naive UTC datetime
+            user_id: The token's user, if known
+
+        Returns:
+            (True, error)
+        """
+
+        logger.info(f"🚫 Revoking token: user_id={user_id}, jti={jti}")
+
+        if db.session.get(RevokedToken, jti) is None:
+            try:
+                db.session.add(RevokedToken(jti=jti, user_id=user_id, expires_at=expires_at))
+                db.session.commit()
+            except Exception as e:
+                logger.error(f"💥 Token revocation failed: jti={jti}, error={str(e)}", exc_info=True)
+                db.session.rollback()
+                raise
+
+        revocations = self._filter()
+        revocations.add(jti)
+        try:
+            revocations.publish(jti)
+        except Exception as e:
+            logger.warning(f"⚠️ Revocation publish failed, workers will catch up on refresh: error={str(e)}")
+        logger.info(f"✅ Token revoked: user_id={user_id}, jti={jti}")
+        return True, None
+
+    def purge_expired(self):
+        """Delete revocations of tokens that have expired anyway"""
+        try:
+            deleted = RevokedToken.query.filter(RevokedToken.expires_at <= datetime.utcnow()).delete(
+                synchronize_session=False
+            )
+            db.session.commit()
+            logger.info(f"✅ Purged {deleted} expired token revocation(s)")
+            return deleted
+        except Exception as e:
+            logger.error(f"💥 Revocation purge failed: error={str(e)}", exc_info=True)
+            db.session.rollback()
+            raise
+
+
+def init_app(app):
+    """Create the configured revocation filter; it loads from the database on first use"""
+    mode = app.config.get('TOKEN_REVOCATION_SYNC', 'memory')
+    capacity = app.config['TOKEN_REVOCATION_CAPACITY']
+    refresh_seconds = app.config['TOKEN_REVOCATION_REFRESH_SECONDS']
+    if mode == 'memory':
+        revocations = RevocationFilter(capacity, refresh_seconds)
+    elif mode == 'redis':
+        revocations = RedisRevocationFilter(app.config['REDIS_URL'], capacity, refresh_seconds)
+    else:
+        raise ValueError(f"Unknown TOKEN_REVOCATION_SYNC mode: {mode}")
+
+    app.extensions['token_revocation'] = revocations
+    logger.info(f"Token revocation: sync={mode}, refresh={refresh_seconds}s")
+    return revocations
@@ -0,0 +1,181 @@
+"""
+Cache of authenticated users, so token checks do not query the users table on every request.
+
+token_required and optional_token resolve a token's user id to an AuthUser: a lightweight record
+of the user's profile fields. Routes that need the ORM object call AuthUser.load().
+    memory - per-process TTL cache, bounded to USER_CACHE_SIZE users (default)
+    redis  - shared by every worker (USER_CACHE=redis), so an invalidation reaches all of them
+
+Entries expire after USER_CACHE_TTL_SECONDS. A committed ORM update or delete of a User drops its
+entry. With the memory backend only the committing process is invalidated; others serve their copy
+until it expires. Bulk UPDATE/DELETE statements bypass ORM events and must call invalidate_user().
+"""
+import json
+import logging
+import time
+from datetime import datetime
+
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.extensions import db
+from app.models.user import User
+from app.utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = 'user_cache_invalidations'
+
+
+class AuthUser:
+    """The profile fields of an authenticated user"""
+
+    __slots__ = ('id', 'email', 'name', 'created_at')
+
+    def __init__(self, id, email, name, created_at):
+        self.id = id
+        self.email = email
+        self.name = name
+        self.created_at = created_at
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(user.id, user.email, user.name, user.created_at)
+
+    def load(self):
+        """The ORM User, for routes that need relationships or want to modify the user"""
+        return db.session.get(User, self.id)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'email': self.email,
+            'name': self.name,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, raw):
+        data = json.loads(raw)
+        created_at = datetime.fromisoformat(data['created_at']) if data['created_at'] else None
+        return cls(data['id'], data['email'], data['name'], created_at)
+
+
+class MemoryUserCache:
+    def __init__(self, ttl_seconds=60, maxsize=10000):
+        self.ttl_seconds = ttl_seconds
+        self._users = LRUCache(maxsize=maxsize)
+
+    def get(self, user_id):
+        entry = self._users.get(user_id)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if time.monotonic() >= expires_at:
+            self._users.delete(user_id)
+            return None
+        return user
+
+    def set(self, user):
+        self._users.set(user.id, (time.monotonic() + self.ttl_seconds, user))
+
+    def invalidate(self, user_id):
+        self._users.delete(user_id)
+
+
+class RedisUserCache:
+    def __init__(self, url, ttl_seconds=60):
+        import redis
+
+        self.ttl_seconds = ttl_seconds
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+
+    @staticmethod
+    def _key(user_id):
+        return f"quickquiz:user:{user_id}"
+
+    def get(self, user_id):
+        raw = self._redis.get(self._key(user_id))
+        return AuthUser.from_json(raw) if raw else None
+
+    def set(self, user):
+        self._redis.set(self._key(user.id), user.to_json(), ex=self.ttl_seconds)
+
+    def invalidate(self, user_id):
+        self._redis.delete(self._key(user_id))
+
+
+def get_auth_user(user_id):
+    """The AuthUser for a user id, from the cache or the database; None if the user does not exist"""
+    cache = current_app.extensions['user_cache']
+    try:
+        user = cache.get(user_id)
+        if user is not None:
+            return user
+    except Exception as e:
+        # An unavailable cache costs a query, not the request
+        logger.warning(f"⚠️ User cache read failed: user_id={user_id}, error={str(e)}")
+        cache = None
+
+    row = db.session.get(User, user_id)
+    if row is None:
+        return None
+    user = AuthUser.from_user(row)
+    if cache is not None:
+        try:
+            cache.set(user)
+        except Exception as e:
+            logger.warning(f"⚠️ User cache write failed: user_id={user_id}, error={str(e)}")
+    return user
+
+
+def invalidate_user(user_id):
+    """Drop a user's cached record; call after changing or deleting the user"""
+    try:
+        current_app.extensions['user_cache'].invalidate(user_id)
+        logger.debug(f"Invalidated cached user: user_id={user_id}")
+    except Exception as e:
+        logger.warning(f"⚠️ User cache invalidation failed: user_id={user_id}, error={str(e)}")
+
+
+def _user_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(target.id)
+
+
+def _after_commit(session):
+    user_ids = session.info.pop(_PENDING_KEY, None)
+    if user_ids and has_app_context() and 'user_cache' in current_app.extensions:
+        for user_id in user_ids:
+            invalidate_user(user_id)
+
+
+def _after_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def init_app(app):
+    """Create the configured user cache backend and invalidate it on committed user changes"""
+    mode = app.config.get('USER_CACHE', 'memory')
+    ttl_seconds = app.config['USER_CACHE_TTL_SECONDS']
+    if mode == 'memory':
+        cache = MemoryUserCache(ttl_seconds, app.config['USER_CACHE_SIZE'])
+    elif mode == 'redis':
+        cache = RedisUserCache(app.config['REDIS_URL'], ttl_seconds)
+    else:
+        raise ValueError(f"Unknown USER_CACHE mode: {mode}")
+
+    if not event.contains(User, 'after_update', _user_changed):
+        event.listen(User, 'after_update', _user_changed)
+        event.listen(User, 'after_delete', _user_changed)
+        event.listen(Session, 'after_commit', _after_commit)
+        event.listen(Session, 'after_rollback', _after_rollback)
+
+    app.extensions['user_cache'] = cache
+    logger.info(f"User cache backend: mode={mode}, ttl={ttl_seconds}s")
+    return cache
@@ -1,9 +1,16 @@
 from functools import wraps
 
 import jwt
-from flask import request, jsonify, current_app
+from flask import request, jsonify, current_app, g
 
-from app.models.user import User
+from app.services.token_revocation import TokenRevocationService
+from app.services.user_cache import get_auth_user
+
+
+def _is_revoked(claims):
+    # Tokens issued before jti was added cannot be revoked; they stay valid until they expire
+    jti = claims.get('jti')
+    return jti is not None and TokenRevocationService().is_revoked(jti)
 
 
 def token_required(f):
@@ -20,7 +27,11 @@ def token_required(f):
         try:
             token = token.split(' ')[1] if ' ' in token else token  # Remove 'Bearer ' prefix if present
             data = jwt.decode(token, current_app.config['JWT_SECRET'], algorithms=['HS256'])
-            current_user = User.query.get(data['user_id'])
+            if _is_revoked(data):
+                return jsonify({'message': 'Token has been revoked'}), 401
+            g.token_claims = data
+            # A cached AuthUser; routes that need the ORM object call current_user.load()
+            current_user = get_auth_user(data['user_id'])
             if not current_user:
                 return jsonify({'message': 'User not found'}), 401
         except jwt.ExpiredSignatureError:
@@ -51,7 +62,9 @@ def optional_token(f):
             try:
                 token = token.split(' ')[1] if ' ' in token else token
                 data = jwt.decode(token, current_app.config['JWT_SECRET'], algorithms=['HS256'])
-                current_user = User.query.get(data['user_id'])
+                if not _is_revoked(data):
+                    g.token_claims = data
+                    current_user = get_auth_user(data['user_id'])
             except:
                 pass  # Continue without user if token is invalid
 
@@ -0,0 +1,114 @@
+"""
+Order-statistic tree: a treap whose nodes carry subtree sizes, so inserts, deletes and
+"how many keys are smaller than k" all run in expected O(log n).
+"""
+import random
+
+
+class _Node:
+    __slots__ = ('key', 'priority', 'left', 'right', 'size')
+
+    def __init__(self, key):
+        self.key = key
+        self.priority = random.random()
+        self.left = None
+        self.right = None
+        self.size = 1
+
+
+def _size(node):
+    return node.size if node else 0
+
+
+def _update(node):
+    node.size = 1 + _size(node.left) + _size(node.right)
+    return node
+
+
+def _split(node, key):
+    """Split into (keys < key, keys >= key)"""
+    if node is None:
+        return None, None
+    if node.key < key:
+        left, right = _split(node.right, key)
+        node.right = left
+        return _update(node), right
+    left, right = _split(node.left, key)
+    node.left = right
+    return left, _update(node)
+
+
+def _merge(left, right):
+    """Merge two treaps where every key in left is smaller than every key in right"""
+    if left is None or right is None:
+        return left or right
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        return _update(left)
+    right.left = _merge(left, right.left)
+    return _update(right)
+
+
+def _delete(node, key):
+    if node is None:
+        return None, False
+    if key < node.key:
+        node.left, removed = _delete(node.left, key)
+    elif node.key < key:
+        node.right, removed = _delete(node.right, key)
+    else:
+        return _merge(node.left, node.right), True
+    return _update(node), removed
+
+
+class OrderStatisticTree:
+    """Sorted multiset of unique, mutually comparable keys"""
+
+    def __init__(self, keys=()):
+        self._root = None
+        for key in keys:
+            self.insert(key)
+
+    def __len__(self):
+        return _size(self._root)
+
+    def insert(self, key):
+        """Insert key; does nothing if it is already present"""
+        left, right = _split(self._root, key)
+        if right is not None and self._min(right) == key:
+            self._root = _merge(left, right)
+            return
+        self._root = _merge(_merge(left, _Node(key)), right)
+
+    def remove(self, key):
+        """Remove key; returns whether it was present"""
+        self._root, removed = _delete(self._root, key)
+        return removed
+
+    def count_less(self, key):
+        """Number of keys strictly smaller than key"""
+        count, node = 0, self._root
+        while node:
+            if node.key < key:
+                count += _size(node.left) + 1
+                node = node.right
+            else:
+                node = node.left
+        return count
+
+    def iter_from_smallest(self):
+        """Yield keys in ascending order; stopping early costs only the keys consumed"""
+        stack, node = [], self._root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key
+            node = node.right
+
+    @staticmethod
+    def _min(node):
+        while node.left:
+            node = node.left
+        return node.key
@@ -0,0 +1,77 @@
+"""
+Keyset (cursor) pagination helpers.
+Listings are ordered by a timestamp column plus the primary key, newest first, so a page
+is a single indexed range scan no matter how deep the client has paged.
+"""
+import base64
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(timestamp, row_id):
+    """Encode a (timestamp, id) position as an opaque URL-safe cursor"""
+    raw = f"{timestamp.isoformat()}|{row_id}".encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor, raising ValueError if it is malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8')
+        timestamp, row_id = raw.split('|', 1)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def parse_page_args(args):
+    """Read `limit` and `cursor` from request args, raising ValueError on bad input"""
+    limit = args.get('limit', DEFAULT_PAGE_SIZE)
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    limit = min(limit, MAX_PAGE_SIZE)
+
+    cursor = args.get('cursor') or None
+    if cursor is not None:
+        decode_cursor(cursor)  # validate early so routes can return 400
+    return limit, cursor
+
+
+def keyset_paginate(query, sort_column, id_column, limit, cursor=None):
+    """
+    Apply descending keyset pagination on (sort_column, id_column).
+
+    Args:
+        query: SQLAlchemy query to paginate
+        sort_column: Timestamp column the listing is ordered by
+        id_column: Primary key column used as a tie-breaker
+        limit: Maximum number of rows to return
+        cursor: Cursor returned with the previous page, or None for the first page
+
+    Returns:
+        Tuple of (rows, next_cursor); next_cursor is None on the last page
+    """
+    if cursor:
+        timestamp, row_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            sort_column < timestamp,
+            and_(sort_column == timestamp, id_column < row_id)
+        ))
+
+    rows = query.order_by(sort_column.desc(), id_column.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+    return rows, next_cursor
@@ -0,0 +1,45 @@
+"""
+Deterministic per-attempt permutations.
+An attempt stores only a seed; question and option orders are re-derived from it on demand,
+so nothing per-participant is ever written beyond the seed itself.
+"""
+import random
+import secrets
+
+
+def new_seed():
+    """Random seed that fits a 32-bit signed integer column"""
+    return secrets.randbits(31)
+
+
+def seeded_permutation(seed, salt, n):
+    """
+    Return a permutation of range(n) derived from (seed, salt) with an O(n) Fisher-Yates shuffle.
+    Position i of the result holds the original index shown at display position i.
+    """
+    order = list(range(n))
+    random.Random(f"{seed}:{salt}").shuffle(order)
+    return order
+
+
+def invert(order):
+    """Map original index -> display position for a permutation from seeded_permutation"""
+    inverse = [0] * len(order)
+    for position, original in enumerate(order):
+        inverse[original] = position
+    return inverse
+
+
+def original_choices(answer_text, option_count, option_order=None):
+    """
+    Parse a stored MCQ answer ("2" or "0,2", display positions) into original option indices.
+    Positions outside the question's options are dropped.
+    """
+    choices = []
+    for part in (answer_text or '').split(','):
+        part = part.strip()
+        if not part.isdigit() or int(part) >= option_count:
+            continue
+        position = int(part)
+        choices.append(option_order[position] if option_order is not None else position)
+    return choices
@@ -2,9 +2,10 @@
 Utility class for formatting standardized API responses.
 All API responses follow a consistent structure with status, message, and data.
 """
-from typing import Any, Optional, Dict
+import json
+from typing import Any, Dict, Iterable, Optional
 
-from flask import jsonify
+from flask import Response, jsonify, stream_with_context
 
 
 class ResponseStatus:
@@ -36,6 +37,79 @@ class ResponseFormatter:
         }
         return jsonify(response), status_code
 
+    @staticmethod
+    def raw_success(data_json: str, message: str = "Operation completed successfully",
+                    status_code: int = 200) -> tuple:
+        """
+        Format a successful response around data that is already serialized to JSON.
+        Used for cached payloads so they are not decoded and re-encoded on every request.
+
+        Args:
+            data_json: JSON text for the data field
+            message: Success message
+            status_code: HTTP status code (default: 200)
+
+        Returns:
+            Tuple of (Response, status_code)
+        """
+        body = '{"status":%s,"message":%s,"data":%s}' % (
+            json.dumps(ResponseStatus.SUCCESS), json.dumps(message), data_json
+        )
+        return Response(body, mimetype='application/json'), status_code
+
+    @staticmethod
+    def streamed(items: Iterable[Any], message: str = "Operation completed successfully") -> Response:
+        """
+        Format a successful response whose data list is serialized item by item as it is sent,
+        so memory stays flat however many items there are. An error after streaming has started
+        cannot change the status code; the body is cut short and is not valid JSON.
+
+        Args:
+            items: Iterable of JSON-serializable items, consumed lazily inside the request context
+            message: Success message
+
+        Returns:
+            Streaming Response (status 200)
+        """
+        def generate():
+            yield '{"status":%s,"message":%s,"data":[' % (
+                json.dumps(ResponseStatus.SUCCESS), json.dumps(message)
+            )
+            separator = ''
+            for item in items:
+                yield separator + json.dumps(item, separators=(',', ':'))
+                separator = ','
+            yield ']}'
+
+        return Response(stream_with_context(generate()), mimetype='application/json')
+
+    @staticmethod
+    def paginated(data: list, next_cursor: Optional[str], limit: int,
+                  message: str = "Operation completed successfully") -> tuple:
+        """
+        Format a successful response for one page of a keyset-paginated listing.
+
+        Args:
+            data: The items on this page
+            next_cursor: Cursor for the following page, or None on the last page
+            limit: Page size that was applied
+            message: Success message
+
+        Returns:
+            Tuple of (jsonify response, status_code 200)
+        """
+        response = {
+            "status": ResponseStatus.SUCCESS,
+            "message": message,
+            "data": data,
+            "pagination": {
+                "limit": limit,
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None
+            }
+        }
+        return jsonify(response), 200
+
     @staticmethod
     def error(message: str, data: Optional[Any] = None, status_code: int = 400) -> tuple:
         """
@@ -0,0 +1,44 @@
+"""
+Lookup-free share code allocation.
+A share code is a keyed Feistel permutation of the quiz id rendered in base36. The permutation is a
+bijection, so distinct ids always give distinct codes and allocation never needs a uniqueness query.
+"""
+import hashlib
+import hmac
+import string
+
+ALPHABET = string.digits + string.ascii_uppercase
+CODE_LENGTH = 9  # legacy random codes are 8 characters, so the two sets can never collide
+HALF_BITS = 23  # 46-bit domain; 2**46 < 36**9
+HALF_MASK = (1 << HALF_BITS) - 1
+ROUNDS = 4
+
+
+def _round_function(key, round_index, value):
+    digest = hmac.new(key, f"{round_index}:{value}".encode('ascii'), hashlib.sha256).digest()
+    return int.from_bytes(digest[:4], 'big') & HALF_MASK
+
+
+def permute(value, key):
+    """Map value to a unique pseudo-random value in the 46-bit domain"""
+    if not 0 <= value <= (1 << (2 * HALF_BITS)) - 1:
+        raise ValueError("Value out of range for share code domain")
+    left, right = value >> HALF_BITS, value & HALF_MASK
+    for round_index in range(ROUNDS):
+        left, right = right, left ^ _round_function(key, round_index, right)
+    return (left << HALF_BITS) | right
+
+
+def to_base36(value):
+    """Encode a non-negative integer as a fixed-width base36 string"""
+    chars = []
+    while value:
+        value, remainder = divmod(value, 36)
+        chars.append(ALPHABET[remainder])
+    return ''.join(reversed(chars)).rjust(CODE_LENGTH, '0')
+
+
+def share_code_for(quiz_id, secret):
+    """Derive the share code for a quiz id; secret must stay stable for the lifetime of the database"""
+    key = secret.encode('utf-8') if isinstance(secret, str) else secret
+    return to_base36(permute(quiz_id, key))
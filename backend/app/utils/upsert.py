@@ -0,0 +1,66 @@
+"""
+Dialect-native upserts (INSERT ... ON CONFLICT / ON DUPLICATE KEY UPDATE).
+"""
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from app.extensions import db
+
+# Dialects with a native single-statement upsert
+UPSERT_INSERTS = {
+    'sqlite': sqlite.insert,
+    'postgresql': postgresql.insert,
+    'mysql': mysql.insert,
+    'mariadb': mysql.insert,
+}
+
+
+def increment_counters(model, key_columns, counter_columns, rows):
+    """
+    Add each row's counter values to the row with the same key, inserting missing rows.
+    Runs in the current transaction and does not commit.
+
+    Args:
+        model: Mapped class whose primary key (or a unique index) is key_columns
+        key_columns: Names of the conflict target columns
+        counter_columns: Names of the numeric columns to add to
+        rows: Iterable of dicts holding every key and counter column; any other columns are
+              only written when the row is inserted
+    """
+    # Merge rows with the same key first: one statement may not touch the same row twice
+    merged = {}
+    for row in rows:
+        key = tuple(row[column] for column in key_columns)
+        if key not in merged:
+            merged[key] = dict(row)
+        else:
+            for column in counter_columns:
+                merged[key][column] += row[column]
+    if not merged:
+        return
+
+    values = list(merged.values())
+
+    dialect_name = db.session.get_bind().dialect.name
+    insert = UPSERT_INSERTS.get(dialect_name)
+    if insert is None:
+        for row in values:
+            existing = db.session.get(model, tuple(row[column] for column in key_columns))
+            if existing:
+                for column in counter_columns:
+                    setattr(existing, column, getattr(existing, column) + row[column])
+            else:
+                db.session.add(model(**row))
+        return
+
+    stmt = insert(model).values(values)
+    table = model.__table__
+    if dialect_name in ('mysql', 'mariadb'):
+        stmt = stmt.on_duplicate_key_update({
+            column: table.c[column] + stmt.inserted[column] for column in counter_columns
+        })
+    else:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c[column] for column in key_columns],
+            set_={column: table.c[column] + stmt.excluded[column] for column in counter_columns}
+        )
+    db.session.execute(stmt)
@@ -2,6 +2,8 @@ import re
 
 from marshmallow import Schema, fields, validate, ValidationError
 
+from app.models.attempt_event import AttemptEventType
+
 
 def validate_email(email):
     pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
@@ -25,6 +27,7 @@ class QuizSchema(Schema):
     description = fields.Str(allow_none=True)
     is_survey = fields.Bool(load_default=False)
     requires_login = fields.Bool(load_default=False)
+    live_mode = fields.Bool(load_default=False)
     allow_ai_evaluation = fields.Bool(load_default=False)
     time_limit = fields.Int(allow_none=True, validate=validate.Range(min=1))
     show_results_immediately = fields.Bool(load_default=True)
@@ -35,6 +38,10 @@ class QuizSchema(Schema):
     custom_fields = fields.List(fields.Dict(), allow_none=True)
 
 
+class LiveAdvanceSchema(Schema):
+    question_index = fields.Int(allow_none=True, validate=validate.Range(min=0))
+
+
 class QuestionSchema(Schema):
     type = fields.Str(required=True, validate=validate.OneOf(['MCQ', 'DESCRIPTIVE', 'FILL_BLANK', 'TRUE_FALSE']))
     prompt = fields.Str(required=True, validate=validate.Length(min=1))
@@ -52,3 +59,16 @@ class AttemptSchema(Schema):
 class AnswerSchema(Schema):
     question_id = fields.Int(required=True)
     answer_text = fields.Str(required=True, validate=validate.Length(min=1))
+
+
+class AnswerBatchSchema(Schema):
+    answers = fields.List(fields.Nested(AnswerSchema), required=True, validate=validate.Length(min=1, max=500))
+
+
+class AttemptEventSchema(Schema):
+    type = fields.Str(required=True, validate=validate.OneOf(AttemptEventType.ALL))
+    timestamp = fields.DateTime(required=True)
+
+
+class AttemptEventBatchSchema(Schema):
+    events = fields.List(fields.Nested(AttemptEventSchema), required=True, validate=validate.Length(min=1, max=500))
@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+# Configuration is read from the environment when the app is created
+os.environ.update({
+    'DATABASE_URL': 'sqlite://',
+    'LOG_LEVEL': 'WARNING',
+    'BCRYPT_ROUNDS': '4',
+    'PASSWORD_HASH_WORKERS': '0',
+    'RATE_LIMIT': 'off',
+})
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
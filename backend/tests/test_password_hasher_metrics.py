@@ -0,0 +1,23 @@
+from app.extensions import db
+from app.models import User
+from app.services.auth_service import AuthService
+
+
+def _headers(email):
+    user = User(email=email, name='User', password_hash='x')
+    db.session.add(user)
+    db.session.commit()
+    return {'Authorization': f"Bearer {AuthService.generate_token(user.id)}"}
+
+
+def test_metrics_are_for_operators_only(app, client):
+    app.config['OPERATOR_EMAILS'] = frozenset({'ops@example.com'})
+    participant = _headers('user@example.com')
+    operator = _headers('Ops@example.com')
+
+    assert client.get('/api/auth/password-hasher/metrics').status_code == 401
+    assert client.get('/api/auth/password-hasher/metrics', headers=participant).status_code == 404
+
+    response = client.get('/api/auth/password-hasher/metrics', headers=operator)
+    assert response.status_code == 200
+    assert 'queue_size' in response.get_json()['data']
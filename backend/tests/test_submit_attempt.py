@@ -0,0 +1,62 @@
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.extensions import db
+from app.models import Answer, Attempt, Question, Quiz, User
+from app.models.attempt import AttemptStatus
+from app.models.stats import QuestionOptionCount, QuestionStats, QuizScoreBucket
+from app.services.scoring_service import ScoringService
+
+
+def _counters(quiz_id, question_id):
+    db.session.expire_all()
+    quiz = db.session.get(Quiz, quiz_id)
+    stats = db.session.get(QuestionStats, question_id)
+    return {
+        'submitted_count': quiz.submitted_count,
+        'avg_score': quiz.avg_score,
+        'score_sum_sq': quiz.score_sum_sq,
+        'buckets': sorted((b.bucket, b.count) for b in QuizScoreBucket.query.filter_by(quiz_id=quiz_id)),
+        'answered_count': stats.answered_count,
+        'correct_count': stats.correct_count,
+        'options': sorted((o.option_index, o.count)
+                          for o in QuestionOptionCount.query.filter_by(question_id=question_id)),
+    }
+
+
+def test_submitting_twice_scores_once(app):
+    user = User(email='submit@example.com', name='Submit', password_hash='x')
+    db.session.add(user)
+    db.session.flush()
+    quiz = Quiz(creator_id=user.id, title='Quiz', description='d', total_points=2)
+    db.session.add(quiz)
+    db.session.flush()
+    question = Question(quiz_id=quiz.id, type='MCQ', prompt='p', points=2, order=0)
+    question.set_options(['a', 'b', 'c'])
+    question.set_correct_answer(2)
+    db.session.add(question)
+    db.session.flush()
+    attempt = Attempt(quiz_id=quiz.id, participant_name='Participant')
+    db.session.add(attempt)
+    db.session.flush()
+    db.session.add(Answer(attempt_id=attempt.id, question_id=question.id, answer_text='2'))
+    db.session.commit()
+
+    submitted = ScoringService().submit_attempt(attempt)
+    assert submitted.status == AttemptStatus.SUBMITTED
+    assert submitted.score == 2
+    first = _counters(quiz.id, question.id)
+    assert first['submitted_count'] == 1
+    assert first['answered_count'] == 1
+    assert first['options'] == [(2, 1)]
+
+    # A second submit that read the attempt before the first one committed (a double click, the
+    # client's timeout submit racing the deadline scheduler) must not score it again
+    attempt = db.session.get(Attempt, attempt.id)
+    submitted_at = attempt.submitted_at
+    set_committed_value(attempt, 'status', AttemptStatus.IN_PROGRESS)
+    resubmitted = ScoringService().submit_attempt(attempt)
+
+    assert resubmitted.status == AttemptStatus.SUBMITTED
+    assert resubmitted.score == 2
+    assert resubmitted.submitted_at == submitted_at
+    assert _counters(quiz.id, question.id) == first
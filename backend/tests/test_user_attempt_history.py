@@ -0,0 +1,64 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import Attempt, Question, Quiz, User
+from app.models.attempt import AttemptStatus
+from app.services.auth_service import AuthService
+
+
+@contextmanager
+def count_queries():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+
+
+def _seed_history(user, quizzes=5, attempts_per_quiz=12):
+    for q in range(quizzes):
+        quiz = Quiz(creator_id=user.id, title=f"Quiz {q}", description='d', total_points=3)
+        db.session.add(quiz)
+        db.session.flush()
+        db.session.add_all(
+            Question(quiz_id=quiz.id, type='MCQ', prompt=f"p{n}", points=1, order=n) for n in range(3)
+        )
+        db.session.add_all(
+            Attempt(quiz_id=quiz.id, user_id=user.id, status=AttemptStatus.SUBMITTED, score=1, total_points=3)
+            for _ in range(attempts_per_quiz)
+        )
+    db.session.commit()
+
+
+def _history(client, headers, limit):
+    with count_queries() as statements:
+        response = client.get(f"/api/attempts/user/attempts?limit={limit}", headers=headers)
+    assert response.status_code == 200
+    return response.get_json(), len(statements)
+
+
+def test_query_count_does_not_grow_with_page_size(app, client):
+    user = User(email='history@example.com', name='History', password_hash='x')
+    db.session.add(user)
+    db.session.commit()
+    _seed_history(user)
+    headers = {'Authorization': f"Bearer {AuthService.generate_token(user.id)}"}
+
+    _history(client, headers, 1)  # warm the user cache and token revocation filter
+
+    small, small_queries = _history(client, headers, 1)
+    large, large_queries = _history(client, headers, 50)
+
+    assert len(small['data']) == 1
+    assert len(large['data']) == 50
+    assert large['pagination']['has_more'] is True
+    assert large['data'][0]['quiz']['title'].startswith('Quiz ')
+    assert large['data'][0]['quiz']['total_points'] == 3
+    assert small_queries == large_queries == 1
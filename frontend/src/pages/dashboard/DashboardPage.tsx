@@ -10,6 +10,8 @@ export const DashboardPage: React.FC = () => {
   const navigate = useNavigate();
   const [quizzes, setQuizzes] = useState<Quiz[]>([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     loadQuizzes();
@@ -17,8 +19,9 @@ export const DashboardPage: React.FC = () => {
 
   const loadQuizzes = async () => {
     try {
-      const data = await quizService.listQuizzes();
-      setQuizzes(data);
+      const page = await quizService.listQuizzesPage();
+      setQuizzes(page.items);
+      setNextCursor(page.nextCursor);
     } catch (error) {
       console.error('Failed to load quizzes:', error);
     } finally {
@@ -26,6 +29,19 @@ export const DashboardPage: React.FC = () => {
     }
   };
 
+  const loadMoreQuizzes = async () => {
+    setLoadingMore(true);
+    try {
+      const page = await quizService.listQuizzesPage(nextCursor);
+      setQuizzes((current) => [...current, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.error('Failed to load more quizzes:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleCreateQuiz = () => {
     navigate('/quizzes/create');
   };
@@ -75,6 +91,15 @@ export const DashboardPage: React.FC = () => {
               ))}
             </div>
           )}
+
+          {nextCursor && (
+            <div className="flex justify-center mt-6">
+              <Button onClick={loadMoreQuizzes} variant="outline" disabled={loadingMore}>
+                {loadingMore && <Loader2 className="mr-2 h-4 w-4 animate-spin" />}
+                Load more
+              </Button>
+            </div>
+          )}
         </div>
     </div>
   );
@@ -62,6 +62,16 @@ export const QuizResultsPage: React.FC = () => {
           }
         }
         
+        // Prefer the attempt's own question view so option indices match the saved answers
+        try {
+          const attemptQuestions = await attemptService.getAttemptQuestions(attemptData.id);
+          if (attemptQuestions && attemptQuestions.length > 0) {
+            quizData = { ...quizData, questions: attemptQuestions };
+          }
+        } catch (attemptQuestionsError) {
+          console.error('Failed to load attempt questions:', attemptQuestionsError);
+        }
+
         // If still no questions, show error
         if (!quizData.questions || quizData.questions.length === 0) {
           setError('Quiz questions not available. You may not have permission to view these results.');
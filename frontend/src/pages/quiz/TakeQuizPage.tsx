@@ -1,4 +1,4 @@
-import { useEffect, useState, useMemo } from 'react';
+import { useEffect, useState } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { quizService } from '@/services/quizzes';
 import { attemptService } from '@/services/attempts';
@@ -6,6 +6,7 @@ import { useAuth } from '@/hooks/useAuth';
 import { useAntiCheating } from '@/hooks/useAntiCheating';
 import { Quiz } from '@/types/quiz';
 import { Attempt, Answer } from '@/types/attempt';
+import { Question } from '@/types/question';
 import { ParticipantForm } from '@/components/ParticipantForm';
 import { MCQQuestion } from '@/components/QuestionTypes/MCQQuestion';
 import { DescriptiveQuestion } from '@/components/QuestionTypes/DescriptiveQuestion';
@@ -29,19 +30,8 @@ export const TakeQuizPage: React.FC = () => {
   const [timeRemaining, setTimeRemaining] = useState<number | null>(null);
   const [warningMessage, setWarningMessage] = useState('');
 
-  // Randomize questions if enabled
-  const randomizedQuestions = useMemo(() => {
-    if (!quiz?.questions) return [];
-    const questions = [...quiz.questions];
-    if (quiz.settings?.randomize_question_order) {
-      // Fisher-Yates shuffle
-      for (let i = questions.length - 1; i > 0; i--) {
-        const j = Math.floor(Math.random() * (i + 1));
-        [questions[i], questions[j]] = [questions[j], questions[i]];
-      }
-    }
-    return questions;
-  }, [quiz?.questions, quiz?.settings?.randomize_question_order]);
+  // Questions come from the attempt, already in this participant's (randomized) order
+  const [randomizedQuestions, setRandomizedQuestions] = useState<Question[]>([]);
 
   // Anti-cheating hook
   const { isWarningVisible, shouldBlock } = useAntiCheating({
@@ -87,6 +77,12 @@ export const TakeQuizPage: React.FC = () => {
     }
   }, [attempt]);
 
+  useEffect(() => {
+    if (attempt?.id) {
+      loadAttemptQuestions(attempt.id);
+    }
+  }, [attempt?.id]);
+
   const loadQuiz = async () => {
     try {
       const data = await quizService.getQuizByShareCode(shareCode!);
@@ -158,6 +154,16 @@ export const TakeQuizPage: React.FC = () => {
     }
   };
 
+  const loadAttemptQuestions = async (attemptId: number) => {
+    try {
+      const questions = await attemptService.getAttemptQuestions(attemptId);
+      setRandomizedQuestions(questions);
+    } catch (error) {
+      console.error('Failed to load attempt questions:', error);
+      setRandomizedQuestions(quiz?.questions || []);
+    }
+  };
+
   const startTimer = () => {
     if (!quiz?.settings?.time_limit) return;
 
@@ -286,12 +292,12 @@ export const TakeQuizPage: React.FC = () => {
 
     switch (currentQuestion.type) {
       case 'MCQ':
+        // MCQ options are already shuffled by the server; answers are display indices
         return (
           <MCQQuestion
             question={currentQuestion}
             answer={answer}
             onChange={(ans) => handleAnswerChange(currentQuestion.id, ans)}
-            randomizeOptions={randomizeOptions}
           />
         );
       case 'DESCRIPTIVE':
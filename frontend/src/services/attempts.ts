@@ -1,5 +1,8 @@
 import { ApiHandler } from './api';
+import { fetchAllPages, fetchPage } from './pagination';
 import { Attempt, StartAttemptData, SaveAnswerData } from '../types/attempt';
+import { Question } from '../types/question';
+import { Page } from '../types/pagination';
 
 const getToken = (): string => {
   const token = localStorage.getItem('token');
@@ -39,10 +42,22 @@ export const attemptService = {
     return response.data.data;
   },
 
+  // Questions in the order this attempt sees them (server-side randomization applied)
+  getAttemptQuestions: async (attemptId: number): Promise<Question[]> => {
+    const response = await ApiHandler.sendUnauthenticatedGetRequest(`/attempts/${attemptId}/questions`);
+    return response.data.data;
+  },
+
+  // One page of the user's attempts, newest first
+  getUserAttemptsPage: async (cursor?: string | null): Promise<Page<Attempt>> => {
+    const token = getToken();
+    return fetchPage<Attempt>('/attempts/user/attempts', token, cursor);
+  },
+
+  // Every attempt of the user, following the pagination cursor
   getUserAttempts: async (): Promise<Attempt[]> => {
     const token = getToken();
-    const response = await ApiHandler.sendGetRequest('/attempts/user/attempts', token);
-    return response.data.data;
+    return fetchAllPages<Attempt>('/attempts/user/attempts', token);
   },
 };
 
@@ -0,0 +1,35 @@
+import { ApiHandler } from './api';
+import { Page } from '../types/pagination';
+
+export const DEFAULT_PAGE_SIZE = 50;
+// Largest page the API serves; used when every page is needed
+export const MAX_PAGE_SIZE = 200;
+
+export const fetchPage = async <T>(
+  url: string,
+  token: string,
+  cursor?: string | null,
+  limit: number = DEFAULT_PAGE_SIZE
+): Promise<Page<T>> => {
+  const params = new URLSearchParams({ limit: String(limit) });
+  if (cursor) {
+    params.set('cursor', cursor);
+  }
+  const response = await ApiHandler.sendGetRequest(`${url}?${params.toString()}`, token);
+  return {
+    items: response.data.data,
+    nextCursor: response.data.pagination?.next_cursor ?? null,
+  };
+};
+
+// Follows next_cursor until the list is exhausted
+export const fetchAllPages = async <T>(url: string, token: string): Promise<T[]> => {
+  const items: T[] = [];
+  let cursor: string | null = null;
+  do {
+    const page: Page<T> = await fetchPage<T>(url, token, cursor, MAX_PAGE_SIZE);
+    items.push(...page.items);
+    cursor = page.nextCursor;
+  } while (cursor);
+  return items;
+};
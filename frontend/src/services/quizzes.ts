@@ -1,5 +1,7 @@
 import { ApiHandler } from './api';
+import { fetchAllPages, fetchPage } from './pagination';
 import { Quiz, CreateQuizData } from '../types/quiz';
+import { Page } from '../types/pagination';
 
 const getToken = (): string => {
   const token = localStorage.getItem('token');
@@ -38,10 +40,16 @@ export const quizService = {
     await ApiHandler.sendDeleteRequest(`/quizzes/${id}`, token);
   },
 
+  // One page of the user's quizzes, newest first
+  listQuizzesPage: async (cursor?: string | null): Promise<Page<Quiz>> => {
+    const token = getToken();
+    return fetchPage<Quiz>('/quizzes', token, cursor);
+  },
+
+  // Every quiz of the user, following the pagination cursor
   listQuizzes: async (): Promise<Quiz[]> => {
     const token = getToken();
-    const response = await ApiHandler.sendGetRequest('/quizzes', token);
-    return response.data.data;
+    return fetchAllPages<Quiz>('/quizzes', token);
   },
 };
 
@@ -10,6 +10,7 @@ export interface Attempt {
   participant_info?: ParticipantInfo;
   started_at: string;
   submitted_at?: string;
+  deadline?: string;
   score?: number;
   total_points?: number;
   status: 'IN_PROGRESS' | 'SUBMITTED';
@@ -0,0 +1,5 @@
+// One page of a cursor-paginated list; pass nextCursor back to fetch the following page
+export interface Page<T> {
+  items: T[];
+  nextCursor: string | null;
+}
@@ -18,6 +18,7 @@ export interface Quiz {
   description?: string;
   is_survey: boolean;
   requires_login: boolean;
+  live_mode: boolean;
   share_code: string;
   created_at: string;
   updated_at: string;
@@ -30,6 +31,7 @@ export interface CreateQuizData {
   description?: string;
   is_survey?: boolean;
   requires_login?: boolean;
+  live_mode?: boolean;
   allow_ai_evaluation?: boolean;
   time_limit?: number;
   show_results_immediately?: boolean;